@@ -60,6 +60,10 @@ STATICFILES_DIRS = [
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Image uploads are checked against these before any pixel is decoded
+IMAGE_UPLOAD_MAX_BYTES = int(os.getenv('IMAGE_UPLOAD_MAX_BYTES', str(25 * 1024 * 1024)))  # 25MB
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(50_000_000)))  # 50 megapixels
+
 # Paystack Settings
 PAYSTACK_PUBLIC_KEY = os.getenv('PAYSTACK_PUBLIC_KEY', '')
 PAYSTACK_SECRET_KEY = os.getenv('PAYSTACK_SECRET_KEY', '')
@@ -139,6 +143,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'corsheaders',
@@ -211,6 +216,82 @@ CHANNEL_LAYERS = {
 # }
 
 
+# Cache - Redis when REDIS_URL is set so invalidation is shared across
+# workers, local memory otherwise
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Whether every worker process shares the default cache (Redis). Cache
+# generation counters (rooms.cache) live in it, so ETag/Last-Modified
+# validators and 304s are only served when it is: with per-process
+# LocMemCache a write bumps the counters of its own worker only, and the
+# others would keep confirming their clients' stale copies.
+SHARED_CACHE = os.getenv('SHARED_CACHE', 'True' if os.getenv('REDIS_URL') else 'False') == 'True'
+
+# Property facet counts are cached per filter set until a Property/Room write,
+# only with SHARED_CACHE
+PROPERTY_FACETS_CACHE_TIMEOUT = int(os.getenv('PROPERTY_FACETS_CACHE_TIMEOUT', '600'))
+# Property list/detail GET responses, invalidated the same way; only cached
+# with SHARED_CACHE, as other workers' writes must invalidate them too
+PROPERTY_RESPONSE_CACHE_TIMEOUT = int(os.getenv('PROPERTY_RESPONSE_CACHE_TIMEOUT', '300'))
+# Lifetime (seconds) of a worker's cached location suggestions when the
+# cache isn't shared and other workers' invalidations can't reach it
+LOCATION_SUGGESTIONS_TTL = int(os.getenv('LOCATION_SUGGESTIONS_TTL', '60'))
+# Landlord dashboard stats; favorites, conversations and transactions do not
+# bump the property generation, so keep this short
+LANDLORD_STATS_CACHE_TIMEOUT = int(os.getenv('LANDLORD_STATS_CACHE_TIMEOUT', '60'))
+
+# Property detail views are buffered and written in bulk at most this often
+# (seconds), or sooner once this many are waiting
+PROPERTY_VIEW_FLUSH_INTERVAL = int(os.getenv('PROPERTY_VIEW_FLUSH_INTERVAL', '10'))
+PROPERTY_VIEW_FLUSH_SIZE = int(os.getenv('PROPERTY_VIEW_FLUSH_SIZE', '500'))
+
+# Raw view events older than this many days are moved out of the database
+# into CSV.gz files by `manage.py archive_property_views`
+PROPERTY_VIEW_RETENTION_DAYS = int(os.getenv('PROPERTY_VIEW_RETENTION_DAYS', '90'))
+PROPERTY_VIEW_ARCHIVE_DIR = os.getenv('PROPERTY_VIEW_ARCHIVE_DIR', os.path.join(BASE_DIR, 'archive', 'property_views'))
+
+# Threads rendering property photo variants after upload; 0 renders them
+# inline once the upload commits
+PROPERTY_IMAGE_WORKERS = int(os.getenv('PROPERTY_IMAGE_WORKERS', '2'))
+# Threads per upload request validating, hashing and storing its files
+PROPERTY_IMAGE_UPLOAD_WORKERS = int(os.getenv('PROPERTY_IMAGE_UPLOAD_WORKERS', '8'))
+
+# On-demand thumbnails (rooms.thumbnails): the (width, height) boxes served,
+# the directory they are cached in, its size limit (least recently served
+# thumbnails are evicted past it) and the browser cache lifetime
+PROPERTY_THUMBNAIL_SIZES = [(320, 320), (800, 800)]
+PROPERTY_THUMBNAIL_CACHE_DIR = os.getenv('PROPERTY_THUMBNAIL_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'thumbnails'))
+PROPERTY_THUMBNAIL_CACHE_BYTES = int(os.getenv('PROPERTY_THUMBNAIL_CACHE_BYTES', str(512 * 1024 * 1024)))  # 512MB
+PROPERTY_THUMBNAIL_MAX_AGE = 60 * 60 * 24 * 365
+
+# Direct-to-storage uploads (core.direct_uploads): clients PUT property
+# photos and avatars to presigned URLs, valid for DIRECT_UPLOAD_EXPIRES
+# seconds, instead of sending them through the app. The S3 backend needs
+# the default file storage to serve the same bucket; the local one, for
+# development, receives the files itself.
+DIRECT_UPLOAD_BACKEND = os.getenv('DIRECT_UPLOAD_BACKEND', 'core.direct_uploads.LocalDirectUploadBackend')
+DIRECT_UPLOAD_EXPIRES = int(os.getenv('DIRECT_UPLOAD_EXPIRES', '900'))
+DIRECT_UPLOAD_S3_ENDPOINT = os.getenv('DIRECT_UPLOAD_S3_ENDPOINT', 'https://s3.amazonaws.com')
+DIRECT_UPLOAD_S3_BUCKET = os.getenv('DIRECT_UPLOAD_S3_BUCKET', '')
+DIRECT_UPLOAD_S3_REGION = os.getenv('DIRECT_UPLOAD_S3_REGION', 'us-east-1')
+DIRECT_UPLOAD_S3_ACCESS_KEY_ID = os.getenv('DIRECT_UPLOAD_S3_ACCESS_KEY_ID', '')
+DIRECT_UPLOAD_S3_SECRET_ACCESS_KEY = os.getenv('DIRECT_UPLOAD_S3_SECRET_ACCESS_KEY', '')
+# 'path' for MinIO and most S3-compatible stores, 'virtual' for AWS
+DIRECT_UPLOAD_S3_ADDRESSING_STYLE = os.getenv('DIRECT_UPLOAD_S3_ADDRESSING_STYLE', 'path')
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
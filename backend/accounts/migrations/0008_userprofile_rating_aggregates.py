@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_remove_user_accounts_us_first_n_8f83ff_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="average_rating",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=3, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="ratings_1",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="ratings_2",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="ratings_3",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="ratings_4",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="ratings_5",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
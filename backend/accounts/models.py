@@ -4,6 +4,7 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils import timezone
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from rooms.ratings import without_rating_fields
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -114,6 +115,17 @@ class UserProfile(models.Model):
     total_property_views = models.PositiveIntegerField(default=0)
     total_inquiries_received = models.PositiveIntegerField(default=0)
     
+    # Landlord rating aggregates, adjusted with F() on every LandlordReview
+    # write (rooms.ratings)
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    ratings_1 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_2 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_3 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_4 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_5 = models.PositiveIntegerField(default=0, editable=False)
+    
     # Social/Contact fields
     website = models.URLField(blank=True)
     
@@ -125,13 +137,14 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.user_type}"
     
+    def save(self, *args, **kwargs):
+        # Rating aggregates are only written by review UPDATEs (rooms.ratings)
+        super().save(*args, **without_rating_fields(self, kwargs))
+    
     def get_average_rating(self):
         """Get average rating for landlords"""
-        if self.user_type == 'landlord':
-            from rooms.models import LandlordReview
-            reviews = LandlordReview.objects.filter(landlord=self.user)
-            if reviews.exists():
-                return reviews.aggregate(models.Avg('rating'))['rating__avg']
+        if self.user_type == 'landlord' and self.review_count:
+            return self.rating_sum / self.review_count
         return None
     
     def get_total_properties(self):
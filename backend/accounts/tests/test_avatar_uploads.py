@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from core.tests.mixins import TemporaryMediaMixin
+from core.tests.test_direct_uploads import declaration, jpeg_bytes, put_file
+
+User = get_user_model()
+
+
+@override_settings(DIRECT_UPLOAD_BACKEND='core.direct_uploads.LocalDirectUploadBackend')
+class AvatarDirectUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        self.profile = UserProfile.objects.create(user=self.user, user_type='tenant')
+        self.client.force_authenticate(user=self.user)
+
+    def presign(self, content, **changes):
+        return self.client.post(reverse('avatar-presign'), {**declaration(content), **changes}, format='json')
+
+    def test_avatar_upload_flow(self):
+        """Test that an avatar uploaded straight to storage becomes the user's avatar"""
+        content = jpeg_bytes((300, 300))
+        upload = self.presign(content).data
+        self.assertEqual(put_file(self.client, upload, content).status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('avatar-complete'), {'token': upload['token']}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.avatar.name.startswith(f'avatars/{self.user.id}/'))
+        with self.profile.avatar.open('rb') as avatar:
+            self.assertEqual(avatar.read(), content)
+
+    def test_presign_rejects_oversized_avatars(self):
+        """Test that avatars over the avatar size limit get no upload URL"""
+        response = self.presign(jpeg_bytes(), size=UserProfile.MAX_UPLOAD_SIZE + 1)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('at most 5 MB', response.data['error'])
+
+    def test_tokens_are_bound_to_user(self):
+        """Test that one user's avatar upload can't be completed by another"""
+        content = jpeg_bytes()
+        upload = self.presign(content).data
+        put_file(self.client, upload, content)
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        UserProfile.objects.create(user=other, user_type='tenant')
+        self.client.force_authenticate(user=other)
+        response = self.client.post(reverse('avatar-complete'), {'token': upload['token']}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UserProfile.objects.get(user=other).avatar)
@@ -17,6 +17,8 @@ urlpatterns = [
     
     # Profile endpoints
     path('profile/', views.MyProfileView.as_view(), name='my-profile'),
+    path('profile/avatar/presign/', views.AvatarDirectUploadView.as_view(), name='avatar-presign'),
+    path('profile/avatar/complete/', views.AvatarDirectUploadCompleteView.as_view(), name='avatar-complete'),
     path('profile/<str:username>/', views.ProfileDetailView.as_view(), name='profile-detail'),
     
     # Email Verification
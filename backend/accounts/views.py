@@ -27,6 +27,9 @@ from django.contrib.postgres.search import TrigramSimilarity
 from rest_framework.throttling import ScopedRateThrottle
 from typing import Optional, List, Dict, Any
 
+import os
+from django.core.exceptions import ValidationError
+from core.direct_uploads import DirectUpload, StorageUnavailable, declared_upload, presign, read_upload
 from .serializers import RegisterSerializer, UserProfileSerializer, ProfileDetailSerializer, ProfileUpdateSerializer, UserSearchSerializer
 from .models import UserProfile, EmailVerificationToken, User
 from .email_utils import send_verification_email, send_local_verification_email
@@ -195,6 +198,53 @@ class MyProfileView(generics.RetrieveUpdateAPIView):
             return Response({'status': 'avatar deleted'})
         return self.partial_update(request, *args, **kwargs)
 
+def avatar_name(user):
+    """Maps an avatar upload's (sha256, file name) to its storage name, per user."""
+    return lambda sha256, filename: f"avatars/{user.id}/{sha256}{os.path.splitext(filename)[1].lower()}"
+
+class AvatarDirectUploadView(APIView):
+    """
+    Presigned URL for uploading the current user's avatar straight to
+    storage, for the file declared by name, content_type, size and sha256
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        try:
+            upload = declared_upload(
+                request.data, f'avatar:{request.user.id}', avatar_name(request.user),
+                max_bytes=UserProfile.MAX_UPLOAD_SIZE,
+            )
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(presign(upload, request))
+
+class AvatarDirectUploadCompleteView(APIView):
+    """
+    Makes a completed direct upload, given its ``token``, the current user's avatar
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        try:
+            upload = DirectUpload.from_token(request.data.get('token'), target=f'avatar:{request.user.id}')
+            # Checks the stored file's size and header, without downloading it
+            read_upload(upload)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        except StorageUnavailable as e:
+            logger.error(f"Error checking avatar upload: {str(e)}")
+            return Response(
+                {'error': 'Storage is unavailable, please try again'}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        profile, created = UserProfile.objects.get_or_create(user=request.user)
+        profile.avatar = upload.name
+        profile.save()
+        
+        serializer = ProfileUpdateSerializer(profile, context={'request': request})
+        return Response(serializer.data)
+
 logger = logging.getLogger(__name__)
 @method_decorator(csrf_exempt, name='dispatch')
 class EmailVerificationView(APIView):
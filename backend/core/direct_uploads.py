@@ -0,0 +1,375 @@
+"""
+Direct-to-storage uploads.
+
+Instead of streaming image bytes through an app worker, a client declares
+the file it is about to upload (name, content type, size, SHA-256), PUTs it
+straight to storage at the presigned URL it gets back, then completes the
+upload with the token that came with the URL. The app only handles the
+small requests on either side: completion reads back the object's size and
+its first HEADER_BYTES, which are enough to validate it as an image.
+
+A signed token binds every upload to one storage name, size, SHA-256 and
+target (the property or user it is for). Names are derived from the SHA-256,
+and the presigned PUT signs the size and checksum, so storage refuses any
+other content under the name.
+
+The backend (DIRECT_UPLOAD_BACKEND) is one of:
+
+- S3DirectUploadBackend: SigV4 presigned URLs for S3 or an S3-compatible
+  store such as MinIO, configured by the DIRECT_UPLOAD_S3_* settings. The
+  default file storage must serve the same bucket (e.g. with
+  django-storages), as completed uploads are recorded by name in image
+  fields.
+- LocalDirectUploadBackend: the default, for development and tests. Its
+  URLs point at core.views.DirectUploadView, which checks the body against
+  the token and saves it to the default storage, so bytes do go through
+  the app here.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import re
+from io import BytesIO
+from urllib.parse import quote, urlsplit
+
+import requests
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .image_utils import open_image, validate_image_file_extension
+
+CONTENT_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
+# Bytes read back from a completed upload to validate it: enough for the
+# header (and EXIF) of any reasonable image
+HEADER_BYTES = 256 * 1024
+TOKEN_SALT = 'core.direct_uploads'
+CHUNK_SIZE = 64 * 1024
+# Seconds to wait on the object store
+S3_TIMEOUT = 10
+
+
+class StorageUnavailable(Exception):
+    """The object store could not be reached, or failed a request it should have answered."""
+
+
+class DirectUpload:
+    """One file a client is to upload: where, with what content, and for which target."""
+
+    def __init__(self, name, size, sha256, content_type, target):
+        self.name = name
+        self.size = size
+        self.sha256 = sha256
+        self.content_type = content_type
+        self.target = target
+
+    @property
+    def checksum(self):
+        """The SHA-256 as the x-amz-checksum-sha256 header carries it (base64)."""
+        return base64.b64encode(bytes.fromhex(self.sha256)).decode()
+
+    def token(self):
+        return signing.dumps(
+            {
+                'name': self.name,
+                'size': self.size,
+                'sha256': self.sha256,
+                'content_type': self.content_type,
+                'target': self.target,
+            },
+            salt=TOKEN_SALT,
+        )
+
+    @classmethod
+    def from_token(cls, token, target=None, max_age=None):
+        """
+        The upload a token was issued for. Tokens outlive their URL
+        (twice DIRECT_UPLOAD_EXPIRES by default), so an upload that started
+        just before its URL expired can still be completed.
+
+        Raises:
+            ValidationError: If the token is invalid, expired, or for
+                another target than ``target``
+        """
+        if max_age is None:
+            max_age = settings.DIRECT_UPLOAD_EXPIRES * 2
+        if not isinstance(token, str):
+            raise ValidationError('Invalid upload token')
+        try:
+            data = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+        except signing.SignatureExpired:
+            raise ValidationError('Upload token has expired')
+        except signing.BadSignature:
+            raise ValidationError('Invalid upload token')
+        if target is not None and data['target'] != target:
+            raise ValidationError('Invalid upload token')
+        return cls(**data)
+
+
+def declared_upload(file, target, name_for, max_bytes=None):
+    """
+    The DirectUpload of a file a client declared as ``{"name", "content_type",
+    "size", "sha256"}``, after checking it the way open_image checks an
+    upload, short of its content.
+
+    Args:
+        file: The client's declaration
+        target: What the upload is for, e.g. ``property:<id>``
+        name_for: Maps (sha256, file name) to the storage name
+        max_bytes: Largest accepted size, IMAGE_UPLOAD_MAX_BYTES by default
+
+    Raises:
+        ValidationError: If the declaration is incomplete or not acceptable
+    """
+    max_bytes = max_bytes or settings.IMAGE_UPLOAD_MAX_BYTES
+    if not isinstance(file, dict):
+        raise ValidationError('Each file must be an object with name, content_type, size and sha256')
+
+    filename = os.path.basename(str(file.get('name') or ''))
+    try:
+        validate_image_file_extension(File(None, name=filename))
+        size = file.get('size')
+        if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+            raise ValidationError('File size must be a positive number of bytes')
+        if size > max_bytes:
+            raise ValidationError(f'Image files must be at most {max_bytes // (1024 * 1024)} MB')
+        sha256 = str(file.get('sha256') or '').lower()
+        if not re.fullmatch(r'[0-9a-f]{64}', sha256):
+            raise ValidationError('sha256 must be the hex SHA-256 of the file')
+        content_type = file.get('content_type')
+        if content_type not in CONTENT_TYPES:
+            raise ValidationError('Unsupported content type. Supported types: ' + ', '.join(sorted(CONTENT_TYPES)))
+    except ValidationError as e:
+        raise ValidationError(f"{filename or 'File'}: {e.messages[0]}")
+    return DirectUpload(name_for(sha256, filename), size, sha256, content_type, target)
+
+
+def get_direct_upload_backend():
+    return import_string(settings.DIRECT_UPLOAD_BACKEND)()
+
+
+def presign(upload, request=None, backend=None):
+    """
+    What a client needs to make an upload: the token to complete it with,
+    and the URL, method and headers of the PUT to send.
+    """
+    backend = backend or get_direct_upload_backend()
+    token = upload.token()
+    return {'token': token, 'expires_in': settings.DIRECT_UPLOAD_EXPIRES, **backend.presign_put(upload, token, request)}
+
+
+def read_upload(upload, name=None, backend=None):
+    """
+    Check that an upload's file is in storage with its declared size, and
+    open it as an image (see open_image) from its first HEADER_BYTES.
+
+    Args:
+        upload: The DirectUpload being completed
+        name: Where to look instead of ``upload.name``, e.g. the stored
+            file of the same content
+        backend: The direct upload backend, the configured one by default
+
+    Returns:
+        PIL.Image.Image: The image, opened from its header only
+
+    Raises:
+        ValidationError: If the file is missing, of another size or not an image
+        StorageUnavailable: If storage could not be asked
+    """
+    backend = backend or get_direct_upload_backend()
+    name = name or upload.name
+    filename = os.path.basename(upload.name)
+    size = backend.stat(name)
+    if size is None:
+        raise ValidationError(f'{filename}: File has not been uploaded')
+    if size != upload.size:
+        raise ValidationError(f'{filename}: Uploaded file does not match its declared size')
+    try:
+        return open_image(BytesIO(backend.read(name, HEADER_BYTES)))
+    except ValidationError as e:
+        raise ValidationError(f'{filename}: {e.messages[0]}')
+    except OSError:
+        raise ValidationError(f'{filename}: Upload a valid image. The file is either not an image or corrupted.')
+
+
+class LocalDirectUploadBackend:
+    """
+    Uploads to the default storage through DirectUploadView, standing in for
+    an object store where there is none.
+    """
+
+    def presign_put(self, upload, token, request=None):
+        url = reverse('core:direct-upload', args=[token])
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        return {'url': url, 'method': 'PUT', 'headers': {'Content-Type': upload.content_type}}
+
+    def stat(self, name):
+        """Size of a stored file, or None if there is none."""
+        if not default_storage.exists(name):
+            return None
+        return default_storage.size(name)
+
+    def read(self, name, length):
+        with default_storage.open(name, 'rb') as source:
+            return source.read(length)
+
+    def receive(self, upload, stream):
+        """
+        Store the body of a PUT to one of this backend's URLs, reading it
+        from ``stream`` in chunks, if it has the declared size and SHA-256.
+        """
+        digest = hashlib.sha256()
+        with TemporaryUploadedFile(os.path.basename(upload.name), upload.content_type, 0, None) as body:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                body.size += len(chunk)
+                if body.size > upload.size:
+                    raise ValidationError('Body is larger than the declared size')
+                digest.update(chunk)
+                body.write(chunk)
+            if body.size != upload.size:
+                raise ValidationError('Body is smaller than the declared size')
+            if digest.hexdigest() != upload.sha256:
+                raise ValidationError('Body does not match the declared SHA-256')
+
+            # Names are content addressed: a file already there is this one
+            if default_storage.exists(upload.name):
+                return
+            body.seek(0)
+            name = default_storage.save(upload.name, body)
+            if name != upload.name:
+                # Stored concurrently by another request
+                default_storage.delete(name)
+
+
+def signing_key(secret, datestamp, region, service='s3'):
+    key = ('AWS4' + secret).encode()
+    for part in (datestamp, region, service, 'aws4_request'):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    return key
+
+
+class S3DirectUploadBackend:
+    """
+    Uploads to S3 or an S3-compatible store with AWS Signature Version 4
+    presigned URLs. The app itself only sends HEAD and ranged GET requests,
+    presigned the same way, to check completed uploads.
+    """
+
+    def __init__(self, endpoint=None, bucket=None, region=None, access_key_id=None,
+                 secret_access_key=None, addressing_style=None):
+        self.endpoint = (endpoint or settings.DIRECT_UPLOAD_S3_ENDPOINT).rstrip('/')
+        self.bucket = bucket or settings.DIRECT_UPLOAD_S3_BUCKET
+        self.region = region or settings.DIRECT_UPLOAD_S3_REGION
+        self.access_key_id = access_key_id or settings.DIRECT_UPLOAD_S3_ACCESS_KEY_ID
+        self.secret_access_key = secret_access_key or settings.DIRECT_UPLOAD_S3_SECRET_ACCESS_KEY
+        # 'path' (https://host/bucket/key, MinIO's default) or 'virtual'
+        # (https://bucket.host/key)
+        self.addressing_style = addressing_style or settings.DIRECT_UPLOAD_S3_ADDRESSING_STYLE
+
+    def presign(self, method, name, headers=None, expires=None, now=None):
+        """
+        A presigned URL for ``method`` on the object ``name``. ``headers``
+        are signed as well, so the request must send them with these values.
+        """
+        expires = expires or settings.DIRECT_UPLOAD_EXPIRES
+        now = now or timezone.now()
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        datestamp = now.strftime('%Y%m%d')
+        scope = f'{datestamp}/{self.region}/s3/aws4_request'
+
+        endpoint = urlsplit(self.endpoint)
+        if self.addressing_style == 'virtual':
+            host, path = f'{self.bucket}.{endpoint.netloc}', f'{endpoint.path}/{name}'
+        else:
+            host, path = endpoint.netloc, f'{endpoint.path}/{self.bucket}/{name}'
+        path = quote(path, safe='/-_.~')
+
+        headers = {'host': host, **{key.lower(): str(value).strip() for key, value in (headers or {}).items()}}
+        signed_headers = ';'.join(sorted(headers))
+        query = '&'.join(
+            f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}"
+            for key, value in sorted({
+                'X-Amz-Algorithm': 'AWS4-HMAC-SHA256',
+                'X-Amz-Credential': f'{self.access_key_id}/{scope}',
+                'X-Amz-Date': amz_date,
+                'X-Amz-Expires': str(expires),
+                'X-Amz-SignedHeaders': signed_headers,
+            }.items())
+        )
+        canonical_request = '\n'.join([
+            method,
+            path,
+            query,
+            ''.join(f'{key}:{headers[key]}\n' for key in sorted(headers)),
+            signed_headers,
+            'UNSIGNED-PAYLOAD',
+        ])
+        string_to_sign = '\n'.join([
+            'AWS4-HMAC-SHA256',
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+        signature = hmac.new(
+            signing_key(self.secret_access_key, datestamp, self.region), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        return f'{endpoint.scheme}://{host}{path}?{query}&X-Amz-Signature={signature}'
+
+    def presign_put(self, upload, token, request=None):
+        headers = {
+            'Content-Type': upload.content_type,
+            'Content-Length': upload.size,
+            # Storage checks the body against it and rejects a mismatch
+            'x-amz-checksum-sha256': upload.checksum,
+        }
+        return {
+            'url': self.presign('PUT', upload.name, headers),
+            'method': 'PUT',
+            # Clients set Content-Length from the body themselves
+            'headers': {key: value for key, value in headers.items() if key != 'Content-Length'},
+        }
+
+    def stat(self, name):
+        """Size of a stored object, or None if there is none."""
+        try:
+            response = requests.head(self.presign('HEAD', name), timeout=S3_TIMEOUT)
+        except requests.RequestException as e:
+            raise StorageUnavailable(f'HEAD {name} failed: {e}') from e
+        # Without s3:ListBucket, S3 answers 403 rather than 404 for a missing key
+        if response.status_code in (403, 404):
+            return None
+        if not response.ok:
+            raise StorageUnavailable(f'HEAD {name} returned {response.status_code}')
+        return int(response.headers['Content-Length'])
+
+    def read(self, name, length):
+        """The first ``length`` bytes of a stored object."""
+        try:
+            with requests.get(
+                self.presign('GET', name), headers={'Range': f'bytes=0-{length - 1}'}, stream=True,
+                timeout=S3_TIMEOUT,
+            ) as response:
+                if response.status_code in (403, 404):
+                    raise ValidationError('File has not been uploaded')
+                if not response.ok:
+                    raise StorageUnavailable(f'GET {name} returned {response.status_code}')
+                data = bytearray()
+                # Servers may ignore the range; stop reading once there is enough
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    data += chunk
+                    if len(data) >= length:
+                        break
+        except requests.RequestException as e:
+            raise StorageUnavailable(f'GET {name} failed: {e}') from e
+        return bytes(data[:length])
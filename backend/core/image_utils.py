@@ -1,8 +1,8 @@
+import math
 import os
-from PIL import Image
-from io import BytesIO
-from django.core.files.uploadedfile import InMemoryUploadedFile
-import sys
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.core.exceptions import ValidationError
 
 def validate_image_file_extension(value):
@@ -14,6 +14,110 @@ def validate_image_file_extension(value):
     if ext not in valid_extensions:
         raise ValidationError('Unsupported file extension. Supported formats: JPG, JPEG, PNG, GIF, WEBP')
 
+def open_image(image_file, max_bytes=None, max_pixels=None):
+    """
+    Open an image without decoding it, after checking its byte size and,
+    from the header alone, its pixel count.
+    
+    Args:
+        image_file: A File (upload, FieldFile or plain file object)
+        max_bytes: Largest accepted file size, IMAGE_UPLOAD_MAX_BYTES by default
+        max_pixels: Largest accepted width * height, IMAGE_MAX_PIXELS by default
+        
+    Returns:
+        PIL.Image.Image: The lazily opened image
+        
+    Raises:
+        ValidationError: If the file is too big, not an image, or has too many pixels
+    """
+    max_bytes = max_bytes or settings.IMAGE_UPLOAD_MAX_BYTES
+    max_pixels = max_pixels or settings.IMAGE_MAX_PIXELS
+    
+    size = getattr(image_file, 'size', None)
+    if size is not None and size > max_bytes:
+        raise ValidationError(f'Image files must be at most {max_bytes // (1024 * 1024)} MB')
+        
+    try:
+        img = Image.open(image_file)
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        raise ValidationError('Upload a valid image. The file is either not an image or corrupted.')
+        
+    width, height = img.size
+    if width * height > max_pixels:
+        raise ValidationError(f'Images must be at most {max_pixels // 1_000_000} megapixels')
+    return img
+
+def upright_size(img):
+    """
+    The (width, height) of an opened image once its EXIF orientation is
+    applied, read without decoding it.
+    """
+    width, height = img.size
+    if img.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+def decode_image(img, size=None):
+    """
+    Decode an image returned by open_image to RGB, upright according to its
+    EXIF orientation.
+    
+    Args:
+        img: The image returned by open_image
+        size: Optional (width, height) box the caller will scale the image
+            down to fit in; None for either side leaves it unconstrained
+            
+    With ``size``, JPEGs are decoded at the smallest 1/2, 1/4 or 1/8 scale
+    still at least as large as the scaled result, so memory follows the
+    size being produced rather than the size of the upload. Other formats
+    are always decoded in full, but only once open_image has accepted their
+    dimensions.
+    
+    Returns:
+        PIL.Image.Image: The decoded image
+    """
+    if size:
+        width, height = upright_size(img)
+        scale = min(bound / side for bound, side in zip(size, (width, height)) if bound)
+        if scale < 1:
+            target = (math.ceil(width * scale), math.ceil(height * scale))
+            if (width, height) != img.size:
+                target = target[::-1]
+            img.draft('RGB', target)
+    img.load()
+    img = ImageOps.exif_transpose(img)
+    
+    # Convert to RGB if necessary (for PNGs with transparency)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
+
+def save_image(img, img_format, name, quality=85, **params):
+    """
+    Encode an image into a temporary file on disk rather than memory.
+    
+    Returns:
+        TemporaryUploadedFile: The encoded image, positioned at the start,
+        with its actual size in bytes. Closing it removes the file.
+    """
+    output = TemporaryUploadedFile(name, Image.MIME.get(img_format, 'application/octet-stream'), 0, None)
+    img.save(output, format=img_format, quality=quality, **params)
+    output.size = output.tell()
+    output.seek(0)
+    return output
+
+def output_format(name):
+    """
+    The format resize_image writes for a file name: PNG and WEBP are kept,
+    everything else becomes JPEG.
+    """
+    ext = os.path.splitext(name)[1].lower()
+    if ext == '.png':
+        return 'PNG'
+    elif ext == '.webp':
+        return 'WEBP'
+    return 'JPEG'
+
 def resize_image(image_field, size=(500, 500), quality=85):
     """
     Resize the given image to the specified size while maintaining aspect ratio.
@@ -24,42 +128,24 @@ def resize_image(image_field, size=(500, 500), quality=85):
         quality: Image quality (1-100)
         
     Returns:
-        InMemoryUploadedFile: The resized image
+        TemporaryUploadedFile: The resized image
     """
     if not image_field:
         return None
         
-    # Open the image
-    img = Image.open(image_field)
-    
-    # Convert to RGB if necessary (for PNGs with transparency)
-    if img.mode in ('RGBA', 'P'):
-        img = img.convert('RGB')
+    # Decode at a reduced scale where the format allows it
+    img = decode_image(open_image(image_field), size)
     
     # Resize while maintaining aspect ratio
     img.thumbnail(size, Image.Resampling.LANCZOS)
     
-    # Save the image to a BytesIO object
-    output = BytesIO()
-    img_format = 'JPEG'  # Default format
-    
-    # Determine the format
-    ext = os.path.splitext(image_field.name)[1].lower()
-    if ext == '.png':
-        img_format = 'PNG'
-    elif ext == '.webp':
-        img_format = 'WEBP'
+    img_format = output_format(image_field.name)
     
     # Save with the appropriate format and quality
-    img.save(output, format=img_format, quality=quality, optimize=True)
-    
-    # Create a new InMemoryUploadedFile
-    output.seek(0)
-    return InMemoryUploadedFile(
-        output,
-        'ImageField',
+    return save_image(
+        img,
+        img_format,
         f"{os.path.splitext(image_field.name)[0]}.{img_format.lower()}",
-        f'image/{img_format.lower() if img_format != "jpg" else "jpeg"}',
-        sys.getsizeof(output),
-        None
+        quality=quality,
+        optimize=True,
     )
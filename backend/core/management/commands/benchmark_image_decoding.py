@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.image_utils import decode_image, open_image, save_image
+from PIL import Image
+from io import BytesIO
+import logging
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def make_photo(path, megapixels):
+    """Write a noisy (so realistically sized) 3:2 JPEG of the given size."""
+    width = int((megapixels * 1_000_000 * 3 / 2) ** 0.5)
+    height = int(width * 2 / 3)
+    noise = Image.effect_noise((width, height), 48)
+    Image.merge('RGB', (noise, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT), noise)).save(path, 'JPEG', quality=90)
+
+
+def full_decode(path, bound):
+    """The previous ingestion path: full decode, resize, encode into memory."""
+    img = Image.open(path)
+    img.load()
+    img = img.convert('RGB')
+    img.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=85)
+
+
+def bounded_decode(path, bound):
+    """Draft-mode decode, resize, encode into a temporary file."""
+    with open(path, 'rb') as source:
+        img = decode_image(open_image(source, max_pixels=10 ** 10), (bound, bound))
+    img.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+    save_image(img, 'JPEG', 'benchmark.jpg').close()
+
+
+def measure(func, *args):
+    """
+    Run ``func`` and return (peak RSS growth in MB, seconds). Meant for a
+    freshly forked process, whose peak RSS starts at its size when forked.
+    """
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - started
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024, elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the peak memory and time of ingesting JPEGs of several sizes, full decoding '
+        'into memory versus the draft-mode, temp-file path of core.image_utils. Each run gets its own process.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--megapixels',
+            type=float,
+            nargs='+',
+            default=[4, 12, 24, 48],
+            help='Sizes of the generated test photos',
+        )
+        parser.add_argument(
+            '--bound',
+            type=int,
+            default=1920,
+            help='Longest side of the produced image',
+        )
+
+    def handle(self, *args, **options):
+        if options['bound'] < 1 or min(options['megapixels']) <= 0:
+            raise CommandError('--megapixels and --bound must be positive')
+
+        # Fork so that every measurement starts from the same small process
+        context = multiprocessing.get_context('fork')
+
+        def run(func, *args):
+            with context.Pool(1) as pool:
+                return pool.apply(func, args)
+
+        self.stdout.write(f"{'Photo':>12} {'File':>9}  {'Path':<16} {'Peak RSS':>10} {'Time':>9}")
+        with tempfile.TemporaryDirectory() as directory:
+            for megapixels in options['megapixels']:
+                path = os.path.join(directory, f'{megapixels:g}mp.jpg')
+                run(make_photo, path, megapixels)
+                file_mb = os.path.getsize(path) / (1024 * 1024)
+
+                for label, func in (('full decode', full_decode), ('bounded decode', bounded_decode)):
+                    peak, elapsed = run(measure, func, path, options['bound'])
+                    self.stdout.write(
+                        f'{megapixels:>10g}MP {file_mb:>7.1f}MB  {label:<16} {peak:>8.1f}MB {elapsed * 1000:>7.0f}ms'
+                    )
+                    logger.info(f'Image decoding benchmark: {megapixels:g}MP {label} peak {peak:.1f}MB')
+
+        self.stdout.write(self.style.SUCCESS('Successfully ran image decoding benchmark'))
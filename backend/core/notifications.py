@@ -72,3 +72,4 @@ class NotificationTypes:
     PAYMENT = 'payment'
     BOOKING = 'booking'
     MAINTENANCE = 'maintenance'
+    SAVED_SEARCH = 'saved_search'
@@ -0,0 +1,67 @@
+import json
+import logging
+
+from rest_framework.pagination import CursorPagination
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for a queryset instead of running COUNT(*).
+    Falls back to an exact count if the estimate cannot be read.
+    """
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        logger.warning(f"Could not estimate row count, falling back to COUNT(*): {str(e)}")
+        return queryset.count()
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination keyed on ``(created_at, id)`` by default.
+
+    Every page costs the same as the first one because there is no OFFSET and
+    no COUNT(*). Clients that still need a total can ask for it with
+    ``?count=estimate`` (planner estimate) or ``?count=exact``.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            self.count = queryset.count()
+        elif count_mode == 'estimate':
+            self.count = estimate_count(queryset)
+        else:
+            self.count = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        # Add the primary key as a tie-breaker so rows sharing a sort value
+        # keep a stable order across pages
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            direction = '-' if ordering[0].startswith('-') else ''
+            ordering = ordering + (f'{direction}id',)
+        return ordering
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data['count'] = self.count
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response_schema
+
+
+class ViewedAtKeysetPagination(KeysetPagination):
+    ordering = ('-viewed_at', '-id')
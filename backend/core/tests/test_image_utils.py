@@ -0,0 +1,77 @@
+"""Tests for the memory-bounded image helpers in core.image_utils."""
+import os
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ..image_utils import decode_image, open_image, resize_image, save_image
+
+
+def jpeg_upload(size=(3000, 2000), orientation=None, name='photo.jpg'):
+    output = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new('RGB', size, (200, 80, 40)).save(output, 'JPEG', exif=exif)
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg')
+
+
+class ImageUtilsTests(TestCase):
+    @override_settings(IMAGE_UPLOAD_MAX_BYTES=1024)
+    def test_byte_limit_checked_before_opening(self):
+        """Test that a file over the byte limit is rejected from its size alone"""
+        upload = jpeg_upload()
+        with self.assertRaisesMessage(ValidationError, 'at most'):
+            open_image(upload)
+        self.assertEqual(upload.tell(), 0)
+
+    @override_settings(IMAGE_MAX_PIXELS=5_000_000)
+    def test_pixel_limit_checked_from_header(self):
+        """Test that too many pixels are rejected without decoding the image"""
+        self.assertEqual(open_image(jpeg_upload(size=(2000, 2000))).size, (2000, 2000))
+        with self.assertRaisesMessage(ValidationError, '5 megapixels'):
+            open_image(jpeg_upload(size=(3000, 2000)))
+
+    def test_not_an_image(self):
+        """Test that a file Pillow cannot identify is a validation error"""
+        with self.assertRaises(ValidationError):
+            open_image(SimpleUploadedFile('photo.jpg', b'not an image'))
+
+    def test_draft_decodes_jpeg_at_reduced_scale(self):
+        """Test that a JPEG is decoded at the smallest scale still covering the requested size"""
+        img = decode_image(open_image(jpeg_upload(size=(4000, 3000))), (900, 900))
+        self.assertEqual(img.size, (1000, 750))
+        self.assertEqual(img.mode, 'RGB')
+
+        img = decode_image(open_image(jpeg_upload(size=(4000, 3000))), (1920, None))
+        self.assertEqual(img.size, (2000, 1500))
+
+    def test_draft_follows_exif_orientation(self):
+        """Test that the scale is chosen for the upright image"""
+        img = decode_image(open_image(jpeg_upload(size=(4000, 3000), orientation=6)), (700, None))
+        self.assertEqual(img.size, (750, 1000))
+
+    def test_save_image_streams_to_disk(self):
+        """Test that the encoded image lives in a temporary file with its real size"""
+        output = save_image(Image.new('RGB', (64, 64)), 'PNG', 'small.png')
+        path = output.temporary_file_path()
+        try:
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(output.size, os.path.getsize(path))
+            self.assertEqual(output.content_type, 'image/png')
+        finally:
+            output.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_resize_image(self):
+        """Test that resize_image keeps the aspect ratio and reports the encoded size"""
+        resized = resize_image(jpeg_upload(size=(3000, 2000)), size=(500, 500))
+        try:
+            self.assertEqual(resized.size, len(resized.read()))
+            resized.seek(0)
+            self.assertEqual(Image.open(resized).size, (500, 333))
+        finally:
+            resized.close()
@@ -9,4 +9,5 @@ app_name = 'core'
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('direct-uploads/<str:token>/', views.DirectUploadView.as_view(), name='direct-upload'),
 ]
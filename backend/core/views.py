@@ -2,10 +2,15 @@ from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, BasePermission
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db.models import Q
+from io import BytesIO
 
 from rooms.models import Property
+from .direct_uploads import DirectUpload, LocalDirectUploadBackend, get_direct_upload_backend
 from .serializers import PropertySerializer
 
 
@@ -115,3 +120,23 @@ class PropertyViewSet(viewsets.ModelViewSet):
             'format': self.format_kwarg,
             'view': self
         }
+
+
+class DirectUploadView(APIView):
+    """
+    Receives the PUTs to LocalDirectUploadBackend's presigned URLs. The token
+    in the URL authorizes the upload, as the signature does on S3.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def put(self, request, token):
+        backend = get_direct_upload_backend()
+        if not isinstance(backend, LocalDirectUploadBackend):
+            return Response({"error": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            upload = DirectUpload.from_token(token, max_age=settings.DIRECT_UPLOAD_EXPIRES)
+            backend.receive(upload, request.stream or BytesIO())
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_200_OK)
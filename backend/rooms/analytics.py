@@ -0,0 +1,251 @@
+"""
+Property view analytics built from daily rollups.
+
+Raw PropertyView rows are folded into PropertyViewDaily incrementally: each
+run reads only rows past the stored watermark, and recomputes just the
+(property, day) groups those rows touch. Distinct viewer counts cannot be
+added up across runs, so touched days are recounted from their raw rows,
+which the (property, viewed_at) index keeps cheap.
+
+Each rollup row also stores HyperLogLog sketches of its viewers. Unique
+viewers over a range of days or several properties are estimated by merging
+those sketches, so no query over a range ever reads raw rows.
+
+The landlord dashboard (landlord_property_stats) gathers every per-property
+figure with one grouped query per source table, however many listings the
+landlord has.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from messaging.models import Conversation
+from transactions.models import Transaction
+
+from .hyperloglog import HyperLogLog
+from .models import AnalyticsWatermark, Favorite, Property, PropertyView, PropertyViewDaily
+
+logger = logging.getLogger(__name__)
+
+VIEW_ROLLUP = 'property_view_daily'
+# (property, day) groups recounted per query
+GROUPS_PER_QUERY = 500
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def viewer_key(viewer_id, ip_address):
+    """Signed-in viewers are counted by user, anonymous ones by IP address."""
+    return f'user:{viewer_id}' if viewer_id is not None else f'ip:{ip_address}'
+
+
+def recount_days(groups):
+    """Recompute and upsert the rollup rows for the given (property_id, day) pairs."""
+    groups = sorted(groups)
+    for offset in range(0, len(groups), GROUPS_PER_QUERY):
+        chunk = groups[offset:offset + GROUPS_PER_QUERY]
+        condition = Q()
+        for property_id, day in chunk:
+            start, end = day_bounds(day)
+            condition |= Q(property_id=property_id, viewed_at__gte=start, viewed_at__lt=end)
+
+        views = (
+            PropertyView.objects.filter(condition)
+            .annotate(day=TruncDate('viewed_at'))
+            .values_list('property_id', 'day')
+            .annotate(views=Count('id'))
+            .order_by()
+        )
+        viewers = defaultdict(set)
+        authenticated = defaultdict(set)
+        for property_id, day, viewer_id, ip_address in (
+            PropertyView.objects.filter(condition)
+            .annotate(day=TruncDate('viewed_at'))
+            .values_list('property_id', 'day', 'viewer_id', 'ip_address')
+            .distinct()
+        ):
+            viewers[property_id, day].add(viewer_key(viewer_id, ip_address))
+            if viewer_id is not None:
+                authenticated[property_id, day].add(viewer_key(viewer_id, ip_address))
+
+        PropertyViewDaily.objects.bulk_create(
+            [
+                PropertyViewDaily(
+                    property_id=property_id,
+                    day=day,
+                    views=count,
+                    unique_viewers=len(viewers[property_id, day]),
+                    authenticated_viewers=len(authenticated[property_id, day]),
+                    viewer_sketch=HyperLogLog.from_keys(viewers[property_id, day]).to_bytes(),
+                    authenticated_sketch=HyperLogLog.from_keys(authenticated[property_id, day]).to_bytes(),
+                )
+                for property_id, day, count in views
+            ],
+            update_conflicts=True,
+            unique_fields=['property', 'day'],
+            update_fields=['views', 'unique_viewers', 'authenticated_viewers', 'viewer_sketch', 'authenticated_sketch'],
+        )
+
+
+def rollup_property_views(batch_size=10000):
+    """
+    Fold PropertyView rows newer than the watermark into the daily rollups.
+    Each batch and its watermark move are committed together. Returns the
+    number of raw rows processed.
+    """
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark, _ = AnalyticsWatermark.objects.select_for_update().get_or_create(name=VIEW_ROLLUP)
+            rows = list(
+                PropertyView.objects.filter(pk__gt=watermark.last_id)
+                .order_by('pk')
+                .values_list('pk', 'property_id', 'viewed_at')[:batch_size]
+            )
+            if not rows:
+                return processed
+
+            recount_days({(property_id, timezone.localdate(viewed_at)) for _, property_id, viewed_at in rows})
+            watermark.last_id = rows[-1][0]
+            watermark.save(update_fields=['last_id', 'updated_at'])
+
+        processed += len(rows)
+        logger.info(f"Rolled up {processed} property views (watermark {watermark.last_id})")
+
+
+class ViewTotals:
+    """Views summed and viewer sketches merged over a set of rollup rows."""
+
+    def __init__(self):
+        self.rows = 0
+        self.views = 0
+        self.viewers = HyperLogLog()
+        self.authenticated = HyperLogLog()
+        self.exact = (0, 0)
+
+    def add(self, row):
+        self.rows += 1
+        self.views += row['views']
+        self.viewers.merge_bytes(row['viewer_sketch'])
+        self.authenticated.merge_bytes(row['authenticated_sketch'])
+        self.exact = (row['unique_viewers'], row['authenticated_viewers'])
+
+    def metrics(self):
+        # A single day of a single property has exact counts stored
+        if self.rows <= 1:
+            unique_viewers, authenticated_viewers = self.exact
+        else:
+            unique_viewers, authenticated_viewers = self.viewers.count(), self.authenticated.count()
+        return {
+            'views': self.views,
+            'unique_viewers': unique_viewers,
+            'authenticated_viewers': authenticated_viewers,
+        }
+
+
+def landlord_view_stats(landlord, start, end, property_id=None):
+    """
+    Daily and per-property view totals for a landlord's listings between
+    ``start`` and ``end`` (inclusive), read from the rollups only. Unique
+    viewer counts spanning more than one rollup row are HyperLogLog
+    estimates, so a viewer returning on several days is counted once.
+    """
+    rollups = PropertyViewDaily.objects.filter(property__landlord=landlord, day__range=(start, end))
+    if property_id is not None:
+        rollups = rollups.filter(property_id=property_id)
+
+    totals = ViewTotals()
+    by_day = defaultdict(ViewTotals)
+    by_property = defaultdict(ViewTotals)
+    titles = {}
+    for row in rollups.values(
+        'property_id', 'property__title', 'day', 'views', 'unique_viewers', 'authenticated_viewers',
+        'viewer_sketch', 'authenticated_sketch',
+    ).order_by():
+        totals.add(row)
+        by_day[row['day']].add(row)
+        by_property[row['property_id']].add(row)
+        titles[row['property_id']] = row['property__title']
+
+    daily = [
+        {'day': day, **by_day[day].metrics()}
+        for day in (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+    ]
+    properties = sorted(
+        (
+            {'property_id': pk, 'title': titles[pk], **property_totals.metrics()}
+            for pk, property_totals in by_property.items()
+        ),
+        key=lambda row: (-row['views'], row['property_id']),
+    )
+    watermark = AnalyticsWatermark.objects.filter(name=VIEW_ROLLUP).first()
+
+    return {
+        'start': start,
+        'end': end,
+        'rolled_up_at': watermark.updated_at if watermark else None,
+        'totals': totals.metrics(),
+        'daily': daily,
+        'properties': properties,
+    }
+
+
+def _counts_by_property(queryset, value=None):
+    value = value or Count('id')
+    return dict(queryset.values('property_id').annotate(value=value).values_list('property_id', 'value').order_by())
+
+
+def landlord_property_stats(landlord):
+    """
+    Views, favorites, conversations, successful transactions and rating for
+    each of a landlord's properties, plus totals. Views are the rolled up
+    counts plus the raw views the rollup has not reached yet.
+    """
+    properties = list(
+        Property.objects.filter(landlord=landlord)
+        .order_by('-created_at', '-id')
+        .values('id', 'title', 'status', 'average_rating', 'review_count')
+    )
+    watermark = AnalyticsWatermark.objects.filter(name=VIEW_ROLLUP).values_list('last_id', flat=True).first() or 0
+
+    rolled_up = _counts_by_property(PropertyViewDaily.objects.filter(property__landlord=landlord), Sum('views'))
+    pending = _counts_by_property(PropertyView.objects.filter(property__landlord=landlord, pk__gt=watermark))
+    favorites = _counts_by_property(Favorite.objects.filter(property__landlord=landlord))
+    conversations = _counts_by_property(Conversation.objects.filter(property__landlord=landlord))
+    transactions = _counts_by_property(Transaction.objects.filter(property__landlord=landlord, status='successful'))
+
+    rows = [
+        {
+            'property_id': row['id'],
+            'title': row['title'],
+            'status': row['status'],
+            'views': rolled_up.get(row['id'], 0) + pending.get(row['id'], 0),
+            'favorites': favorites.get(row['id'], 0),
+            'conversations': conversations.get(row['id'], 0),
+            'successful_transactions': transactions.get(row['id'], 0),
+            'average_rating': row['average_rating'],
+            'review_count': row['review_count'],
+        }
+        for row in properties
+    ]
+    reviews = sum(row['review_count'] for row in rows)
+    totals = {
+        'properties': len(rows),
+        **{
+            name: sum(row[name] for row in rows)
+            for name in ('views', 'favorites', 'conversations', 'successful_transactions')
+        },
+        'average_rating': round(
+            sum(row['average_rating'] * row['review_count'] for row in rows if row['review_count']) / reviews, 2
+        ) if reviews else None,
+        'review_count': reviews,
+    }
+    return {'generated_at': timezone.now(), 'totals': totals, 'properties': rows}
@@ -0,0 +1,153 @@
+"""
+Generation-counter cache helpers for listing data.
+
+Cached entries embed the current generation of their namespace in the key.
+Writes bump the generation, which orphans every older entry in O(1) without
+scanning or deleting keys; stale entries simply expire.
+
+The same counters version HTTP responses: ETag and Last-Modified validators
+are derived from generations and the time of the last bump, so a
+conditional GET can be answered with a 304 without touching the database.
+
+Generations are only seen by every worker when the default cache is
+shared (SHARED_CACHE, i.e. Redis); callers check it before relying on them
+across requests.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+PROPERTIES = 'properties'
+LOCATIONS = 'locations'
+
+
+def _generation_key(namespace):
+    return f'rooms:generation:{namespace}'
+
+
+def _modified_key(namespace):
+    return f'rooms:modified:{namespace}'
+
+
+def get_generation(namespace):
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses an old value
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    cache.set(_modified_key(namespace), int(time.time()), timeout=None)
+    key = _generation_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+        return cache.get(key)
+
+
+def bump_generation_on_commit(namespace):
+    """
+    Bump ``namespace`` once the current transaction commits (at once outside
+    one). A read between an earlier bump and the commit would cache the old
+    data under the new generation, and its ETag would keep confirming it.
+    """
+    transaction.on_commit(lambda: bump_generation(namespace))
+
+
+def get_last_modified(namespace):
+    """Unix time of the namespace's last bump (or of first use, if never bumped)."""
+    key = _modified_key(namespace)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time.time()), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def normalize_params(query_params, exclude=()):
+    """Return a canonical string for a QueryDict, ignoring order and blank values."""
+    items = []
+    for key in sorted(query_params.keys()):
+        if key in exclude:
+            continue
+        values = sorted(value.strip() for value in query_params.getlist(key) if value.strip())
+        items.extend((key, value) for value in values)
+    return urlencode(items)
+
+
+def make_key(namespace, prefix, *parts):
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'rooms:{prefix}:{get_generation(namespace)}:{digest}'
+
+
+def favorites_namespace(user_id):
+    return f'favorites:{user_id}'
+
+
+def property_namespace(property_id):
+    return f'property:{property_id}'
+
+
+def response_cache_key(request, prefix):
+    """
+    Key a cached GET response by host, path and normalized query params.
+    Authenticated users get their own entries (``is_favorited`` differs per
+    user), versioned by a per-user favorites generation.
+    """
+    parts = [request.scheme, request.get_host(), request.path, normalize_params(request.query_params)]
+    if request.user.is_authenticated:
+        user_id = request.user.pk
+        parts.append(f'user:{user_id}:{get_generation(favorites_namespace(user_id))}')
+    return make_key(PROPERTIES, prefix, *parts)
+
+
+def response_validators(request, namespace):
+    """
+    Strong ETag and Last-Modified (Unix time) for a GET whose body depends on
+    ``namespace`` and, for authenticated users, their favorites. The ETag
+    covers everything that selects the representation: host, path,
+    normalized query params, renderer and the relevant generations.
+    """
+    parts = [
+        request.get_host(), request.path, normalize_params(request.query_params),
+        request.accepted_renderer.format, get_generation(namespace),
+    ]
+    last_modified = get_last_modified(namespace)
+    if request.user.is_authenticated:
+        favorites = favorites_namespace(request.user.pk)
+        parts.append(f'user:{request.user.pk}:{get_generation(favorites)}')
+        last_modified = max(last_modified, get_last_modified(favorites))
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"', last_modified
+
+
+def _stats_key(name):
+    return f'rooms:response-cache:{name}'
+
+
+def record_lookup(hit):
+    key = _stats_key('hits' if hit else 'misses')
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    hits = cache.get(_stats_key('hits'), 0)
+    misses = cache.get(_stats_key('misses'), 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        'generation': get_generation(PROPERTIES),
+    }
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.db import connection
+
+AMENITY_FACETS = ('furnished', 'parking', 'pets_allowed')
+
+# One pass over the filtered rows: GROUPING SETS yields the per-type,
+# per-bedroom and per-price-bucket counts plus a grand total row that also
+# carries the amenity counts and the price bounds.
+FACETS_SQL = """
+WITH filtered AS ({filtered_sql}),
+bounds AS (SELECT MIN(price) AS lo, MAX(price) AS hi FROM filtered),
+bucketed AS (
+    SELECT f.property_type, f.bedrooms, f.furnished, f.parking, f.pets_allowed,
+           width_bucket(f.price, b.lo, b.hi + 0.01, %s) AS price_bucket
+    FROM filtered f CROSS JOIN bounds b
+)
+SELECT
+    GROUPING(property_type) = 0 AS by_type,
+    GROUPING(bedrooms) = 0 AS by_bedrooms,
+    GROUPING(price_bucket) = 0 AS by_price,
+    property_type, bedrooms, price_bucket,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE furnished),
+    COUNT(*) FILTER (WHERE parking),
+    COUNT(*) FILTER (WHERE pets_allowed),
+    (SELECT lo FROM bounds),
+    (SELECT hi FROM bounds)
+FROM bucketed
+GROUP BY GROUPING SETS ((property_type), (bedrooms), (price_bucket), ())
+"""
+
+
+def compute_facets(queryset, price_buckets=10):
+    """
+    Count properties per type, bedroom count, amenity flag and price bucket
+    for an already-filtered Property queryset, in a single query.
+    """
+    filtered_sql, params = queryset.order_by().values(
+        'property_type', 'bedrooms', 'price', *AMENITY_FACETS
+    ).query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(FACETS_SQL.format(filtered_sql=filtered_sql), (*params, price_buckets))
+        rows = cursor.fetchall()
+
+    facets = {
+        'total': 0,
+        'property_type': [],
+        'bedrooms': [],
+        'amenities': dict.fromkeys(AMENITY_FACETS, 0),
+        'price': {'min': None, 'max': None, 'buckets': []},
+    }
+    bucket_counts = {}
+    for (by_type, by_bedrooms, by_price, property_type, bedrooms, bucket,
+         count, furnished, parking, pets_allowed, low, high) in rows:
+        if by_type:
+            facets['property_type'].append({'value': property_type, 'count': count})
+        elif by_bedrooms:
+            facets['bedrooms'].append({'value': bedrooms, 'count': count})
+        elif by_price:
+            if bucket is not None:
+                bucket_counts[bucket] = count
+        else:
+            facets['total'] = count
+            facets['amenities'] = {
+                'furnished': furnished, 'parking': parking, 'pets_allowed': pets_allowed
+            }
+            facets['price']['min'], facets['price']['max'] = low, high
+
+    facets['property_type'].sort(key=lambda facet: (-facet['count'], facet['value']))
+    facets['bedrooms'].sort(key=lambda facet: facet['value'])
+
+    low, high = facets['price']['min'], facets['price']['max']
+    if low is not None:
+        width = (high + Decimal('0.01') - low) / price_buckets
+        facets['price']['buckets'] = [
+            {
+                'min': (low + width * (index - 1)).quantize(Decimal('0.01')),
+                'max': (low + width * index).quantize(Decimal('0.01')),
+                'count': bucket_counts.get(index, 0),
+            }
+            for index in range(1, price_buckets + 1)
+        ]
+    return facets
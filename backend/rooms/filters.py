@@ -0,0 +1,155 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from . import geo
+from .models import Property
+
+SEARCH_CONFIG = 'english'
+
+
+def build_search_query(terms):
+    """Parse user input the way web search boxes do (quotes, OR, -exclusions)."""
+    return SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def add_search_headlines(properties, terms):
+    """
+    Attach highlighted title/description snippets to a page of search results.
+    Headlines are expensive, so they are built in one query for the page only
+    rather than for every matching row.
+    """
+    if not properties:
+        return properties
+    query = build_search_query(terms)
+    headline_options = {'config': SEARCH_CONFIG, 'start_sel': '<mark>', 'stop_sel': '</mark>'}
+    headlines = Property.objects.filter(pk__in=[obj.pk for obj in properties]).order_by().annotate(
+        title_headline=SearchHeadline('title', query, highlight_all=True, **headline_options),
+        description_headline=SearchHeadline(
+            'description', query, max_fragments=2, fragment_delimiter=' … ', **headline_options
+        ),
+    ).values_list('pk', 'title_headline', 'description_headline')
+
+    by_pk = {pk: (title, description) for pk, title, description in headlines}
+    for obj in properties:
+        obj.title_headline, obj.description_headline = by_pk.get(obj.pk, (None, None))
+    return properties
+
+
+class PropertyFullTextSearchFilter(filters.BaseFilterBackend):
+    """
+    Ranked full-text search over Property.search_vector (GIN indexed).
+
+    Matches are ordered by ts_rank unless the client asks for an explicit
+    ``ordering``.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = build_search_query(terms)
+        # ts_rank() returns a float4; widen it so the value handed to clients
+        # round-trips exactly when used as a pagination cursor
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
+
+
+class PropertyGeoFilter(filters.BaseFilterBackend):
+    """
+    Radius (``near=lat,lng&radius_km=``) and bounding-box
+    (``bbox=min_lng,min_lat,max_lng,max_lat``) lookups.
+
+    Radius queries are narrowed with geohash prefixes before computing exact
+    distances. Both modes annotate ``distance_km`` and are sorted by it
+    (from the bbox centre for ``bbox``) unless an explicit ``ordering`` is given.
+    """
+    default_radius_km = 5
+    max_radius_km = 200
+
+    def parse_floats(self, request, param, count):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            numbers = [float(part) for part in value.split(',')]
+        except ValueError:
+            numbers = []
+        if len(numbers) != count:
+            raise ValidationError({param: f"Expected {count} comma-separated numbers."})
+        return numbers
+
+    def get_near(self, request):
+        near = self.parse_floats(request, 'near', 2)
+        if near is None:
+            return None
+        latitude, longitude = near
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({'near': "Coordinates are out of range."})
+        try:
+            radius_km = float(request.query_params.get('radius_km', self.default_radius_km))
+        except ValueError:
+            raise ValidationError({'radius_km': "A number is required."})
+        if not 0 < radius_km <= self.max_radius_km:
+            raise ValidationError({'radius_km': f"Must be between 0 and {self.max_radius_km}."})
+        return latitude, longitude, radius_km
+
+    def get_bbox(self, request):
+        bbox = self.parse_floats(request, 'bbox', 4)
+        if bbox is None:
+            return None
+        min_lng, min_lat, max_lng, max_lat = bbox
+        # min_lng > max_lng is a box crossing the antimeridian
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+            raise ValidationError({'bbox': "Expected min_lng,min_lat,max_lng,max_lat within range."})
+        return min_lat, min_lng, max_lat, max_lng
+
+    def is_active(self, request):
+        return bool(request.query_params.get('near') or request.query_params.get('bbox'))
+
+    def box_match(self, min_lat, min_lng, max_lat, max_lng):
+        longitude_match = Q()
+        for low, high in geo.longitude_ranges(min_lng, max_lng):
+            longitude_match |= Q(longitude__range=(low, high))
+        return Q(latitude__range=(min_lat, max_lat)) & longitude_match
+
+    def filter_queryset(self, request, queryset, view):
+        near = self.get_near(request)
+        bbox = self.get_bbox(request)
+        if near is None and bbox is None:
+            return queryset
+
+        if near is not None:
+            latitude, longitude, radius_km = near
+            cells = geo.covering_cells(latitude, longitude, radius_km)
+            if cells:
+                prefix_match = Q()
+                for cell in cells:
+                    prefix_match |= Q(geohash__startswith=cell)
+                queryset = queryset.filter(prefix_match)
+            min_lat, min_lng, max_lat, max_lng = geo.bounding_box(latitude, longitude, radius_km)
+            queryset = queryset.filter(self.box_match(min_lat, min_lng, max_lat, max_lng))
+            queryset = queryset.annotate(
+                distance_km=geo.distance_expression(latitude, longitude)
+            ).filter(distance_km__lte=radius_km)
+        else:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            queryset = queryset.filter(self.box_match(min_lat, min_lng, max_lat, max_lng)).annotate(
+                distance_km=geo.distance_expression((min_lat + max_lat) / 2, geo.centre_longitude(min_lng, max_lng))
+            )
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('distance_km', 'id')
+        return queryset
@@ -0,0 +1,153 @@
+"""
+Geohash helpers for property location lookups.
+
+Properties store a geohash of their coordinates; nearby properties share a
+prefix. A radius query only has to scan the 3x3 block of cells around the
+centre at a precision where one cell is at least as large as the radius,
+which a btree prefix index answers directly. Exact distances are then
+computed for the few remaining candidates.
+"""
+import math
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+    while len(geohash) < precision:
+        value, value_range = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(geohash)
+
+
+def decode(geohash):
+    """Return the centre and half-sizes ``(lat, lng, lat_err, lng_err)`` of a cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        index = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            value_range = lng_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (index >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+    return (
+        (lat_range[0] + lat_range[1]) / 2,
+        (lng_range[0] + lng_range[1]) / 2,
+        (lat_range[1] - lat_range[0]) / 2,
+        (lng_range[1] - lng_range[0]) / 2,
+    )
+
+
+def cell_size(precision):
+    """Return the ``(lat_degrees, lng_degrees)`` size of a cell at a precision."""
+    bits = precision * 5
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def precision_for_radius(latitude, radius_km):
+    """Finest precision whose cells are at least ``radius_km`` across at this latitude."""
+    lat_degrees = radius_km / KM_PER_DEGREE_LAT
+    lng_degrees = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lng = cell_size(precision)
+        if cell_lat >= lat_degrees and cell_lng >= lng_degrees:
+            return precision
+    return 0
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose union contains every point within ``radius_km``.
+    An empty list means the radius is too large to narrow down by prefix.
+    """
+    precision = precision_for_radius(latitude, radius_km)
+    if precision == 0:
+        return []
+    cell_lat, cell_lng = cell_size(precision)
+    cells = set()
+    for d_lat in (-cell_lat, 0, cell_lat):
+        for d_lng in (-cell_lng, 0, cell_lng):
+            lat = latitude + d_lat
+            if not -90 <= lat <= 90:
+                continue
+            lng = (longitude + d_lng + 180) % 360 - 180
+            cells.add(encode(lat, lng, precision))
+    return sorted(cells)
+
+
+def wrap_longitude(longitude):
+    """Bring a longitude that ran past the antimeridian back into [-180, 180]."""
+    if longitude < -180:
+        return longitude + 360
+    if longitude > 180:
+        return longitude - 360
+    return longitude
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return ``(min_lat, min_lng, max_lat, max_lng)`` around a point. Longitudes
+    wrap, so a box crossing the antimeridian has ``min_lng > max_lng`` (see
+    longitude_ranges).
+    """
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    lng_delta = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+    if lng_delta >= 180:
+        min_lng, max_lng = -180.0, 180.0
+    else:
+        min_lng, max_lng = wrap_longitude(longitude - lng_delta), wrap_longitude(longitude + lng_delta)
+    return (
+        max(latitude - lat_delta, -90.0),
+        min_lng,
+        min(latitude + lat_delta, 90.0),
+        max_lng,
+    )
+
+
+def longitude_ranges(min_lng, max_lng):
+    """Split a west-to-east span into ``(low, high)`` ranges that don't cross the antimeridian."""
+    if min_lng <= max_lng:
+        return [(min_lng, max_lng)]
+    return [(min_lng, 180.0), (-180.0, max_lng)]
+
+
+def centre_longitude(min_lng, max_lng):
+    """Midpoint of a west-to-east span, which may cross the antimeridian."""
+    if min_lng <= max_lng:
+        return (min_lng + max_lng) / 2
+    return wrap_longitude((min_lng + max_lng + 360) / 2)
+
+
+def distance_expression(latitude, longitude, lat_field='latitude', lng_field='longitude'):
+    """Great-circle (haversine) distance in km from a point, as an ORM expression."""
+    lat = Value(math.radians(latitude), output_field=FloatField())
+    lng = Value(math.radians(longitude), output_field=FloatField())
+    lat_column = Radians(F(lat_field), output_field=FloatField())
+    lng_column = Radians(F(lng_field), output_field=FloatField())
+    haversine = (
+        Power(Sin((lat_column - lat) / 2), 2)
+        + Cos(lat) * Cos(lat_column) * Power(Sin((lng_column - lng) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM, output_field=FloatField()) * ASin(Sqrt(haversine))
@@ -0,0 +1,150 @@
+"""
+HyperLogLog sketches for approximate distinct counts.
+
+A sketch holds ``2 ** precision`` one-byte registers. Each key is hashed to
+64 bits; the low ``precision`` bits pick a register, which keeps the highest
+rank (position of the first set bit in the remaining bits) seen so far.
+Sketches of the same precision merge by taking the register-wise maximum,
+so the number of distinct keys across any set of sketches can be estimated
+without the keys themselves. At the default precision of 12 the standard
+error is about 1.6%.
+
+Serialized sketches are a two-byte header (format, precision) followed by
+either every register (dense) or ``(index, rank)`` pairs for the non-zero
+registers (sparse), whichever is shorter, so a sketch of a handful of keys
+takes a few bytes instead of 4 KB.
+"""
+import hashlib
+import math
+import struct
+from functools import lru_cache
+
+DEFAULT_PRECISION = 12
+MIN_PRECISION = 4
+MAX_PRECISION = 16
+
+DENSE = 0
+SPARSE = 1
+HEADER = struct.Struct('>BB')
+SPARSE_ENTRY = struct.Struct('>HB')
+
+# 2 ** -rank for every possible register value
+_INVERSE_POWERS = [2.0 ** -rank for rank in range(66)]
+
+
+@lru_cache(maxsize=None)
+def _lane_masks(size):
+    return int.from_bytes(b'\x80' * size, 'big'), int.from_bytes(b'\xff' * size, 'big')
+
+
+def register_max(left, right):
+    """
+    Register-wise maximum of two equally sized register arrays. Ranks never
+    exceed 127, so every byte is compared at once on one big integer: setting
+    the top bit of each ``left`` byte before subtracting ``right`` cannot
+    borrow across bytes, and leaves that bit set exactly where left >= right.
+    """
+    high, full = _lane_masks(len(left))
+    a = int.from_bytes(left, 'big')
+    b = int.from_bytes(right, 'big')
+    take_left = ((((a | high) - b) & high) >> 7) * 0xff
+    return bytearray(((a & take_left) | (b & ~take_left & full)).to_bytes(len(left), 'big'))
+
+
+def hash_key(key):
+    return int.from_bytes(hashlib.blake2b(str(key).encode(), digest_size=8).digest(), 'big')
+
+
+def alpha(registers):
+    if registers == 16:
+        return 0.673
+    if registers == 32:
+        return 0.697
+    if registers == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / registers)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count estimator."""
+
+    def __init__(self, precision=DEFAULT_PRECISION):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @classmethod
+    def from_keys(cls, keys, precision=DEFAULT_PRECISION):
+        sketch = cls(precision)
+        sketch.update(keys)
+        return sketch
+
+    @classmethod
+    def from_bytes(cls, data):
+        precision = HEADER.unpack_from(data)[1] if data else DEFAULT_PRECISION
+        sketch = cls(precision)
+        sketch.merge_bytes(data)
+        return sketch
+
+    def add(self, key):
+        value = hash_key(key)
+        index = value & (len(self.registers) - 1)
+        remaining_bits = 64 - self.precision
+        rank = remaining_bits - (value >> self.precision).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    def merge(self, other):
+        """Fold another sketch into this one, in place."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = register_max(self.registers, other.registers)
+        return self
+
+    def merge_bytes(self, data):
+        """
+        Fold a serialized sketch into this one without building an
+        intermediate sketch. Empty data is an empty sketch.
+        """
+        if not data:
+            return self
+        data = bytes(data)
+        kind, precision = HEADER.unpack_from(data)
+        if precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        if kind == DENSE:
+            self.registers = register_max(self.registers, data[HEADER.size:])
+        elif kind == SPARSE:
+            registers = self.registers
+            for index, rank in SPARSE_ENTRY.iter_unpack(data[HEADER.size:]):
+                if rank > registers[index]:
+                    registers[index] = rank
+        else:
+            raise ValueError(f"Unknown sketch format: {kind}")
+        return self
+
+    def to_bytes(self):
+        used = [(index, rank) for index, rank in enumerate(self.registers) if rank]
+        if len(used) * SPARSE_ENTRY.size < len(self.registers):
+            return HEADER.pack(SPARSE, self.precision) + b''.join(
+                SPARSE_ENTRY.pack(index, rank) for index, rank in used
+            )
+        return HEADER.pack(DENSE, self.precision) + bytes(self.registers)
+
+    def count(self):
+        """Estimated number of distinct keys added."""
+        registers = len(self.registers)
+        estimate = alpha(registers) * registers * registers / sum(
+            map(_INVERSE_POWERS.__getitem__, self.registers)
+        )
+        # Small cardinalities are estimated from the share of empty
+        # registers (linear counting), which is far more accurate there
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * registers and empty:
+            estimate = registers * math.log(registers / empty)
+        return round(estimate)
@@ -0,0 +1,464 @@
+"""
+Background processing of uploaded property photos.
+
+Uploads are stored as-is and the request returns straight away. Once the
+upload's transaction commits, a worker thread renders the size variants
+(thumb, card, full) in WebP and JPEG and records the original's width and
+height; serializers then offer the variants as ``srcset`` candidates.
+Pillow releases the GIL while decoding, resampling and encoding, so a small
+thread pool keeps several cores busy without a separate task queue.
+
+Images left pending by a restart (or failed ones, after a fix) are picked
+up by ``manage.py process_property_images``.
+
+Every image also carries a placeholder: a WebP of at most 16 pixels a
+side, as a data URI, that listings and detail pages paint (stretched and
+blurred) while the image loads. JPEGs get theirs while the upload is
+inspected, from a 1/8-scale draft decode; other formats get it with their
+variants. ``manage.py backfill_image_placeholders`` fills in older images.
+
+Uploads are content addressed: each file is stored once, as an ImageBlob
+named after the SHA-256 of its content, and every PropertyImage with the
+same content points at it. A repeated upload copies the variants of an
+already processed copy instead of rendering them again, and the blob's
+files are deleted with its last image. The files of one upload request
+are validated, hashed and stored concurrently, then inserted together.
+
+Clients can also upload photos straight to storage (core.direct_uploads),
+under their blob names; completing those uploads registers the blobs and
+inserts the images the same way, after reading back only each file's
+size and header.
+"""
+import base64
+import hashlib
+import logging
+import os
+import threading
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+from PIL import Image
+
+from core.direct_uploads import read_upload
+from core.image_utils import decode_image, open_image, save_image, upright_size
+
+from .cache import PROPERTIES, bump_generation_on_commit, property_namespace
+from .models import ImageBlob, Property, PropertyImage
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> maximum width in pixels, largest first: each variant is
+# scaled down from the previous one rather than from the original
+VARIANTS = {'full': 1920, 'card': 800, 'thumb': 320}
+# Extension -> (Pillow format, MIME type)
+FORMATS = {'webp': ('WEBP', 'image/webp'), 'jpeg': ('JPEG', 'image/jpeg')}
+QUALITY = 82
+VARIANT_DIR = 'property_images/variants'
+BLOB_DIR = 'property_images'
+PROCESSED_FIELDS = ['width', 'height', 'variants', 'placeholder', 'processing_status']
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 50
+
+# What inspect_upload learns about an upload before it is stored
+Inspection = namedtuple('Inspection', ['digest', 'width', 'height', 'placeholder'])
+
+
+def variant_name(image_name, variant, ext):
+    stem = os.path.splitext(os.path.basename(image_name))[0]
+    return f'{VARIANT_DIR}/{stem}_{variant}.{ext}'
+
+
+def variant_names(image_name):
+    return [variant_name(image_name, variant, ext) for variant in VARIANTS for ext in FORMATS]
+
+
+def srcset(variants, url):
+    """``srcset`` strings per MIME type for a variants dict; ``url`` maps a storage name to a URL."""
+    ordered = sorted(variants.values(), key=lambda entry: entry['width'])
+    return {
+        mime_type: ', '.join(f"{url(entry[ext])} {entry['width']}w" for entry in ordered)
+        for ext, (_, mime_type) in FORMATS.items()
+    } if ordered else {}
+
+
+def placeholder(picture):
+    """A data URI of ``picture`` shrunk to fit PLACEHOLDER_SIZE pixels, as WebP."""
+    scale = PLACEHOLDER_SIZE / max(picture.size)
+    tiny = picture.resize(
+        (max(1, round(picture.width * scale)), max(1, round(picture.height * scale))),
+        Image.Resampling.BOX,
+        reducing_gap=2.0,
+    )
+    # A few hundred bytes at most, so no temporary file
+    output = BytesIO()
+    tiny.save(output, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    return f"data:image/webp;base64,{base64.b64encode(output.getvalue()).decode()}"
+
+
+def read_placeholder(source):
+    """
+    Width, height and placeholder of an image file, decoding JPEGs at 1/8
+    scale. Returns ``(width, height, placeholder)``.
+    """
+    picture = open_image(source)
+    width, height = upright_size(picture)
+    return width, height, placeholder(decode_image(picture, (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE)))
+
+
+def render_variants(image):
+    """
+    Decode the upload once, then write every variant to the image's storage.
+    Returns ``(width, height, variants, placeholder)`` for the original.
+
+    JPEGs are decoded at the smallest scale still as wide as the largest
+    variant, and each encoded variant goes through a temporary file, so
+    memory per image stays bounded whatever the size of the upload.
+    """
+    with image.image.open('rb') as source:
+        picture = open_image(source)
+        width, height = upright_size(picture)
+        picture = decode_image(picture, (max(VARIANTS.values()), None))
+
+    storage = image.image.storage
+    variants = {}
+    for variant, max_width in VARIANTS.items():
+        if picture.width > max_width:
+            picture = picture.resize(
+                (max_width, max(1, round(picture.height * max_width / picture.width))),
+                Image.Resampling.LANCZOS,
+            )
+        entry = {'width': picture.width, 'height': picture.height}
+        for ext, (fmt, _) in FORMATS.items():
+            name = variant_name(image.image.name, variant, ext)
+            if image.blob_id and storage.exists(name):
+                # Rendered from the same content by another image of the blob
+                entry[ext] = name
+                continue
+            with save_image(picture, fmt, name, quality=QUALITY) as output:
+                entry[ext] = storage.save(name, output)
+        variants[variant] = entry
+    # From the smallest variant, still in memory
+    return width, height, variants, placeholder(picture)
+
+
+def process_image(image_id):
+    """Render and record the variants of one PropertyImage. Returns True on success."""
+    image = PropertyImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return False
+
+    processed = processed_copy(image.blob_id, exclude=image.pk)
+    try:
+        if processed:
+            for field, value in processed.items():
+                setattr(image, field, value)
+        else:
+            image.width, image.height, image.variants, image.placeholder = render_variants(image)
+            image.processing_status = PropertyImage.READY
+    except Exception as e:
+        logger.error(f"Error processing property image {image_id}: {str(e)}", exc_info=True)
+        image.processing_status = PropertyImage.FAILED
+
+    try:
+        # A regular save, so the listing summary and caches follow (signals)
+        image.save(update_fields=PROCESSED_FIELDS)
+    except DatabaseError:
+        logger.info(f"Property image {image_id} was deleted while it was being processed")
+        if image.blob_id and not ImageBlob.objects.filter(pk=image.blob_id).exists():
+            # The blob went with it, after its files were deleted
+            delete_files(image.image.storage, variant_names(image.image.name))
+        return False
+    return image.processing_status == PropertyImage.READY
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PROPERTY_IMAGE_WORKERS, thread_name_prefix='property-images'
+                )
+    return _executor
+
+
+def process_in_worker(image_id):
+    try:
+        return process_image(image_id)
+    finally:
+        # Worker threads hold their own connections; don't leave them open
+        connections.close_all()
+
+
+def schedule_processing(image_ids):
+    """
+    Process the given images once the current transaction commits, on the
+    worker pool, or inline when ``PROPERTY_IMAGE_WORKERS`` is 0.
+    """
+    image_ids = list(image_ids)
+
+    def submit():
+        for image_id in image_ids:
+            if settings.PROPERTY_IMAGE_WORKERS:
+                get_executor().submit(process_in_worker, image_id)
+            else:
+                process_image(image_id)
+
+    transaction.on_commit(submit)
+
+
+def content_digest(upload):
+    """SHA-256 of an uploaded file, read chunk by chunk."""
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_name(digest, upload_name):
+    ext = os.path.splitext(upload_name)[1].lower()
+    return f'{BLOB_DIR}/{digest[:2]}/{digest}{ext}'
+
+
+def inspect_upload(upload):
+    """
+    Validate an upload from its header (see core.image_utils.open_image)
+    and return its Inspection: SHA-256, upright dimensions and, for JPEGs,
+    whose draft decode is cheap, the placeholder.
+    """
+    try:
+        picture = open_image(upload)
+        width, height = upright_size(picture)
+        tiny = None
+        if picture.format == 'JPEG':
+            tiny = placeholder(decode_image(picture, (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE)))
+    except ValidationError as e:
+        raise ValidationError(f"{upload.name}: {e.messages[0]}")
+    except OSError:
+        # Truncated or corrupt image data past the header
+        raise ValidationError(f"{upload.name}: Upload a valid image. The file is either not an image or corrupted.")
+    return Inspection(content_digest(upload), width, height, tiny or '')
+
+
+def upload_pool(uploads):
+    return ThreadPoolExecutor(
+        max_workers=max(1, min(len(uploads), settings.PROPERTY_IMAGE_UPLOAD_WORKERS)),
+        thread_name_prefix='property-uploads',
+    )
+
+
+def inspect_uploads(uploads):
+    """
+    Inspections of ``uploads``, validated, hashed and (JPEGs) given their
+    placeholders concurrently; hashlib and Pillow release the GIL. Raises
+    the ValidationError of the first invalid upload.
+    """
+    with upload_pool(uploads) as pool:
+        return list(pool.map(inspect_upload, uploads))
+
+
+def store_blobs(uploads, digests, stored):
+    """
+    The ImageBlob for each distinct digest, keyed by digest, storing the
+    files of new content (concurrently) and counting one reference per
+    upload. Runs in the caller's transaction and keeps the blob rows locked
+    until it ends, so a concurrent release can't delete a file under a new
+    reference. The name of every file saved is appended to ``stored`` as
+    soon as it is saved, for the caller to delete if the transaction rolls
+    back.
+    """
+    blobs = {blob.digest: blob for blob in ImageBlob.objects.select_for_update().filter(digest__in=set(digests))}
+    new = {digest: upload for upload, digest in zip(uploads, digests) if digest not in blobs}
+    if new:
+        storage = ImageBlob._meta.get_field('file').storage
+
+        def save(digest):
+            # A leftover file of the same name gets the new blob a fresh name
+            name = storage.save(blob_name(digest, new[digest].name), new[digest])
+            stored.append(name)
+            return name
+
+        with upload_pool(new) as pool:
+            names = dict(zip(new, pool.map(save, new)))
+        ImageBlob.objects.bulk_create(
+            [ImageBlob(digest=digest, file=name, size=new[digest].size) for digest, name in names.items()],
+            ignore_conflicts=True,
+        )
+        blobs.update({blob.digest: blob for blob in ImageBlob.objects.select_for_update().filter(digest__in=new)})
+        # Content stored concurrently by another upload keeps that upload's file
+        delete_files(storage, [name for digest, name in names.items() if blobs[digest].file.name != name])
+
+    count_references(blobs, digests)
+    return blobs
+
+
+def register_blobs(stored, digests):
+    """
+    Like store_blobs, for files a client uploaded straight to storage under
+    their blob names: ``stored`` maps each digest whose file was found
+    there to ``(name, size)``. Content without a blob must be in ``stored``.
+    """
+    blobs = {blob.digest: blob for blob in ImageBlob.objects.select_for_update().filter(digest__in=set(digests))}
+    new = {digest: stored.get(digest) for digest in digests if digest not in blobs}
+    if None in new.values():
+        # Its upload was skipped for a blob released since
+        raise ValidationError('File has not been uploaded')
+    if new:
+        ImageBlob.objects.bulk_create(
+            [ImageBlob(digest=digest, file=name, size=size) for digest, (name, size) in new.items()],
+            ignore_conflicts=True,
+        )
+        blobs.update({blob.digest: blob for blob in ImageBlob.objects.select_for_update().filter(digest__in=new)})
+
+    count_references(blobs, digests)
+    return blobs
+
+
+def count_references(blobs, digests):
+    """Add one reference per digest, in one UPDATE per distinct count."""
+    references = defaultdict(list)
+    for digest, count in Counter(digests).items():
+        references[count].append(blobs[digest].pk)
+    for count, blob_ids in references.items():
+        ImageBlob.objects.filter(pk__in=blob_ids).update(reference_count=F('reference_count') + count)
+
+
+def processed_copy(blob_id, exclude=None):
+    """Processing results of an image already rendered from the same blob, if any."""
+    if blob_id is None:
+        return None
+    return (
+        PropertyImage.objects.filter(blob_id=blob_id, processing_status=PropertyImage.READY)
+        .exclude(pk=exclude)
+        .values(*PROCESSED_FIELDS)
+        .first()
+    )
+
+
+def processed_copies(blob_ids):
+    """Like processed_copy, for several blobs at once, keyed by blob id."""
+    copies = {}
+    for row in (
+        PropertyImage.objects.filter(blob_id__in=blob_ids, processing_status=PropertyImage.READY)
+        .values('blob_id', *PROCESSED_FIELDS)
+    ):
+        copies.setdefault(row.pop('blob_id'), row)
+    return copies
+
+
+def create_property_images(property_obj, uploads, inspections, caption=''):
+    """
+    Create the PropertyImages of one upload request in a single INSERT,
+    sharing the stored blob of any earlier upload with the same content
+    and copying its variants when they have been rendered. The first image
+    becomes the primary one if the property has none yet.
+    """
+    stored = []
+    try:
+        with transaction.atomic():
+            blobs = store_blobs(uploads, [inspection.digest for inspection in inspections], stored)
+            return insert_property_images(property_obj, blobs, inspections, caption)
+    except Exception:
+        # The blob rows were rolled back: don't leave their files behind
+        delete_files(ImageBlob._meta.get_field('file').storage, stored)
+        raise
+
+
+def inspect_direct_upload(upload, name=None):
+    """
+    The Inspection of a file uploaded straight to storage (at ``name``, if
+    not at its upload's), from its size and header; see read_upload.
+    """
+    width, height = upright_size(read_upload(upload, name))
+    return Inspection(upload.sha256, width, height, '')
+
+
+def complete_direct_uploads(property_obj, uploads, caption=''):
+    """
+    Create the PropertyImages of files uploaded straight to storage (see
+    core.direct_uploads), checking each one from storage concurrently.
+    Content that already has a blob was not uploaded again, so it is
+    checked at the blob's file. Placeholders come with the variants.
+
+    Raises:
+        ValidationError: For the first upload that is missing or invalid
+        StorageUnavailable: If storage could not be asked about an upload
+    """
+    existing = dict(
+        ImageBlob.objects.filter(digest__in={upload.sha256 for upload in uploads}).values_list('digest', 'file')
+    )
+    names = [existing.get(upload.sha256, upload.name) for upload in uploads]
+    with upload_pool(uploads) as pool:
+        inspections = list(pool.map(inspect_direct_upload, uploads, names))
+
+    stored = {
+        upload.sha256: (upload.name, upload.size)
+        for upload, name in zip(uploads, names) if name == upload.name
+    }
+    with transaction.atomic():
+        blobs = register_blobs(stored, [inspection.digest for inspection in inspections])
+        return insert_property_images(property_obj, blobs, inspections, caption)
+
+
+def insert_property_images(property_obj, blobs, inspections, caption=''):
+    """
+    Insert one PropertyImage per inspection in the caller's transaction,
+    with the processing results of an already rendered copy of its blob.
+    """
+    processed = processed_copies([blob.pk for blob in blobs.values()])
+    make_primary = not property_obj.images.filter(is_primary=True).exists()
+    images = []
+    for n, inspection in enumerate(inspections):
+        blob = blobs[inspection.digest]
+        fields = {'width': inspection.width, 'height': inspection.height, 'placeholder': inspection.placeholder}
+        fields.update(processed.get(blob.pk, {}))
+        images.append(PropertyImage(
+            property=property_obj,
+            image=blob.file.name,
+            blob=blob,
+            caption=caption,
+            is_primary=make_primary and n == 0,
+            **fields,
+        ))
+    PropertyImage.objects.bulk_create(images)
+
+    # bulk_create sends no post_save: refresh what the signals would have
+    Property.objects.filter(pk=property_obj.pk).refresh_listing_summaries()
+    bump_generation_on_commit(PROPERTIES)
+    bump_generation_on_commit(property_namespace(property_obj.pk))
+    return images
+
+
+def delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete {name}: {str(e)}")
+
+
+def release_blob(blob_id):
+    """
+    Drop one reference to a blob; the last one deletes the blob, then (once
+    that commits) its file and variants.
+    """
+    with transaction.atomic():
+        blob = ImageBlob.objects.select_for_update().filter(pk=blob_id).first()
+        if blob is None:
+            return
+        if blob.reference_count > 1:
+            ImageBlob.objects.filter(pk=blob_id).update(reference_count=F('reference_count') - 1)
+            return
+        names = [blob.file.name] + variant_names(blob.file.name)
+        storage = blob.file.storage
+        blob.delete()
+        transaction.on_commit(lambda: delete_files(storage, names))
@@ -0,0 +1,36 @@
+"""
+Location dictionary helpers for the autocomplete endpoint.
+
+Property.location is free text, so listings in "Lekki, " and "lekki" are the
+same place. Both sides of the lookup go through the same normalization: in
+Python for the typed prefix and as a SQL expression (backed by a functional
+index on rooms_property) when counting listings per location.
+"""
+import re
+
+from django.db.models import Aggregate, CharField, Func, Value
+from django.db.models.functions import Lower
+
+STRIP_CHARS = ' ,.'
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_location(value):
+    """Lowercase, collapse whitespace and trim separators."""
+    return WHITESPACE_RE.sub(' ', (value or '').lower()).strip(STRIP_CHARS)
+
+
+def normalized_location(field='location'):
+    """SQL twin of normalize_location() for ``field``."""
+    collapsed = Func(
+        Lower(field), Value(r'\s+'), Value(' '), Value('g'),
+        function='REGEXP_REPLACE', output_field=CharField(),
+    )
+    return Func(collapsed, Value(STRIP_CHARS), function='BTRIM', output_field=CharField())
+
+
+class Mode(Aggregate):
+    """Most frequent value in the group, used to pick a display spelling."""
+    function = 'MODE'
+    template = '%(function)s() WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = CharField()
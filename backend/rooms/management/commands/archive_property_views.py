@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rooms.models import PropertyView
+from rooms.retention import archive_property_views
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Moves PropertyView events older than the retention period into a CSV.gz archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.PROPERTY_VIEW_RETENTION_DAYS,
+            help='Keep this many days of raw view events in the database',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            default=settings.PROPERTY_VIEW_ARCHIVE_DIR,
+            help='Directory the CSV.gz archives are written to',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of rows archived and deleted per transaction',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Seconds to sleep between batches to spread out the load',
+        )
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='Run VACUUM ANALYZE on the view table afterwards so freed space is reused',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+
+        archived, path = archive_property_views(
+            options['days'],
+            archive_dir=options['archive_dir'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+        )
+
+        if options['vacuum'] and archived and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'VACUUM ANALYZE {connection.ops.quote_name(PropertyView._meta.db_table)}')
+
+        logger.info(f'Archived {archived} property views to {path}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully archived {archived} property views to {path}')
+        )
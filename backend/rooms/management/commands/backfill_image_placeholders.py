@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rooms.cache import PROPERTIES, bump_generation, property_namespace
+from rooms.images import read_placeholder
+from rooms.models import Property, PropertyImage
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def read_image(image):
+    """(image, (width, height, placeholder)), or (image, None) if it can't be read."""
+    try:
+        with image.image.open('rb') as source:
+            return image, read_placeholder(source)
+    except Exception as e:
+        logger.warning(f'Could not read property image {image.pk}: {str(e)}')
+        return image, None
+
+
+class Command(BaseCommand):
+    help = 'Computes the placeholder and dimensions of property images that have none'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of images updated per transaction',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of images decoded in parallel',
+        )
+
+    def handle(self, *args, **options):
+        last_id = 0
+        updated = 0
+        skipped = 0
+
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as pool:
+            while True:
+                images = list(
+                    PropertyImage.objects.filter(pk__gt=last_id, placeholder='')
+                    .order_by('pk')
+                    .only('pk', 'property_id', 'image', 'width', 'height')[:options['batch_size']]
+                )
+                if not images:
+                    break
+
+                done = []
+                for image, result in pool.map(read_image, images):
+                    if result is None:
+                        skipped += 1
+                        continue
+                    image.width, image.height, image.placeholder = result
+                    done.append(image)
+
+                # bulk_update sends no signals: refresh the listing summaries
+                # of the batch's properties in one go instead
+                property_ids = {image.property_id for image in done}
+                with transaction.atomic():
+                    PropertyImage.objects.bulk_update(done, ['width', 'height', 'placeholder'])
+                    Property.objects.filter(pk__in=property_ids).refresh_listing_summaries()
+                for property_id in property_ids:
+                    bump_generation(property_namespace(property_id))
+
+                updated += len(done)
+                last_id = images[-1].pk
+                self.stdout.write(f'Updated {updated} images (last id {last_id})')
+
+        if updated:
+            bump_generation(PROPERTIES)
+        logger.info(f'Backfilled placeholders for {updated} property images, {skipped} unreadable')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully backfilled placeholders for {updated} property images ({skipped} unreadable)')
+        )
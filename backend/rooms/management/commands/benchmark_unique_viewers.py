@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import CharField, Count
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+from rooms.analytics import recount_days
+from rooms.hyperloglog import HyperLogLog
+from rooms.models import Property, PropertyView, PropertyViewDaily
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+import logging
+import random
+import statistics
+import time
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds synthetic property views and compares unique viewer counts from merged '
+        'HyperLogLog sketches against exact COUNT(DISTINCT) queries. All seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--properties', type=int, default=50, help='Number of seeded properties')
+        parser.add_argument('--days', type=int, default=30, help='Length of the seeded date range')
+        parser.add_argument('--views', type=int, default=200000, help='Number of seeded view rows')
+        parser.add_argument('--viewers', type=int, default=50000, help='Size of the viewer pool')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic data')
+
+    def handle(self, *args, **options):
+        if min(options['properties'], options['days'], options['views'], options['viewers']) < 1:
+            raise CommandError('--properties, --days, --views and --viewers must be positive')
+
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Successfully ran unique viewer benchmark (seeded rows rolled back)'))
+
+    def run(self, properties, days, views, viewers, seed, **options):
+        rng = random.Random(seed)
+        landlord = User.objects.create_user(email=f'benchmark-{seed}@example.invalid', password=None)
+        property_ids = [
+            obj.id for obj in Property.objects.bulk_create([
+                Property(
+                    landlord=landlord,
+                    title=f'Benchmark property {n}',
+                    location='Benchmark',
+                    address=f'{n} Benchmark Street',
+                    price=Decimal('1000.00'),
+                    area_sqft=800,
+                    description='Seeded by benchmark_unique_viewers',
+                )
+                for n in range(properties)
+            ])
+        ]
+
+        # Popular properties and regular viewers get most of the traffic
+        end = timezone.now()
+        rows = [
+            PropertyView(
+                property_id=property_ids[min(int(rng.paretovariate(1.2)) - 1, properties - 1)],
+                ip_address=f'10.{viewer >> 16 & 255}.{viewer >> 8 & 255}.{viewer & 255}',
+                viewed_at=end - timedelta(seconds=rng.uniform(0, days * 86400)),
+            )
+            for viewer in (int(rng.betavariate(1, 3) * viewers) for _ in range(views))
+        ]
+        started = time.perf_counter()
+        PropertyView.objects.bulk_create(rows, batch_size=5000)
+        self.stdout.write(f'Seeded {views} views of {properties} properties over {days} days '
+                          f'in {time.perf_counter() - started:.1f}s')
+
+        started = time.perf_counter()
+        recount_days({(row.property_id, timezone.localdate(row.viewed_at)) for row in rows})
+        sketch_bytes = sum(
+            len(sketch) for sketch in
+            PropertyViewDaily.objects.filter(property_id__in=property_ids).values_list('viewer_sketch', flat=True)
+        )
+        rollups = PropertyViewDaily.objects.filter(property_id__in=property_ids).count()
+        self.stdout.write(f'Rolled up {rollups} (property, day) rows in {time.perf_counter() - started:.1f}s, '
+                          f'{sketch_bytes / rollups:.0f} sketch bytes per row')
+
+        viewer = Coalesce(Cast('viewer_id', CharField()), Cast('ip_address', CharField()))
+        started = time.perf_counter()
+        raw = PropertyView.objects.filter(property_id__in=property_ids)
+        exact = dict(
+            raw.values('property_id').annotate(unique=Count(viewer, distinct=True)).values_list('property_id', 'unique')
+        )
+        exact_total = raw.aggregate(unique=Count(viewer, distinct=True))['unique']
+        exact_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        merged = defaultdict(HyperLogLog)
+        total = HyperLogLog()
+        for property_id, sketch in (
+            PropertyViewDaily.objects.filter(property_id__in=property_ids).values_list('property_id', 'viewer_sketch')
+        ):
+            merged[property_id].merge_bytes(sketch)
+            total.merge_bytes(sketch)
+        estimates = {property_id: sketch.count() for property_id, sketch in merged.items()}
+        estimate_total = total.count()
+        sketch_time = time.perf_counter() - started
+
+        errors = [abs(estimates[pk] - count) / count for pk, count in exact.items()]
+        self.stdout.write(f'Exact COUNT(DISTINCT):  {exact_time * 1000:8.1f} ms, {exact_total} unique viewers')
+        self.stdout.write(f'Merged sketches:        {sketch_time * 1000:8.1f} ms, {estimate_total} unique viewers '
+                          f'({abs(estimate_total - exact_total) / exact_total:.2%} off)')
+        self.stdout.write(f'Per-property error over {len(errors)} properties: mean {statistics.mean(errors):.2%}, '
+                          f'max {max(errors):.2%}')
+        logger.info(f'Unique viewer benchmark: exact {exact_time:.3f}s, sketches {sketch_time:.3f}s')
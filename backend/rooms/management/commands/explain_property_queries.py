@@ -0,0 +1,198 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rooms.models import Property, Room
+from datetime import timedelta
+from decimal import Decimal
+import json
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Common filter/ordering combinations of GET /api/rooms/properties/, written
+# the way the listing view builds them (keyset ordering ends in ``id``).
+QUERY_MATRIX = [
+    ('default', {}, ('-created_at', '-id')),
+    ('status=available', {'status': 'available'}, ('-created_at', '-id')),
+    ('status=available&ordering=price', {'status': 'available'}, ('price', 'id')),
+    ('status=available&ordering=-price', {'status': 'available'}, ('-price', '-id')),
+    ('ordering=price', {}, ('price', 'id')),
+    ('ordering=bedrooms', {}, ('bedrooms', 'id')),
+    ('ordering=area_sqft', {}, ('area_sqft', 'id')),
+    ('property_type', {'property_type': 'apartment'}, ('-created_at', '-id')),
+    ('property_type&ordering=price', {'property_type': 'apartment'}, ('price', 'id')),
+    ('property_type&min_price&max_price',
+     {'property_type': 'apartment', 'price__gte': 500, 'price__lte': 1500}, ('price', 'id')),
+    ('min_price&max_price', {'price__gte': 500, 'price__lte': 1500}, ('price', 'id')),
+    ('bedrooms', {'bedrooms': 2}, ('-created_at', '-id')),
+    ('status&property_type&bedrooms',
+     {'status': 'available', 'property_type': 'apartment', 'bedrooms': 2}, ('-created_at', '-id')),
+    ('furnished&parking', {'furnished': True, 'parking': True}, ('-created_at', '-id')),
+    ('available=true&ordering=lowest_price',
+     {'available_rooms_count__gt': 0}, ('lowest_price', 'id')),
+    ('ordering=-rating', {}, ('-rating', '-id')),
+    ('min_rating&ordering=-rating', {'rating__gte': 4}, ('-rating', '-id')),
+]
+
+
+def find_seq_scans(plan, table):
+    """Return every Seq Scan node on ``table`` in an EXPLAIN (FORMAT JSON) plan tree."""
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') == table:
+        scans.append(plan)
+    for child in plan.get('Plans', []):
+        scans.extend(find_seq_scans(child, table))
+    return scans
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN ANALYZE over the common property listing queries and reports which ones still seq-scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=20,
+            help='LIMIT applied to each query, as one listing page would',
+        )
+        parser.add_argument(
+            '--no-analyze',
+            action='store_true',
+            help='Only show the estimated plans, without executing the queries',
+        )
+        parser.add_argument(
+            '--refresh-stats',
+            action='store_true',
+            help='Run ANALYZE on rooms_property first so the planner sees current statistics',
+        )
+        parser.add_argument(
+            '--fail-on-seq-scan',
+            action='store_true',
+            help='Exit with an error if any query plan seq-scans rooms_property',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Bulk-create this many representative properties (and their rooms) for the report; '
+                 'they are rolled back afterwards',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('explain_property_queries requires PostgreSQL')
+        if options['seed'] < 0:
+            raise CommandError('--seed must not be negative')
+
+        if not options['seed']:
+            self.report(**options)
+            return
+
+        try:
+            with transaction.atomic():
+                self.seed(options['seed'])
+                self.report(**{**options, 'refresh_stats': True})
+                raise Rollback
+        except Rollback:
+            pass
+        self.stdout.write(f"Rolled back {options['seed']} seeded properties")
+
+    def seed(self, count, batch_size=5000):
+        """Bulk-create ``count`` properties spread over the filtered values, with rooms for the room listings."""
+        rng = random.Random(count)
+        landlord = User.objects.create_user(email=f'explain-seed-{count}@example.invalid', password=None)
+        property_types = [value for value, _ in Property.PROPERTY_TYPES]
+        room_types = [value for value, _ in Room.ROOM_TYPES]
+        now = timezone.now()
+
+        properties = []
+        for n in range(count):
+            rated = rng.random() < 0.4
+            properties.append(Property(
+                landlord=landlord,
+                title=f'Seeded property {n}',
+                property_type=rng.choice(property_types),
+                rental_type=rng.choices(['full_property', 'rooms_only', 'both'], weights=[6, 3, 1])[0],
+                location=f'Seed City {n % 50}',
+                address=f'{n} Seed Street',
+                price=Decimal(rng.randrange(20000, 500000)) / 100,
+                bedrooms=rng.randint(1, 5),
+                bathrooms=rng.randint(1, 3),
+                area_sqft=rng.randrange(200, 3000),
+                description='Seeded by explain_property_queries',
+                status=rng.choices(['available', 'rented', 'maintenance'], weights=[7, 2, 1])[0],
+                furnished=rng.random() < 0.4,
+                parking=rng.random() < 0.5,
+                pets_allowed=rng.random() < 0.3,
+                review_count=rng.randint(1, 30) if rated else 0,
+                average_rating=Decimal(rng.randrange(100, 501)) / 100 if rated else None,
+            ))
+        properties = Property.objects.bulk_create(properties, batch_size=batch_size)
+        # created_at is auto_now_add, so spread it out afterwards for the default ordering
+        for obj in properties:
+            obj.created_at = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+        Property.objects.bulk_update(properties, ['created_at'], batch_size=batch_size)
+
+        rooms = [
+            Room(
+                property=obj,
+                room_type=rng.choice(room_types),
+                room_number=str(number + 1),
+                price=Decimal(rng.randrange(5000, 100000)) / 100,
+                area_sqft=rng.randrange(80, 400),
+                status=rng.choices(['available', 'occupied', 'maintenance'], weights=[5, 4, 1])[0],
+            )
+            for obj in properties if obj.rental_type != 'full_property'
+            for number in range(rng.randint(1, 6))
+        ]
+        Room.objects.bulk_create(rooms, batch_size=batch_size)
+        Property.objects.filter(landlord=landlord).refresh_listing_summaries()
+        self.stdout.write(f'Seeded {count} properties with {len(rooms)} rooms')
+
+    def report(self, **options):
+        table = Property._meta.db_table
+        if options['refresh_stats']:
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+
+        total = Property.objects.count()
+        self.stdout.write(f'{table}: {total} rows')
+        if total < 10000:
+            self.stdout.write(self.style.WARNING(
+                'Small tables are cheaper to seq-scan; pass --seed for a representative report'
+            ))
+
+        seq_scanned = []
+        for label, filters, ordering in QUERY_MATRIX:
+            queryset = (
+                Property.objects.for_listing(AnonymousUser())
+                .filter(**filters)
+                .order_by(*ordering)[:options['page_size']]
+            )
+            plan = json.loads(queryset.explain(format='json', analyze=not options['no_analyze']))[0]
+            scans = find_seq_scans(plan['Plan'], table)
+
+            timing = f"{plan['Execution Time']:.2f} ms" if 'Execution Time' in plan else 'not executed'
+            if scans:
+                seq_scanned.append(label)
+                self.stdout.write(self.style.ERROR(f'SEQ SCAN  {label} ({timing})'))
+            else:
+                self.stdout.write(f'index     {label} ({timing})')
+
+        logger.info(f'Explained {len(QUERY_MATRIX)} property queries, {len(seq_scanned)} seq-scanned')
+        if seq_scanned and options['fail_on_seq_scan']:
+            raise CommandError(f"{len(seq_scanned)} queries seq-scan {table}: {', '.join(seq_scanned)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Explained {len(QUERY_MATRIX)} queries, {len(seq_scanned)} still seq-scan {table}'
+            )
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from rooms.view_tracking import flush_views, get_buffer
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Writes buffered property detail views to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of buffered views written per transaction',
+        )
+
+    def handle(self, *args, **options):
+        if not get_buffer().shared:
+            self.stdout.write(self.style.WARNING(
+                'The view buffer is process-local without a Redis cache; '
+                'each web worker flushes its own buffer'
+            ))
+
+        written = flush_views(batch_size=options['batch_size'])
+
+        logger.info(f'Flushed {written} buffered property views')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully flushed {written} property views')
+        )
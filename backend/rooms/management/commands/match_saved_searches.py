@@ -0,0 +1,49 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rooms.models import Property
+from rooms.saved_searches import match_listings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Matches recently created or updated available listings against saved searches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Match listings changed within this many hours',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of listings matched per batch',
+        )
+
+    def handle(self, *args, **options):
+        # Catch-up for writes that bypass model signals (bulk imports, raw
+        # SQL). Already delivered matches are skipped, so reruns are safe.
+        since = timezone.now() - timedelta(hours=options['hours'])
+        listings = Property.objects.filter(status='available', updated_at__gte=since)
+        last_id = 0
+        matched = 0
+
+        while True:
+            ids = list(
+                listings.filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            matched += match_listings(ids)
+            last_id = ids[-1]
+
+        logger.info(f'Matched saved searches for listings since {since}: {matched} new matches')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully matched saved searches: {matched} new matches')
+        )
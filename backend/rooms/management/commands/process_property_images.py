@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rooms.images import process_image, process_in_worker
+from rooms.models import PropertyImage
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Renders the size variants of property images still pending (or failed, with --retry-failed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Also reprocess images whose previous processing failed',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max(settings.PROPERTY_IMAGE_WORKERS, 1),
+            help='Number of images processed in parallel (1 processes them in this thread)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Process at most this many images',
+        )
+
+    def handle(self, *args, **options):
+        statuses = [PropertyImage.PENDING]
+        if options['retry_failed']:
+            statuses.append(PropertyImage.FAILED)
+        image_ids = list(
+            PropertyImage.objects.filter(processing_status__in=statuses)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:options['limit']]
+        )
+
+        if options['workers'] > 1:
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                processed = sum(1 for ok in pool.map(process_in_worker, image_ids) if ok)
+        else:
+            processed = sum(1 for image_id in image_ids if process_image(image_id))
+
+        logger.info(f'Processed {processed} of {len(image_ids)} property images')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully processed {processed} of {len(image_ids)} property images')
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rooms.cache import LOCATIONS, bump_generation
+from rooms.models import Location
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuilds the location autocomplete dictionary from property locations'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = Location.objects.refresh()
+        bump_generation(LOCATIONS)
+
+        logger.info(f'Rebuilt location dictionary with {count} entries')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt location dictionary with {count} entries')
+        )
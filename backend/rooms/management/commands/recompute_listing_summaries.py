@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rooms.models import Property
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuilds the denormalized listing summary columns on Property in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of properties to update per transaction',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        updated = 0
+
+        # Walk the primary key so each batch is an index range scan and
+        # locks are held only for one short transaction at a time
+        while True:
+            ids = list(
+                Property.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                updated += Property.objects.filter(pk__in=ids).refresh_listing_summaries()
+
+            last_id = ids[-1]
+            self.stdout.write(f'Updated {updated} properties (last id {last_id})')
+
+        logger.info(f'Recomputed listing summaries for {updated} properties')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully recomputed listing summaries for {updated} properties')
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import UserProfile
+from rooms.models import Property
+from rooms.ratings import refresh_landlord_ratings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuilds the running rating aggregates of properties and landlord profiles from their reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows updated per transaction',
+        )
+
+    def handle(self, *args, **options):
+        properties = self.refresh_in_batches(
+            Property.objects.all(), lambda rows: rows.refresh_ratings(), options['batch_size']
+        )
+        landlords = self.refresh_in_batches(
+            UserProfile.objects.filter(user_type='landlord'), refresh_landlord_ratings, options['batch_size']
+        )
+
+        logger.info(f'Recomputed ratings for {properties} properties and {landlords} landlords')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully recomputed ratings for {properties} properties and {landlords} landlords')
+        )
+
+    def refresh_in_batches(self, queryset, refresh, batch_size):
+        # Walk the primary key so each batch is a short transaction
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return updated
+
+            with transaction.atomic():
+                updated += refresh(queryset.model.objects.filter(pk__in=ids))
+
+            last_id = ids[-1]
+            self.stdout.write(f'Updated {updated} {queryset.model._meta.verbose_name_plural} (last id {last_id})')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from rooms.analytics import rollup_property_views
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Folds new PropertyView rows into the PropertyViewDaily rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Number of raw view rows processed per transaction',
+        )
+
+    def handle(self, *args, **options):
+        processed = rollup_property_views(batch_size=options['batch_size'])
+
+        logger.info(f'Rolled up {processed} property views')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rolled up {processed} property views')
+        )
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Keep Property.search_vector in sync on every INSERT/UPDATE, including
+# queryset.update() and raw SQL, which bypass model save() and signals.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION rooms_property_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.address, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER rooms_property_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, location, address, description
+    ON rooms_property
+    FOR EACH ROW EXECUTE FUNCTION rooms_property_search_vector_update();
+
+-- Backfill existing rows through the trigger
+UPDATE rooms_property SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS rooms_property_search_vector_trigger ON rooms_property;
+DROP FUNCTION IF EXISTS rooms_property_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0002_property_rental_type_alter_property_area_sqft_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="rooms_property_search_gin"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0003_property_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="favorite",
+            index=models.Index(
+                fields=["tenant", "-created_at", "-id"],
+                name="rooms_fav_tenant_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="landlordreview",
+            index=models.Index(
+                fields=["landlord", "-created_at", "-id"],
+                name="rooms_lrevw_land_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="rooms_prop_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="propertyreview",
+            index=models.Index(
+                fields=["property", "-created_at", "-id"],
+                name="rooms_prevw_prop_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="propertyview",
+            index=models.Index(
+                fields=["property", "-viewed_at", "-id"],
+                name="rooms_pview_prop_viewed_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_SUMMARIES = """
+UPDATE rooms_property p SET
+    available_rooms_count = CASE
+        WHEN p.rental_type = 'full_property' THEN (p.status = 'available')::int
+        ELSE (SELECT COUNT(*) FROM rooms_room r WHERE r.property_id = p.id AND r.status = 'available')
+    END,
+    min_room_price = CASE
+        WHEN p.rental_type = 'full_property' THEN p.price
+        ELSE (SELECT MIN(r.price) FROM rooms_room r WHERE r.property_id = p.id AND r.status = 'available')
+    END,
+    primary_image_name = COALESCE((
+        SELECT i.image FROM rooms_propertyimage i
+        WHERE i.property_id = p.id AND i.is_primary
+        ORDER BY i.uploaded_at LIMIT 1
+    ), ''),
+    review_count = (SELECT COUNT(*) FROM rooms_propertyreview v WHERE v.property_id = p.id),
+    average_rating = (SELECT AVG(v.rating) FROM rooms_propertyreview v WHERE v.property_id = p.id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0005_property_location"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="available_rooms_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="average_rating",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=3, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="min_room_price",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=10, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="primary_image_name",
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["min_room_price", "id"], name="rooms_prop_min_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["-average_rating", "-id"], name="rooms_prop_rating_idx"
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SUMMARIES, migrations.RunSQL.noop),
+    ]
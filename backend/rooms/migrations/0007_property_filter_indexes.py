@@ -0,0 +1,64 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:13
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes this way keeps rooms_property writable during the deploy.
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0006_property_listing_summaries"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(fields=["price", "id"], name="rooms_prop_price_id_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                fields=["bedrooms", "id"], name="rooms_prop_bedrooms_id_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                fields=["area_sqft", "id"], name="rooms_prop_area_id_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                fields=["property_type", "price", "id"],
+                name="rooms_prop_type_price_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                fields=["property_type", "-created_at", "-id"],
+                name="rooms_prop_type_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="rooms_prop_status_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                condition=models.Q(("status", "available")),
+                fields=["price", "id"],
+                name="rooms_prop_avail_price_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:17
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_LOCATIONS = r"""
+INSERT INTO rooms_location (name, normalized, listing_count, updated_at)
+SELECT MODE() WITHIN GROUP (ORDER BY BTRIM(location)), normalized, COUNT(*), NOW()
+FROM (
+    SELECT location, BTRIM(REGEXP_REPLACE(LOWER(location), '\s+', ' ', 'g'), ' ,.') AS normalized
+    FROM rooms_property
+) p
+WHERE normalized <> ''
+GROUP BY normalized;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0007_property_filter_indexes"),
+        # gin_trgm_ops comes from the pg_trgm extension
+        ("accounts", "0006_enable_pg_trgm"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Location",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=300)),
+                ("normalized", models.CharField(max_length=300, unique=True)),
+                ("listing_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-listing_count", "name"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                models.Func(
+                    models.Func(
+                        django.db.models.functions.text.Lower("location"),
+                        models.Value("\\s+"),
+                        models.Value(" "),
+                        models.Value("g"),
+                        function="REGEXP_REPLACE",
+                        output_field=models.CharField(),
+                    ),
+                    models.Value(" ,."),
+                    function="BTRIM",
+                    output_field=models.CharField(),
+                ),
+                name="rooms_prop_location_norm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["normalized"],
+                name="rooms_location_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["normalized"],
+                name="rooms_location_trgm_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_LOCATIONS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,132 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0008_location_dictionary"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SavedSearch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(blank=True, max_length=100)),
+                ("params", models.JSONField(default=dict)),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Inactive searches are not matched or notified",
+                    ),
+                ),
+                (
+                    "property_type",
+                    models.CharField(blank=True, editable=False, max_length=20),
+                ),
+                (
+                    "location",
+                    models.CharField(blank=True, editable=False, max_length=300),
+                ),
+                (
+                    "min_price",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        editable=False,
+                        max_digits=10,
+                        null=True,
+                    ),
+                ),
+                (
+                    "max_price",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        editable=False,
+                        max_digits=10,
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="saved_searches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SavedSearchMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("matched_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="saved_search_matches",
+                        to="rooms.property",
+                    ),
+                ),
+                (
+                    "saved_search",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matches",
+                        to="rooms.savedsearch",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-matched_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="savedsearch",
+            index=models.Index(
+                fields=["tenant", "-created_at", "-id"], name="rooms_ssearch_tenant_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savedsearch",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["property_type"],
+                name="rooms_ssearch_type_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="savedsearchmatch",
+            unique_together={("saved_search", "property")},
+        ),
+    ]
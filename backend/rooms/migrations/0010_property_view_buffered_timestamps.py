@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0009_saved_searches"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="propertyview",
+            name="viewed_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:34
+
+from django.db import migrations, models
+
+# Rewind the rollup watermark so the next rollup_property_views run recounts
+# every day and fills in the sketches of existing rows
+RESET_VIEW_ROLLUP = "DELETE FROM rooms_analyticswatermark WHERE name = 'property_view_daily'"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0011_property_view_daily_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyviewdaily",
+            name="authenticated_sketch",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.AddField(
+            model_name="propertyviewdaily",
+            name="viewer_sketch",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.RunSQL(RESET_VIEW_ROLLUP, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:36
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so view tracking keeps writing during the deploy
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0012_property_view_daily_sketches"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="propertyview",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["viewed_at"], name="rooms_pview_viewed_brin"
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+RATING_COLUMNS = """
+    review_count = s.review_count,
+    rating_sum = s.rating_sum,
+    average_rating = s.average_rating,
+    ratings_1 = s.ratings_1,
+    ratings_2 = s.ratings_2,
+    ratings_3 = s.ratings_3,
+    ratings_4 = s.ratings_4,
+    ratings_5 = s.ratings_5
+"""
+
+RATING_AGGREGATES = """
+    COUNT(*) AS review_count,
+    SUM(rating) AS rating_sum,
+    AVG(rating) AS average_rating,
+    COUNT(*) FILTER (WHERE rating = 1) AS ratings_1,
+    COUNT(*) FILTER (WHERE rating = 2) AS ratings_2,
+    COUNT(*) FILTER (WHERE rating = 3) AS ratings_3,
+    COUNT(*) FILTER (WHERE rating = 4) AS ratings_4,
+    COUNT(*) FILTER (WHERE rating = 5) AS ratings_5
+"""
+
+BACKFILL_PROPERTY_RATINGS = f"""
+UPDATE rooms_property p SET {RATING_COLUMNS}
+FROM (SELECT property_id, {RATING_AGGREGATES} FROM rooms_propertyreview GROUP BY property_id) s
+WHERE p.id = s.property_id;
+"""
+
+BACKFILL_LANDLORD_RATINGS = f"""
+UPDATE accounts_userprofile p SET {RATING_COLUMNS}
+FROM (SELECT landlord_id, {RATING_AGGREGATES} FROM rooms_landlordreview GROUP BY landlord_id) s
+WHERE p.user_id = s.landlord_id;
+"""
+
+
+class Migration(migrations.Migration):
+    # The rating index is built concurrently in 0020, outside a transaction
+    dependencies = [
+        ("accounts", "0008_userprofile_rating_aggregates"),
+        ("rooms", "0013_property_view_viewed_at_brin"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="ratings_1",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="ratings_2",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="ratings_3",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="ratings_4",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="ratings_5",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_PROPERTY_RATINGS, migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL_LANDLORD_RATINGS, migrations.RunSQL.noop),
+    ]
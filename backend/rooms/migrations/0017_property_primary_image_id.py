@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:08
+
+from django.db import migrations, models
+
+BACKFILL_PRIMARY_IMAGE_ID = """
+UPDATE rooms_property p SET primary_image_id = i.id
+FROM (
+    SELECT DISTINCT ON (property_id) property_id, id FROM rooms_propertyimage
+    WHERE is_primary ORDER BY property_id, uploaded_at
+) i
+WHERE p.id = i.property_id;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0016_image_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="primary_image_id",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(BACKFILL_PRIMARY_IMAGE_ID, migrations.RunSQL.noop),
+    ]
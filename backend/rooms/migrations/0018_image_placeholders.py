@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0017_property_primary_image_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="primary_image_preview",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 05:39
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0018_image_placeholders"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="property",
+            name="rooms_prop_min_price_idx",
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                django.db.models.functions.comparison.Coalesce(
+                    "min_room_price",
+                    "price",
+                    output_field=models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                models.F("id"),
+                name="rooms_prop_lowest_price_idx",
+            ),
+        ),
+    ]
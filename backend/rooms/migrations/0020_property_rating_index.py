@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:40
+
+import django.db.models.functions.comparison
+from decimal import Decimal
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so listings keep being written during the deploy
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0019_property_lowest_price_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="property",
+            index=models.Index(
+                django.db.models.functions.comparison.Coalesce(
+                    "average_rating",
+                    models.Value(Decimal("0")),
+                    output_field=models.DecimalField(decimal_places=2, max_digits=3),
+                ),
+                models.F("id"),
+                name="rooms_prop_rating_id_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,86 @@
+from decimal import Decimal
 from django.db import models
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField, TrigramWordSimilarity
+from django.db.models import Case, Count, Exists, F, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, JSONObject, Trim
 from django.conf import settings
-from django.core.validators import MinValueValidator
+from django.utils import timezone
+from django.core.validators import MaxValueValidator, MinValueValidator
 from accounts.models import UserProfile
+from . import geo
+from .locations import Mode, normalize_location, normalized_location
+from .ratings import refresh_property_ratings, without_rating_fields
+
+
+def rating_sort_key():
+    """Average rating with unrated listings last (as 0), for index-backed sorting and filtering"""
+    return Coalesce('average_rating', Value(Decimal('0')), output_field=models.DecimalField(max_digits=3, decimal_places=2))
+
+
+def lowest_price_sort_key():
+    """Cheapest available room, else the base price, for index-backed sorting (?ordering=lowest_price)"""
+    return Coalesce('min_room_price', 'price', output_field=models.DecimalField(max_digits=10, decimal_places=2))
+
+
+class PropertyQuerySet(models.QuerySet):
+    def for_listing(self, user=None):
+        """
+        Everything PropertyListSerializer needs so a page of listings is
+        served in a constant number of queries. Room/image/review summaries
+        are stored columns (see refresh_listing_summaries).
+        """
+        if user is not None and user.is_authenticated:
+            is_favorited = Exists(Favorite.objects.filter(property=OuterRef('pk'), tenant=user))
+        else:
+            is_favorited = Value(False, output_field=models.BooleanField())
+        return self.select_related('landlord').annotate(
+            is_favorited=is_favorited, rating=rating_sort_key(), lowest_price=lowest_price_sort_key()
+        )
+
+    def refresh_listing_summaries(self):
+        """
+        Recompute the denormalized listing summary columns from Room and
+        PropertyImage in a single UPDATE statement. Rating aggregates are
+        kept separately (see refresh_ratings).
+        """
+        available_rooms = Room.objects.filter(property=OuterRef('pk'), status='available')
+        room_count = available_rooms.values('property').annotate(c=Count('pk')).values('c')
+        room_min_price = available_rooms.values('property').annotate(m=Min('price')).values('m')
+        primary_image = PropertyImage.objects.filter(
+            property=OuterRef('pk'), is_primary=True
+        ).order_by('uploaded_at')
+
+        return self.update(
+            available_rooms_count=Case(
+                When(rental_type='full_property', status='available', then=Value(1)),
+                When(rental_type='full_property', then=Value(0)),
+                default=Coalesce(Subquery(room_count), Value(0)),
+            ),
+            min_room_price=Case(
+                When(rental_type='full_property', then=F('price')),
+                default=Subquery(room_min_price),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2),
+            ),
+            primary_image_id=Subquery(primary_image.values('pk')[:1]),
+            primary_image_name=Coalesce(Subquery(primary_image.values('image')[:1]), Value('')),
+            primary_image_variants=Coalesce(
+                Subquery(primary_image.values('variants')[:1]), Value({}, output_field=models.JSONField()),
+                output_field=models.JSONField(),
+            ),
+            primary_image_preview=Coalesce(
+                Subquery(primary_image.values(
+                    preview=JSONObject(placeholder='placeholder', width='width', height='height')
+                )[:1]),
+                Value({}, output_field=models.JSONField()),
+                output_field=models.JSONField(),
+            ),
+        )
+    
+    def refresh_ratings(self):
+        """Rebuild the rating aggregates from PropertyReview in one UPDATE (rooms.ratings)."""
+        return refresh_property_ratings(self)
+
 
 class Property(models.Model):
     PROPERTY_TYPES = [
@@ -31,6 +110,12 @@ class Property(models.Model):
                                  help_text="Specify if the property is rented as a whole or by rooms")
     location = models.CharField(max_length=300)
     address = models.TextField()
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True,
+                                   validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True,
+                                    validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    # Derived from latitude/longitude on save; prefix-indexed for radius lookups
+    geohash = models.CharField(max_length=12, blank=True, editable=False)
     price = models.DecimalField(max_digits=10, decimal_places=2, 
                               help_text="Base price for full property rental")
     bedrooms = models.PositiveIntegerField(default=1)
@@ -51,17 +136,76 @@ class Property(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Listing summaries denormalized from rooms, images and reviews so list
+    # pages can filter and sort on plain indexed columns. Maintained by
+    # rooms.signals; rebuild with `manage.py recompute_listing_summaries`.
+    available_rooms_count = models.PositiveIntegerField(default=0, editable=False)
+    min_room_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    primary_image_id = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    primary_image_name = models.CharField(max_length=255, blank=True, editable=False)
+    primary_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # {placeholder, width, height} of the primary image
+    primary_image_preview = models.JSONField(default=dict, blank=True, editable=False)
+    # Rating aggregates, adjusted with F() on every review write (rooms.ratings)
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    ratings_1 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_2 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_3 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_4 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_5 = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Weighted full-text document (title > location/address > description),
+    # maintained by a database trigger so bulk updates keep it current too.
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    objects = PropertyQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='rooms_property_search_gin'),
+            models.Index(fields=['-created_at', '-id'], name='rooms_prop_created_id_idx'),
+            models.Index(fields=['geohash'], name='rooms_prop_geohash_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['latitude', 'longitude'], name='rooms_prop_lat_lng_idx'),
+            models.Index(fields=['-average_rating', '-id'], name='rooms_prop_rating_idx'),
+            # Filter/order matrix of the listing endpoint. Every composite ends
+            # in the keyset tie-breaker so cursor pages are index range scans.
+            # Amenity booleans are left unindexed: too unselective to help.
+            models.Index(fields=['price', 'id'], name='rooms_prop_price_id_idx'),
+            models.Index(fields=['bedrooms', 'id'], name='rooms_prop_bedrooms_id_idx'),
+            models.Index(fields=['area_sqft', 'id'], name='rooms_prop_area_id_idx'),
+            models.Index(fields=['property_type', 'price', 'id'], name='rooms_prop_type_price_idx'),
+            models.Index(fields=['property_type', '-created_at', '-id'], name='rooms_prop_type_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='rooms_prop_status_created_idx'),
+            # Price-sorted browsing of available listings only
+            models.Index(fields=['price', 'id'], name='rooms_prop_avail_price_idx',
+                         condition=Q(status='available')),
+            # Matches the expression Location.objects.refresh() groups by
+            models.Index(normalized_location(), name='rooms_prop_location_norm_idx'),
+            # Rating sort (?ordering=rating) and min_rating filter
+            models.Index(rating_sort_key(), F('id'), name='rooms_prop_rating_id_idx'),
+            # Lowest price sort (?ordering=lowest_price)
+            models.Index(lowest_price_sort_key(), F('id'), name='rooms_prop_lowest_price_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} - {self.location} (${self.price})"
     
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geo.encode(float(self.latitude), float(self.longitude))
+        else:
+            self.geohash = ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
+        super().save(*args, **without_rating_fields(self, kwargs))
+    
     def has_available_rooms(self):
         """Check if there are any available rooms in the property"""
-        if self.rental_type == 'full_property':
-            return self.status == 'available'
-        return self.rooms.filter(status='available').exists()
+        return self.available_rooms_count > 0
 
 class Room(models.Model):
     ROOM_TYPES = [
@@ -104,12 +248,52 @@ class Room(models.Model):
         return f"{self.get_room_type_display()} - {self.room_number} (${self.price})"
 
 
+class ImageBlob(models.Model):
+    """
+    An uploaded image file stored once under the SHA-256 of its content and
+    shared by every PropertyImage with that content. ``reference_count``
+    counts those images; the file and its variants are deleted with the last
+    of them (rooms.images.release_blob).
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    reference_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.digest
+
 class PropertyImage(models.Model):
+    PENDING = 'pending'
+    READY = 'ready'
+    FAILED = 'failed'
+    PROCESSING_STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (READY, 'Ready'),
+        (FAILED, 'Failed'),
+    ]
+    
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='property_images/')
+    # Uploads through the API share the blob's file (``image`` names it);
+    # images without one own their file
+    blob = models.ForeignKey(
+        ImageBlob, on_delete=models.PROTECT, related_name='images', null=True, blank=True, editable=False
+    )
     caption = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(default=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    # Filled in by the background pipeline (rooms.images): size of the
+    # original and {variant: {width, height, webp, jpeg}} storage names
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Tiny WebP data URI painted while the image loads (rooms.images.placeholder)
+    placeholder = models.TextField(blank=True, editable=False)
+    processing_status = models.CharField(
+        max_length=10, choices=PROCESSING_STATUS_CHOICES, default=PENDING, editable=False
+    )
     
     class Meta:
         ordering = ['-is_primary', 'uploaded_at']
@@ -136,6 +320,9 @@ class PropertyReview(models.Model):
     class Meta:
         unique_together = ['property', 'tenant']  # One review per tenant per property
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['property', '-created_at', '-id'], name='rooms_prevw_prop_created_idx'),
+        ]
         
     def __str__(self):
         return f"{self.tenant.username} - {self.property.title} ({self.rating} stars)"
@@ -159,6 +346,9 @@ class LandlordReview(models.Model):
     class Meta:
         unique_together = ['landlord', 'tenant']  # One review per tenant per landlord
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['landlord', '-created_at', '-id'], name='rooms_lrevw_land_created_idx'),
+        ]
         
     def __str__(self):
         return f"{self.tenant.username} reviewed {self.landlord.username} ({self.rating} stars)"
@@ -171,6 +361,9 @@ class Favorite(models.Model):
     class Meta:
         unique_together = ['tenant', 'property']  # One favorite per tenant per property
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', '-created_at', '-id'], name='rooms_fav_tenant_created_idx'),
+        ]
         
     def __str__(self):
         return f"{self.tenant.username} favorited {self.property.title}"
@@ -182,11 +375,223 @@ class PropertyView(models.Model):
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='views')
     viewer = models.ForeignKey(settings.AUTH_USER_MODEL  , on_delete=models.CASCADE, null=True, blank=True)
     ip_address = models.GenericIPAddressField()
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    # Set explicitly when buffered views are written in bulk (rooms.view_tracking)
+    viewed_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-viewed_at']
+        indexes = [
+            models.Index(fields=['property', '-viewed_at', '-id'], name='rooms_pview_prop_viewed_idx'),
+            # Rows arrive in viewed_at order, so a BRIN index covers the
+            # retention range scans (rooms.retention) in a few pages
+            BrinIndex(fields=['viewed_at'], name='rooms_pview_viewed_brin'),
+        ]
         
     def __str__(self):
         viewer_name = self.viewer.username if self.viewer else "Anonymous"
         return f"{viewer_name} viewed {self.property.title}"
+
+
+class LocationQuerySet(models.QuerySet):
+    def refresh(self, names=None):
+        """
+        Recount listings per normalized location from Property and upsert the
+        dictionary. With ``names`` only those entries are refreshed, otherwise
+        the whole dictionary is rebuilt. Entries left without listings are
+        removed.
+        """
+        properties = Property.objects.annotate(normalized=normalized_location())
+        if names is not None:
+            names = {name for name in names if name}
+            if not names:
+                return 0
+            properties = properties.filter(normalized__in=names)
+        
+        rows = (
+            properties.exclude(normalized='')
+            .values('normalized')
+            .annotate(name=Mode(Trim('location')), listing_count=Count('id'))
+            .order_by()
+        )
+        entries = [Location(**row) for row in rows]
+        Location.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['normalized'],
+            update_fields=['name', 'listing_count', 'updated_at'],
+            batch_size=1000,
+        )
+        
+        stale = self.exclude(normalized__in=properties.values('normalized'))
+        if names is not None:
+            stale = stale.filter(normalized__in=names)
+        stale.delete()
+        return len(entries)
+    
+    def suggest(self, term, limit=8):
+        """
+        Top ``limit`` locations for a typed prefix, busiest first. Falls back
+        to trigram word similarity to fill the list when the prefix alone
+        returns too few, so typos and mid-name matches still show up.
+        """
+        term = normalize_location(term)
+        if not term:
+            return []
+        
+        fields = ('name', 'normalized', 'listing_count')
+        results = list(
+            self.filter(normalized__startswith=term)
+            .order_by('-listing_count', 'name')
+            .values(*fields)[:limit]
+        )
+        if len(results) < limit and len(term) >= Location.FUZZY_MIN_LENGTH:
+            results += list(
+                self.filter(normalized__trigram_word_similar=term)
+                .exclude(normalized__in=[row['normalized'] for row in results])
+                .annotate(similarity=TrigramWordSimilarity(term, 'normalized'))
+                .order_by('-similarity', '-listing_count')
+                .values(*fields)[:limit - len(results)]
+            )
+        return results
+
+
+class Location(models.Model):
+    """
+    Dictionary of distinct normalized property locations with listing counts,
+    used for search box autocomplete. Maintained by rooms.signals; rebuild
+    with `manage.py rebuild_locations`.
+    """
+    FUZZY_MIN_LENGTH = 3
+    
+    name = models.CharField(max_length=300)
+    normalized = models.CharField(max_length=300, unique=True)
+    listing_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = LocationQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['-listing_count', 'name']
+        indexes = [
+            models.Index(fields=['normalized'], name='rooms_location_prefix_idx', opclasses=['varchar_pattern_ops']),
+            GinIndex(fields=['normalized'], name='rooms_location_trgm_gin', opclasses=['gin_trgm_ops']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.listing_count})"
+
+
+class PropertyViewDaily(models.Model):
+    """
+    Per property, per day rollup of PropertyView rows, maintained by
+    `manage.py rollup_property_views`
+    """
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='daily_views')
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    # Distinct signed-in users, or IP addresses for anonymous views
+    unique_viewers = models.PositiveIntegerField(default=0)
+    authenticated_viewers = models.PositiveIntegerField(default=0)
+    # Serialized HyperLogLog sketches of the day's viewers, merged to
+    # estimate unique viewers over longer ranges (rooms.hyperloglog)
+    viewer_sketch = models.BinaryField(default=b'', editable=False)
+    authenticated_sketch = models.BinaryField(default=b'', editable=False)
+    
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'day'], name='rooms_pviewdaily_prop_day_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.property_id} on {self.day}: {self.views} views"
+
+
+class AnalyticsWatermark(models.Model):
+    """Last source row id processed by an incremental analytics job"""
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
+
+
+class SavedSearch(models.Model):
+    """
+    A tenant's stored listing filter. ``params`` holds the normalized query
+    parameters (see rooms.saved_searches.normalize_search_params); the
+    property type, location and price bounds are copied into columns so the
+    matcher can narrow candidate searches in SQL.
+    """
+    tenant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=100, blank=True)
+    params = models.JSONField(default=dict)
+    is_active = models.BooleanField(default=True, help_text="Inactive searches are not matched or notified")
+    
+    property_type = models.CharField(max_length=20, blank=True, editable=False)
+    location = models.CharField(max_length=300, blank=True, editable=False)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', '-created_at', '-id'], name='rooms_ssearch_tenant_idx'),
+            models.Index(fields=['property_type'], name='rooms_ssearch_type_idx',
+                         condition=Q(is_active=True)),
+        ]
+    
+    def __str__(self):
+        return f"{self.tenant.username}: {self.name or self.params}"
+    
+    def save(self, *args, **kwargs):
+        params = self.params or {}
+        self.property_type = params.get('property_type', '')
+        self.location = params.get('location', '')
+        self.min_price = Decimal(params['min_price']) if 'min_price' in params else None
+        self.max_price = Decimal(params['max_price']) if 'max_price' in params else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'params' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'property_type', 'location', 'min_price', 'max_price'}
+        super().save(*args, **kwargs)
+    
+    def matches_property(self, property_obj):
+        """Same semantics as the listing filters for these parameters"""
+        params = self.params
+        for field in ('property_type', 'rental_type'):
+            if field in params and getattr(property_obj, field) != params[field]:
+                return False
+        for field in ('bedrooms', 'bathrooms'):
+            if field in params and getattr(property_obj, field) != int(params[field]):
+                return False
+        for field in ('furnished', 'parking', 'pets_allowed', 'utilities_included'):
+            if field in params and getattr(property_obj, field) != params[field]:
+                return False
+        if self.min_price is not None and property_obj.price < self.min_price:
+            return False
+        if self.max_price is not None and property_obj.price > self.max_price:
+            return False
+        if self.location and not (
+            self.location in normalize_location(property_obj.location)
+            or self.location in normalize_location(property_obj.address)
+        ):
+            return False
+        return True
+
+
+class SavedSearchMatch(models.Model):
+    """A listing already delivered for a saved search, so it is only notified once"""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='saved_search_matches')
+    matched_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['saved_search', 'property']
+        ordering = ['-matched_at']
+    
+    def __str__(self):
+        return f"{self.saved_search_id} matched {self.property.title}"
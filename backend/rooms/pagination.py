@@ -0,0 +1,20 @@
+from rest_framework.settings import api_settings
+
+from core.pagination import KeysetPagination
+
+from .filters import PropertyFullTextSearchFilter, PropertyGeoFilter
+
+
+class PropertyKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for property listings. Without an explicit ``ordering``,
+    location queries page by distance and full-text searches by relevance.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            if PropertyGeoFilter().is_active(request):
+                return ('distance_km', 'id')
+            if PropertyFullTextSearchFilter().get_search_terms(request):
+                return ('-search_rank', '-id')
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,115 @@
+"""
+Running rating aggregates for properties and landlords.
+
+Property and UserProfile carry ``review_count``, ``rating_sum``, a per-star
+histogram (``ratings_1`` .. ``ratings_5``) and ``average_rating``. Review
+writes adjust them with a single UPDATE of ``F()`` expressions, so
+concurrent reviews never lose counts and reading a rating never aggregates
+the review tables. ``manage.py recompute_ratings`` rebuilds them in bulk.
+Saving an existing row never writes them (see without_rating_fields), so
+an instance loaded before a review can't overwrite its counts.
+"""
+from django.db import models
+from django.db.models import Avg, Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+STARS = range(1, 6)
+AVERAGE_FIELD = models.DecimalField(max_digits=3, decimal_places=2)
+SUM_FIELD = models.DecimalField(max_digits=12, decimal_places=2)
+
+
+def histogram_field(star):
+    return f'ratings_{star}'
+
+
+RATING_FIELDS = {'average_rating', 'review_count', 'rating_sum', *(histogram_field(star) for star in STARS)}
+
+
+def without_rating_fields(instance, kwargs):
+    """
+    ``save()`` kwargs for ``instance`` that leave its rating aggregates out
+    of the UPDATE of an existing row; only review writes change them.
+    """
+    if instance._state.adding or kwargs.get('force_insert'):
+        return kwargs
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None:
+        # What a plain save() writes: every loaded concrete field
+        deferred = instance.get_deferred_fields()
+        update_fields = [
+            field.name for field in instance._meta.concrete_fields
+            if not field.primary_key and field.attname not in deferred
+        ]
+    kwargs['update_fields'] = [name for name in update_fields if name not in RATING_FIELDS]
+    return kwargs
+
+
+def rating_adjustments(removed=None, added=None):
+    """
+    UPDATE values for one review's rating going from ``removed`` to
+    ``added`` (either may be None, for a created or deleted review). SET
+    clauses all read the old row, so the new average is derived from the
+    same deltas.
+    """
+    count = F('review_count') + (int(added is not None) - int(removed is not None))
+    total = F('rating_sum') + ((added or 0) - (removed or 0))
+    updates = {
+        'review_count': count,
+        'rating_sum': total,
+        'average_rating': Case(
+            When(GreaterThan(count, 0), then=Cast(total, SUM_FIELD) / count),
+            default=None,
+            output_field=AVERAGE_FIELD,
+        ),
+    }
+    for star in STARS:
+        delta = int(added == star) - int(removed == star)
+        if delta:
+            updates[histogram_field(star)] = F(histogram_field(star)) + delta
+    return updates
+
+
+def adjust_ratings(queryset, removed=None, added=None):
+    if removed == added:
+        return 0
+    return queryset.update(**rating_adjustments(removed, added))
+
+
+def recomputed_ratings(reviews):
+    """
+    UPDATE values rebuilding every aggregate from ``reviews``, a review
+    queryset filtered on ``OuterRef`` and grouped by the rated object.
+    """
+    def aggregate(expression, output_field=None):
+        return Subquery(reviews.annotate(value=expression).values('value'), output_field=output_field)
+
+    updates = {
+        'review_count': Coalesce(aggregate(Count('pk')), Value(0)),
+        'rating_sum': Coalesce(aggregate(Sum('rating')), Value(0)),
+        'average_rating': aggregate(Avg('rating'), output_field=AVERAGE_FIELD),
+    }
+    for star in STARS:
+        updates[histogram_field(star)] = Coalesce(aggregate(Count('pk', filter=Q(rating=star))), Value(0))
+    return updates
+
+
+def refresh_property_ratings(properties):
+    from .models import PropertyReview
+    reviews = PropertyReview.objects.filter(property=OuterRef('pk')).order_by().values('property')
+    return properties.update(**recomputed_ratings(reviews))
+
+
+def refresh_landlord_ratings(profiles):
+    from .models import LandlordReview
+    reviews = LandlordReview.objects.filter(landlord=OuterRef('user_id')).order_by().values('landlord')
+    return profiles.update(**recomputed_ratings(reviews))
+
+
+def rating_summary(obj):
+    """Average, count and per-star histogram from an object's stored aggregates."""
+    return {
+        'average_rating': obj.average_rating,
+        'review_count': obj.review_count,
+        'histogram': {str(star): getattr(obj, histogram_field(star)) for star in STARS},
+    }
@@ -0,0 +1,108 @@
+"""
+Retention of raw PropertyView events.
+
+The database only keeps recent view events (the hot table); older ones are
+moved to compressed CSV files on disk. Events are archived in small batches,
+each committed on its own, so no long transaction or table-wide lock holds
+up view tracking while a large backlog is worked off.
+
+Each batch is appended to the archive as its own gzip member and synced to
+disk before the rows are deleted, so every deleted row is in a complete
+member even if the job dies half way. A failed delete can at worst leave a
+row both archived and in the table, to be archived again by the next run.
+``gzip.open`` (and ``zcat``) read the members back as one CSV.
+
+Only whole days that the daily rollups already cover are archived: the
+cutoff is a midnight, moved back to before the oldest view not yet rolled
+up, so analytics never have to recount a day whose raw rows are gone.
+"""
+import csv
+import gzip
+import io
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .analytics import VIEW_ROLLUP
+from .models import AnalyticsWatermark, PropertyView
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = ['id', 'property_id', 'viewer_id', 'ip_address', 'viewed_at']
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def retention_cutoff(days):
+    """
+    Views before this instant are archived: the start of the local day
+    ``days`` days ago, or of the oldest day with views not yet rolled up.
+    """
+    cutoff = day_start(timezone.localdate() - timedelta(days=days))
+    watermark = AnalyticsWatermark.objects.filter(name=VIEW_ROLLUP).values_list('last_id', flat=True).first() or 0
+    oldest_pending = PropertyView.objects.filter(pk__gt=watermark).aggregate(oldest=Min('viewed_at'))['oldest']
+    if oldest_pending is not None:
+        cutoff = min(cutoff, day_start(timezone.localdate(oldest_pending)))
+    return cutoff
+
+
+def archive_path(cutoff, archive_dir=None):
+    archive_dir = archive_dir or settings.PROPERTY_VIEW_ARCHIVE_DIR
+    return os.path.join(archive_dir, f"property_views_before_{cutoff:%Y-%m-%d}.csv.gz")
+
+
+def _gzip_member(rows, write_header):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if write_header:
+        writer.writerow(ARCHIVE_FIELDS)
+    for row in rows:
+        writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+    return gzip.compress(buffer.getvalue().encode())
+
+
+def archive_property_views(days, archive_dir=None, batch_size=5000, pause=0.0):
+    """
+    Move PropertyView rows older than ``days`` days into a CSV.gz archive
+    and delete them from the table. Returns ``(archived, path)``.
+    """
+    cutoff = retention_cutoff(days)
+    path = archive_path(cutoff, archive_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    archived = 0
+    last_id = 0
+    with open(path, 'ab') as archive:
+        write_header = archive.tell() == 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    PropertyView.objects.filter(viewed_at__lt=cutoff, pk__gt=last_id)
+                    .order_by('pk')
+                    .values_list(*ARCHIVE_FIELDS)[:batch_size]
+                )
+                if not rows:
+                    break
+
+                archive.write(_gzip_member(rows, write_header))
+                archive.flush()
+                os.fsync(archive.fileno())
+                write_header = False
+
+                PropertyView.objects.filter(pk__in=[row[0] for row in rows]).delete()
+
+            archived += len(rows)
+            last_id = rows[-1][0]
+            logger.info(f"Archived {archived} property views older than {cutoff:%Y-%m-%d} to {path}")
+            if pause:
+                time.sleep(pause)
+
+    return archived, path
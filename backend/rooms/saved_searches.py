@@ -0,0 +1,234 @@
+"""
+Saved search matching.
+
+New or newly available listings are matched in batches: the saved searches
+that could possibly match the batch are loaded in one query, indexed in
+memory by property type, price band and location trigram, and each listing
+is only checked against the searches its own keys point to. The cost grows
+with the batch and the candidate searches, not with one query per search.
+"""
+import logging
+import math
+import threading
+import weakref
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Q
+
+from core.notifications import NotificationTypes, send_notification
+
+from .locations import normalize_location
+from .models import Property, SavedSearch, SavedSearchMatch
+
+logger = logging.getLogger(__name__)
+
+CHOICE_PARAMS = {
+    'property_type': dict(Property.PROPERTY_TYPES),
+    'rental_type': dict(Property.RENTAL_TYPES),
+}
+INTEGER_PARAMS = ('bedrooms', 'bathrooms')
+BOOLEAN_PARAMS = ('furnished', 'parking', 'pets_allowed', 'utilities_included')
+PRICE_PARAMS = ('min_price', 'max_price')
+SEARCH_PARAMS = (*CHOICE_PARAMS, *INTEGER_PARAMS, *BOOLEAN_PARAMS, *PRICE_PARAMS, 'location')
+
+# Prices are bucketed by powers of two; a search is registered under every
+# band its price range overlaps
+MAX_PRICE_BAND = 40
+ANY = None
+
+
+def normalize_search_params(params):
+    """
+    Validate listing filter parameters and return them in canonical form.
+    Blank values are dropped. Raises ValueError for unknown or invalid ones.
+    """
+    normalized = {}
+    for key, value in params.items():
+        if key not in SEARCH_PARAMS:
+            raise ValueError(f"Unsupported saved search parameter: {key}")
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None):
+            continue
+
+        if key in CHOICE_PARAMS:
+            if value not in CHOICE_PARAMS[key]:
+                raise ValueError(f"Invalid {key}: {value}")
+        elif key in INTEGER_PARAMS:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be an integer")
+            if value < 0:
+                raise ValueError(f"{key} must not be negative")
+        elif key in BOOLEAN_PARAMS:
+            if isinstance(value, str):
+                if value.lower() not in ('true', 'false', '1', '0'):
+                    raise ValueError(f"{key} must be true or false")
+                value = value.lower() in ('true', '1')
+            value = bool(value)
+        elif key in PRICE_PARAMS:
+            try:
+                value = Decimal(str(value)).quantize(Decimal('0.01'))
+            except InvalidOperation:
+                raise ValueError(f"{key} must be a number")
+            if value < 0:
+                raise ValueError(f"{key} must not be negative")
+            value = str(value)
+        elif key == 'location':
+            value = normalize_location(value)
+            if not value:
+                continue
+        normalized[key] = value
+
+    if 'min_price' in normalized and 'max_price' in normalized:
+        if Decimal(normalized['min_price']) > Decimal(normalized['max_price']):
+            raise ValueError("min_price must not be greater than max_price")
+    return normalized
+
+
+def price_band(price):
+    return min(int(math.log2(price)), MAX_PRICE_BAND) if price >= 1 else 0
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SavedSearchIndex:
+    """In-memory inverted index over saved searches for one matching batch."""
+
+    def __init__(self, searches):
+        self.searches = {}
+        self.by_type = defaultdict(set)
+        self.by_band = defaultdict(set)
+        self.by_location = defaultdict(set)
+        for search in searches:
+            self.add(search)
+
+    def add(self, search):
+        self.searches[search.id] = search
+        self.by_type[search.property_type or ANY].add(search.id)
+
+        if search.min_price is None and search.max_price is None:
+            self.by_band[ANY].add(search.id)
+        else:
+            low = price_band(search.min_price) if search.min_price is not None else 0
+            high = price_band(search.max_price) if search.max_price is not None else MAX_PRICE_BAND
+            for band in range(low, high + 1):
+                self.by_band[band].add(search.id)
+
+        # A location filter is a substring match, so its first trigram must
+        # occur somewhere in the listing's location or address
+        self.by_location[search.location[:3] if len(search.location) >= 3 else ANY].add(search.id)
+
+    def candidates(self, property_obj):
+        ids = self.by_type[property_obj.property_type] | self.by_type[ANY]
+        ids &= self.by_band[price_band(property_obj.price)] | self.by_band[ANY]
+        if not ids:
+            return []
+
+        location_ids = set(self.by_location[ANY])
+        text = f"{normalize_location(property_obj.location)} {normalize_location(property_obj.address)}"
+        for gram in trigrams(text):
+            location_ids |= self.by_location.get(gram, set())
+        return [self.searches[search_id] for search_id in ids & location_ids]
+
+
+def candidate_searches(properties):
+    """Active saved searches that could match any listing in the batch."""
+    prices = [property_obj.price for property_obj in properties]
+    types = {property_obj.property_type for property_obj in properties}
+    return (
+        SavedSearch.objects.filter(is_active=True)
+        .filter(Q(property_type='') | Q(property_type__in=types))
+        .filter(Q(min_price__isnull=True) | Q(min_price__lte=max(prices)))
+        .filter(Q(max_price__isnull=True) | Q(max_price__gte=min(prices)))
+    )
+
+
+def match_listings(property_ids):
+    """
+    Match a batch of listings against every saved search, record the new
+    matches and notify each tenant once for the batch. Returns the number of
+    new matches.
+    """
+    properties = list(Property.objects.filter(pk__in=property_ids, status='available'))
+    if not properties:
+        return 0
+
+    index = SavedSearchIndex(candidate_searches(properties))
+    pairs = [
+        (search, property_obj)
+        for property_obj in properties
+        for search in index.candidates(property_obj)
+        if search.matches_property(property_obj)
+    ]
+    if not pairs:
+        return 0
+
+    already_matched = set(
+        SavedSearchMatch.objects.filter(
+            saved_search_id__in={search.id for search, _ in pairs},
+            property_id__in={property_obj.id for _, property_obj in pairs},
+        ).values_list('saved_search_id', 'property_id')
+    )
+    pairs = [(search, property_obj) for search, property_obj in pairs
+             if (search.id, property_obj.id) not in already_matched]
+    SavedSearchMatch.objects.bulk_create(
+        [SavedSearchMatch(saved_search=search, property=property_obj) for search, property_obj in pairs],
+        ignore_conflicts=True,
+    )
+
+    by_tenant = defaultdict(list)
+    for search, property_obj in pairs:
+        by_tenant[search.tenant_id].append({
+            'saved_search_id': search.id,
+            'saved_search_name': search.name,
+            'property_id': property_obj.id,
+            'property_title': property_obj.title,
+        })
+    for tenant_id, matches in by_tenant.items():
+        send_notification(
+            tenant_id,
+            f"{len(matches)} new listing{'s' if len(matches) != 1 else ''} match your saved searches",
+            notification_type=NotificationTypes.SAVED_SEARCH,
+            data={'matches': matches},
+        )
+
+    logger.info(f"Saved search matching: {len(properties)} listings, {len(pairs)} new matches")
+    return len(pairs)
+
+
+# Per thread, like connections: (connection alias, savepoint ids) -> the
+# batch of that savepoint. Only Django's on_commit list holds batches
+# strongly, so a batch the rollback discards leaves this store with it
+_pending = threading.local()
+
+
+class PendingMatches(set):
+    """Listings saved under one savepoint, matched together once it commits."""
+    def __call__(self):
+        try:
+            match_listings(self)
+        except Exception as e:
+            logger.error(f"Error matching saved searches: {str(e)}", exc_info=True)
+
+
+def schedule_match(property_id, using=None):
+    """
+    Queue a listing for matching once the current transaction commits. Every
+    listing saved under the same savepoint is matched in a single batch.
+    """
+    connection = transaction.get_connection(using)
+    if not hasattr(_pending, 'batches'):
+        _pending.batches = weakref.WeakValueDictionary()
+    key = (connection.alias, tuple(connection.savepoint_ids))
+    batch = _pending.batches.get(key)
+    if batch is not None:
+        batch.add(property_id)
+        return
+    batch = _pending.batches[key] = PendingMatches([property_id])
+    transaction.on_commit(batch, using=using)
@@ -1,8 +1,12 @@
 from rest_framework import serializers
-from .models import Property, PropertyImage, PropertyReview, LandlordReview, Favorite, PropertyView, Room
+from .models import Property, PropertyImage, PropertyReview, LandlordReview, Favorite, PropertyView, Room, SavedSearch
+from .images import srcset
+from .thumbnails import CARD_SIZE
+from .saved_searches import normalize_search_params
 from accounts.models import UserProfile
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.urls import reverse
 
 class RoomImageSerializer(serializers.ModelSerializer):
     class Meta:
@@ -40,10 +44,40 @@ class RoomCreateUpdateSerializer(serializers.ModelSerializer):
                 raise ValidationError("Cannot add rooms to a property that is only for full property rental")
         return data
 
+def media_url(serializer, name):
+    url = PropertyImage._meta.get_field('image').storage.url(name)
+    request = serializer.context.get('request')
+    if request:
+        return request.build_absolute_uri(url)
+    return url
+
+def thumbnail_url(serializer, image_id, size=CARD_SIZE):
+    url = reverse('property-image-thumbnail', args=[*size, image_id])
+    request = serializer.context.get('request')
+    if request:
+        return request.build_absolute_uri(url)
+    return url
+
 class PropertyImageSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
+    
     class Meta:
         model = PropertyImage
-        fields = ('id', 'image', 'caption', 'is_primary', 'uploaded_at')
+        fields = (
+            'id', 'image', 'caption', 'is_primary', 'uploaded_at',
+            'width', 'height', 'placeholder', 'processing_status', 'srcset', 'thumbnail'
+        )
+    
+    def get_srcset(self, obj):
+        # {mime type: "url 320w, url 800w, ..."}, empty until processed
+        return srcset(obj.variants, lambda name: media_url(self, name))
+    
+    def get_thumbnail(self, obj):
+        # Card-sized stand-in built on demand, for images without variants
+        if obj.variants:
+            return None
+        return thumbnail_url(self, obj.id)
 
 class PropertySerializer(serializers.ModelSerializer):
     images = PropertyImageSerializer(many=True, read_only=True)
@@ -51,16 +85,16 @@ class PropertySerializer(serializers.ModelSerializer):
     landlord_name = serializers.CharField(source='landlord.username', read_only=True)
     landlord_email = serializers.CharField(source='landlord.email', read_only=True)
     is_favorited = serializers.SerializerMethodField()
-    available_rooms_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Property
         fields = (
             'id', 'landlord', 'landlord_name', 'landlord_email', 'title', 'property_type',
-            'rental_type', 'location', 'address', 'price', 'bedrooms', 'bathrooms',
+            'rental_type', 'location', 'address', 'latitude', 'longitude', 'price', 'bedrooms', 'bathrooms',
             'area_sqft', 'description', 'status', 'furnished', 'parking',
             'pets_allowed', 'utilities_included', 'created_at', 'updated_at',
-            'images', 'rooms', 'is_favorited', 'available_rooms_count'
+            'images', 'rooms', 'is_favorited', 'available_rooms_count',
+            'min_room_price', 'average_rating', 'review_count'
         )
     
     def get_is_favorited(self, obj):
@@ -69,11 +103,13 @@ class PropertySerializer(serializers.ModelSerializer):
             return Favorite.objects.filter(tenant=request.user, property=obj).exists()
         return False
 
+
 class PropertyCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
         fields = (
-            'title', 'property_type', 'rental_type', 'location', 'address', 'price',
+            'title', 'property_type', 'rental_type', 'location', 'address',
+            'latitude', 'longitude', 'price',
             'bedrooms', 'bathrooms', 'area_sqft', 'description',
             'furnished', 'parking', 'pets_allowed', 'utilities_included'
         )
@@ -86,7 +122,7 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
         fields = [
-            'title', 'property_type', 'location', 'address', 'price',
+            'title', 'property_type', 'location', 'address', 'latitude', 'longitude', 'price',
             'bedrooms', 'bathrooms', 'area_sqft', 'description',
             'furnished', 'parking', 'pets_allowed', 'utilities_included',
             'status'
@@ -104,48 +140,78 @@ class PropertyListSerializer(serializers.ModelSerializer):
     landlord_name = serializers.CharField(source='landlord.username', read_only=True)
     is_favorited = serializers.SerializerMethodField()
     primary_image = serializers.SerializerMethodField()
-    available_rooms_count = serializers.SerializerMethodField()
-    min_room_price = serializers.SerializerMethodField()
+    primary_image_srcset = serializers.SerializerMethodField()
+    primary_image_preview = serializers.SerializerMethodField()
+    # Kept numeric, as it was when computed per row
+    min_room_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    distance_km = serializers.SerializerMethodField()
     
     class Meta:
         model = Property
         fields = (
             'id', 'title', 'property_type', 'rental_type', 'location', 'price',
             'bedrooms', 'bathrooms', 'area_sqft', 'status', 'landlord_name',
-            'is_favorited', 'primary_image', 'created_at', 'available_rooms_count',
-            'min_room_price'
+            'is_favorited', 'primary_image', 'primary_image_srcset', 'primary_image_preview',
+            'created_at', 'available_rooms_count', 'min_room_price', 'average_rating',
+            'review_count', 'latitude', 'longitude', 'distance_km'
         )
     
     def get_is_favorited(self, obj):
+        # Annotated by Property.objects.for_listing()
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return Favorite.objects.filter(tenant=request.user, property=obj).exists()
         return False
 
     def get_primary_image(self, obj):
-        primary_image = obj.images.filter(is_primary=True).first()
-        if primary_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(primary_image.image.url)
-            return primary_image.image.url
-        return None
-        
-    def get_available_rooms_count(self, obj):
-        if hasattr(obj, 'available_rooms_count'):
-            return obj.available_rooms_count
-        if obj.rental_type == 'full_property':
-            return 1 if obj.status == 'available' else 0
-        return obj.rooms.filter(status='available').count()
-        
-    def get_min_room_price(self, obj):
-        if obj.rental_type == 'full_property':
-            return obj.price
-        min_price = obj.rooms.filter(status='available').order_by('price').values_list('price', flat=True).first()
-        return min_price if min_price is not None else None
+        # Denormalized onto Property by refresh_listing_summaries(); the
+        # card-sized variant once it has been rendered
+        card = obj.primary_image_variants.get('card')
+        if card:
+            return media_url(self, card['jpeg'])
+        if obj.primary_image_id:
+            # Not processed (yet): a card-sized thumbnail built on demand
+            return thumbnail_url(self, obj.primary_image_id)
+        if not obj.primary_image_name:
+            return None
+        return media_url(self, obj.primary_image_name)
+    
+    def get_primary_image_srcset(self, obj):
+        return srcset(obj.primary_image_variants, lambda name: media_url(self, name))
+    
+    def get_primary_image_preview(self, obj):
+        # {placeholder, width, height}: enough to paint the card before the
+        # image arrives; null without a primary image
+        return obj.primary_image_preview or None
+    
+    def get_distance_km(self, obj):
+        # Only annotated for near=/bbox= queries
+        distance = getattr(obj, 'distance_km', None)
+        return round(distance, 3) if distance is not None else None
+
+class PropertySearchSerializer(PropertyListSerializer):
+    search_rank = serializers.FloatField(read_only=True)
+    title_headline = serializers.SerializerMethodField()
+    description_headline = serializers.SerializerMethodField()
+    
+    class Meta(PropertyListSerializer.Meta):
+        fields = PropertyListSerializer.Meta.fields + (
+            'search_rank', 'title_headline', 'description_headline'
+        )
+    
+    def get_title_headline(self, obj):
+        return getattr(obj, 'title_headline', None)
+    
+    def get_description_headline(self, obj):
+        return getattr(obj, 'description_headline', None)
 
 class PropertyReviewSerializer(serializers.ModelSerializer):
-    tenant_name = serializers.CharField(source='tenant.username', read_only=True)
+    # The user model has no username; review lists select_related('tenant')
+    tenant_name = serializers.CharField(source='tenant.get_full_name', read_only=True)
     
     class Meta:
         model = PropertyReview
@@ -158,8 +224,8 @@ class PropertyReviewCreateSerializer(serializers.ModelSerializer):
         fields = ('rating', 'comment')
 
 class LandlordReviewSerializer(serializers.ModelSerializer):
-    tenant_name = serializers.CharField(source='tenant.username', read_only=True)
-    landlord_name = serializers.CharField(source='landlord.username', read_only=True)
+    tenant_name = serializers.CharField(source='tenant.get_full_name', read_only=True)
+    landlord_name = serializers.CharField(source='landlord.get_full_name', read_only=True)
     
     class Meta:
         model = LandlordReview
@@ -182,6 +248,23 @@ class FavoriteSerializer(serializers.ModelSerializer):
         fields = ('id', 'property', 'property_title', 'property_location', 'property_price', 'created_at', 'tenant_name')
         read_only_fields = ('tenant', 'created_at')
 
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ('id', 'name', 'params', 'is_active', 'created_at', 'updated_at')
+        read_only_fields = ('created_at', 'updated_at')
+    
+    def validate_params(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("params must be an object of listing filters")
+        try:
+            params = normalize_search_params(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        if not params:
+            raise serializers.ValidationError("At least one filter is required")
+        return params
+
 class PropertyViewSerializer(serializers.ModelSerializer):
     viewer_username = serializers.CharField(source='viewer.username', read_only=True)
     property_title = serializers.CharField(source='property.title', read_only=True)
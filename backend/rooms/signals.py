@@ -0,0 +1,126 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+
+from .cache import LOCATIONS, PROPERTIES, bump_generation_on_commit, favorites_namespace, property_namespace
+from .images import release_blob
+from .locations import normalize_location
+from .models import Favorite, LandlordReview, Location, Property, PropertyImage, PropertyReview, Room
+from .ratings import adjust_ratings
+from .saved_searches import schedule_match
+from .view_tracking import flush_views_if_due
+
+
+@receiver(post_save, sender=Property)
+def refresh_property_summary(sender, instance, **kwargs):
+    """Status, rental type and price feed the stored availability/price summary"""
+    Property.objects.filter(pk=instance.pk).refresh_listing_summaries()
+
+
+@receiver(pre_save, sender=Property)
+def remember_previous_state(sender, instance, update_fields=None, **kwargs):
+    """
+    A changed location must also recount the dictionary entry it leaves, and
+    a listing that becomes available is matched against saved searches
+    """
+    instance._previous_location, instance._previous_status = instance.location, instance.status
+    if instance.pk and (update_fields is None or {'location', 'status'} & set(update_fields)):
+        previous = Property.objects.filter(pk=instance.pk).values_list('location', 'status').first()
+        if previous:
+            instance._previous_location, instance._previous_status = previous
+
+
+@receiver(post_save, sender=Property)
+def match_saved_searches(sender, instance, created, using=None, **kwargs):
+    """New listings and listings that become available are matched in a batch on commit"""
+    if instance.status == 'available' and (created or instance._previous_status != 'available'):
+        schedule_match(instance.pk, using=using)
+
+
+@receiver([post_save, post_delete], sender=Property)
+def refresh_location_dictionary(sender, instance, created=None, **kwargs):
+    """Recount the autocomplete entries for the property's old and new location"""
+    names = {normalize_location(instance.location)}
+    if created is False:
+        names.add(normalize_location(instance._previous_location))
+        if len(names) == 1:
+            return
+    Location.objects.refresh(names)
+    bump_generation_on_commit(LOCATIONS)
+
+
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=PropertyImage)
+def refresh_parent_summary(sender, instance, **kwargs):
+    """Keep the parent property's listing summary columns in step with its children"""
+    Property.objects.filter(pk=instance.property_id).refresh_listing_summaries()
+
+
+@receiver(post_delete, sender=PropertyImage)
+def release_image_blob(sender, instance, **kwargs):
+    """Drop the deleted image's reference to its shared file"""
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+
+def rated_object(sender, target_id):
+    """Queryset of the row holding the aggregates a review counts towards"""
+    if sender is PropertyReview:
+        return Property.objects.filter(pk=target_id)
+    return UserProfile.objects.filter(user_id=target_id)
+
+
+def review_target(sender, instance):
+    return instance.property_id if sender is PropertyReview else instance.landlord_id
+
+
+@receiver(pre_save, sender=PropertyReview)
+@receiver(pre_save, sender=LandlordReview)
+def remember_previous_rating(sender, instance, **kwargs):
+    """An edited review must take its old rating out of the aggregates"""
+    instance._previous_rating = None
+    if instance.pk:
+        target = 'property_id' if sender is PropertyReview else 'landlord_id'
+        instance._previous_rating = sender.objects.filter(pk=instance.pk).values_list(target, 'rating').first()
+
+
+@receiver(post_save, sender=PropertyReview)
+@receiver(post_save, sender=LandlordReview)
+def update_rating_aggregates(sender, instance, **kwargs):
+    """Adjust the running rating counters with F() instead of re-aggregating reviews"""
+    target_id = review_target(sender, instance)
+    previous = getattr(instance, '_previous_rating', None)
+    if previous and previous[0] != target_id:
+        adjust_ratings(rated_object(sender, previous[0]), removed=previous[1])
+        previous = None
+    adjust_ratings(rated_object(sender, target_id), removed=previous[1] if previous else None, added=instance.rating)
+
+
+@receiver(post_delete, sender=PropertyReview)
+@receiver(post_delete, sender=LandlordReview)
+def remove_rating(sender, instance, **kwargs):
+    adjust_ratings(rated_object(sender, review_target(sender, instance)), removed=instance.rating)
+
+
+@receiver([post_save, post_delete], sender=Property)
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=PropertyImage)
+@receiver([post_save, post_delete], sender=PropertyReview)
+def invalidate_property_caches(sender, instance, **kwargs):
+    """Orphan cached listing data whenever a property, its rooms, images or reviews change"""
+    bump_generation_on_commit(PROPERTIES)
+    bump_generation_on_commit(property_namespace(instance.pk if sender is Property else instance.property_id))
+
+
+@receiver([post_save, post_delete], sender=Favorite)
+def invalidate_favorite_caches(sender, instance, **kwargs):
+    """Orphan the tenant's cached responses, whose is_favorited flags changed"""
+    bump_generation_on_commit(favorites_namespace(instance.tenant_id))
+
+
+@receiver(request_finished)
+def flush_buffered_views(sender, **kwargs):
+    """Write buffered detail page views once the response has been sent"""
+    flush_views_if_due()
@@ -0,0 +1,131 @@
+import os
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from core.tests.mixins import TemporaryMediaMixin
+from rooms import images
+from rooms.cache import PROPERTIES, get_generation, property_namespace
+from rooms.models import ImageBlob, Property, PropertyImage
+
+from .test_image_variants import jpeg_upload
+
+User = get_user_model()
+
+
+@override_settings(PROPERTY_IMAGE_WORKERS=0, PROPERTY_IMAGE_UPLOAD_WORKERS=8)
+class BulkImageUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        self.url = reverse('property-image-upload', args=[self.property.id])
+        self.client.force_authenticate(user=self.landlord)
+
+    def photos(self, count, offset=0):
+        return [jpeg_upload(name=f'photo{n}.jpg', size=(400 + n, 300)) for n in range(offset, offset + count)]
+
+    def upload_queries(self, files):
+        # Processing runs after commit and isn't part of the request's queries
+        with mock.patch('rooms.views.schedule_processing'):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, {'images': files}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, len(ctx.captured_queries)
+
+    def test_queries_do_not_grow_with_photos(self):
+        """Test that rows are inserted in bulk instead of once per photo"""
+        _, few = self.upload_queries(self.photos(2))
+        response, many = self.upload_queries(self.photos(10, offset=2))
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(PropertyImage.objects.count(), 12)
+        self.assertEqual(ImageBlob.objects.count(), 12)
+
+    def test_only_first_photo_becomes_primary(self):
+        """Test that primary status is decided once, for the first photo of the first upload"""
+        first, _ = self.upload_queries(self.photos(3))
+        second, _ = self.upload_queries(self.photos(2, offset=3))
+
+        self.assertEqual([image['is_primary'] for image in first.data], [True, False, False])
+        self.assertEqual([image['is_primary'] for image in second.data], [False, False])
+        self.property.refresh_from_db()
+        self.assertEqual(self.property.primary_image_name, PropertyImage.objects.get(is_primary=True).image.name)
+
+    def test_duplicates_in_one_upload_share_a_blob(self):
+        """Test that the same photo twice in one request is stored once with two references"""
+        self.upload_queries([jpeg_upload(name='a.jpg'), jpeg_upload(name='b.jpg')])
+
+        blob = ImageBlob.objects.get()
+        self.assertEqual(blob.reference_count, 2)
+        self.assertEqual(blob.images.count(), 2)
+
+    def test_caches_invalidated_on_commit(self):
+        """Test that uploads bump the cache generations only once their transaction commits"""
+        namespaces = (PROPERTIES, property_namespace(self.property.id))
+        before = [get_generation(namespace) for namespace in namespaces]
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.upload_queries(self.photos(2))
+            self.assertEqual([get_generation(namespace) for namespace in namespaces], before)
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(all(get_generation(n) != generation for n, generation in zip(namespaces, before)))
+
+    def test_rolled_back_upload_leaves_no_files(self):
+        """Test that files stored for an upload whose rows roll back are deleted"""
+        uploads = self.photos(3)
+        inspections = images.inspect_uploads(uploads)
+        with mock.patch('rooms.images.insert_property_images', side_effect=DatabaseError('failed')):
+            with self.assertRaises(DatabaseError):
+                images.create_property_images(self.property, uploads, inspections)
+
+        self.assertEqual([files for _, _, files in os.walk(settings.MEDIA_ROOT) if files], [])
+        self.assertFalse(ImageBlob.objects.exists())
+
+    def test_invalid_photo_rejects_whole_upload(self):
+        """Test that nothing is stored when any photo of the request is invalid"""
+        files = self.photos(3) + [SimpleUploadedFile('broken.jpg', b'not an image', content_type='image/jpeg')]
+        response = self.client.post(self.url, {'images': files}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['error'].startswith('broken.jpg:'))
+        self.assertFalse(ImageBlob.objects.exists())
+        self.assertFalse(PropertyImage.objects.exists())
+
+    def test_photos_inspected_concurrently(self):
+        """Test that a slow photo doesn't hold up the others"""
+        inspect = images.inspect_upload
+
+        def slow_inspect(upload):
+            time.sleep(0.2)
+            return inspect(upload)
+
+        with mock.patch('rooms.images.inspect_upload', slow_inspect):
+            started = time.perf_counter()
+            self.upload_queries(self.photos(8))
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 8 * 0.2 / 2)
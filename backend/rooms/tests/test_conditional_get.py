@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Favorite, Property, Room
+from rooms.view_tracking import flush_views, get_buffer
+
+User = get_user_model()
+
+
+@override_settings(SHARED_CACHE=True)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        flush_views()
+        self.addCleanup(flush_views)
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+        self.property = self.create_property()
+        self.list_url = reverse('property-list-create')
+        self.detail_url = reverse('property-detail', args=[self.property.id])
+
+    def create_property(self):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def test_detail_revalidation_returns_304_without_queries(self):
+        """Test that a current If-None-Match skips the database and still counts the view"""
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(len(get_buffer()), 2)
+
+    def test_detail_etag_changes_only_with_its_property(self):
+        """Test that detail validators follow the property and its children"""
+        etag = self.client.get(self.detail_url)['ETag']
+
+        self.create_property()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.create(property=self.property, room_number='1', price=Decimal('500.00'), area_sqft=100)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_validators_follow_params_and_favorites(self):
+        """Test that list ETags differ per query and per user's favorites"""
+        etag = self.client.get(self.list_url, {'bedrooms': 1})['ETag']
+        self.assertNotEqual(self.client.get(self.list_url)['ETag'], etag)
+        response = self.client.get(self.list_url, {'bedrooms': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(user=self.tenant)
+        tenant_etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Favorite.objects.create(tenant=self.tenant, property=self.property)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=tenant_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_if_modified_since(self):
+        """Test that If-Modified-Since is honoured when no ETag is sent"""
+        last_modified = self.client.get(self.list_url)['Last-Modified']
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_no_validators_without_shared_cache(self):
+        """Test that per-process generation counters are never offered as validators"""
+        response = self.client.get(self.detail_url)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,175 @@
+from decimal import Decimal
+from unittest import mock
+
+import requests
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from core.tests.mixins import TemporaryMediaMixin
+from core.tests.test_direct_uploads import declaration, jpeg_bytes, put_file
+from rooms.models import ImageBlob, Property, PropertyImage
+
+User = get_user_model()
+
+
+@override_settings(
+    PROPERTY_IMAGE_WORKERS=0,
+    DIRECT_UPLOAD_BACKEND='core.direct_uploads.LocalDirectUploadBackend',
+)
+class DirectImageUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = self.create_property()
+        self.client.force_authenticate(user=self.landlord)
+
+    def create_property(self):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def presign(self, *contents, property_obj=None):
+        property_obj = property_obj or self.property
+        response = self.client.post(
+            reverse('property-image-presign', args=[property_obj.id]),
+            {'files': [declaration(content, name=f'photo{n}.jpg') for n, content in enumerate(contents)]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data['uploads']
+
+    def complete(self, uploads, property_obj=None):
+        property_obj = property_obj or self.property
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse('property-image-complete', args=[property_obj.id]),
+                {'uploads': [upload['token'] for upload in uploads], 'caption': 'Direct'},
+                format='json',
+            )
+
+    def test_upload_flow(self):
+        """Test that files uploaded straight to storage become processed property images"""
+        contents = [jpeg_bytes((1200, 800)), jpeg_bytes((600, 900))]
+        uploads = self.presign(*contents)
+        self.assertFalse(any(upload['exists'] for upload in uploads))
+        for upload, content in zip(uploads, contents):
+            self.assertEqual(put_file(self.client, upload, content).status_code, status.HTTP_200_OK)
+
+        response = self.complete(uploads)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        images = list(PropertyImage.objects.filter(property=self.property).order_by('id'))
+        self.assertEqual([(image.width, image.height) for image in images], [(1200, 800), (600, 900)])
+        self.assertTrue(images[0].is_primary)
+        self.assertEqual(images[0].caption, 'Direct')
+        for image, content in zip(images, contents):
+            self.assertEqual(image.image.name, image.blob.file.name)
+            self.assertEqual(image.blob.size, len(content))
+            image.refresh_from_db()
+            self.assertEqual(image.processing_status, PropertyImage.READY)
+            self.assertTrue(image.placeholder.startswith('data:image/webp;base64,'))
+
+    def test_stored_content_needs_no_upload(self):
+        """Test that content stored before is reported as such and completes without a PUT"""
+        content = jpeg_bytes()
+        first = self.presign(content)
+        put_file(self.client, first[0], content)
+        self.assertEqual(self.complete(first).status_code, status.HTTP_201_CREATED)
+
+        other = self.create_property()
+        again = self.presign(content, property_obj=other)
+        self.assertTrue(again[0]['exists'])
+        response = self.complete(again, property_obj=other)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        blob = ImageBlob.objects.get()
+        self.assertEqual(blob.reference_count, 2)
+        self.assertEqual(other.images.get().blob, blob)
+
+    def test_completion_requires_upload(self):
+        """Test that uploads whose file never reached storage can't be completed"""
+        response = self.complete(self.presign(jpeg_bytes()))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('has not been uploaded', response.data['error'])
+        self.assertFalse(PropertyImage.objects.exists())
+        self.assertFalse(ImageBlob.objects.exists())
+
+    def test_completion_rejects_non_images(self):
+        """Test that files whose header isn't an image's are rejected at completion"""
+        content = b'GIF89a' + b'\0' * 2048
+        response = self.client.post(
+            reverse('property-image-presign', args=[self.property.id]),
+            {'files': [declaration(content, name='fake.gif', content_type='image/gif')]},
+            format='json',
+        )
+        upload = response.data['uploads'][0]
+        put_file(self.client, upload, content)
+
+        response = self.complete([upload])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PropertyImage.objects.exists())
+
+    def test_tokens_are_bound_to_property(self):
+        """Test that an upload presigned for one property can't be added to another"""
+        content = jpeg_bytes()
+        uploads = self.presign(content)
+        put_file(self.client, uploads[0], content)
+
+        response = self.complete(uploads, property_obj=self.create_property())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Invalid upload token')
+
+    def test_only_owner_can_presign(self):
+        """Test that other users get no upload URLs for a property"""
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        UserProfile.objects.create(user=other, user_type='landlord')
+        self.client.force_authenticate(user=other)
+
+        response = self.client.post(
+            reverse('property-image-presign', args=[self.property.id]),
+            {'files': [declaration(jpeg_bytes())]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_presign_rejects_invalid_declarations(self):
+        """Test that files that would be refused on upload get no URL"""
+        response = self.client.post(
+            reverse('property-image-presign', args=[self.property.id]),
+            {'files': [declaration(jpeg_bytes(), name='notes.txt')]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(default_storage.exists('property_images'))
+
+    @override_settings(
+        DIRECT_UPLOAD_BACKEND='core.direct_uploads.S3DirectUploadBackend',
+        DIRECT_UPLOAD_S3_ENDPOINT='http://localhost:9000',
+        DIRECT_UPLOAD_S3_BUCKET='media',
+    )
+    @mock.patch('core.direct_uploads.requests.head', side_effect=requests.ConnectionError('refused'))
+    def test_unreachable_storage_is_503(self, head):
+        """Test that completion reports storage it can't reach as unavailable rather than failing"""
+        response = self.complete(self.presign(jpeg_bytes()))
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        head.assert_called_once()
+        self.assertFalse(PropertyImage.objects.exists())
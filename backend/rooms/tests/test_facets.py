@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Property
+
+User = get_user_model()
+
+
+@override_settings(SHARED_CACHE=True)
+class PropertyFacetsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.facets_url = reverse('property-facets')
+
+        self.create_property('apartment', 2, '100.00', furnished=True)
+        self.create_property('apartment', 3, '200.00', parking=True)
+        self.create_property('house', 3, '1000.00', parking=True, pets_allowed=True)
+
+    def create_property(self, property_type, bedrooms, price, **kwargs):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            property_type=property_type,
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal(price),
+            bedrooms=bedrooms,
+            area_sqft=800,
+            description='Test Description',
+            **kwargs
+        )
+
+    def test_facet_counts(self):
+        """Test facet counts for the full and a filtered set in one query each"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.facets_url, {'price_buckets': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        data = response.data
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(data['property_type'], [
+            {'value': 'apartment', 'count': 2}, {'value': 'house', 'count': 1}
+        ])
+        self.assertEqual(data['bedrooms'], [{'value': 2, 'count': 1}, {'value': 3, 'count': 2}])
+        self.assertEqual(data['amenities'], {'furnished': 1, 'parking': 2, 'pets_allowed': 1})
+        self.assertEqual([bucket['count'] for bucket in data['price']['buckets']], [2, 1])
+
+        response = self.client.get(self.facets_url, {'property_type': 'apartment'})
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['amenities']['pets_allowed'], 0)
+
+    def test_cache_invalidated_on_write(self):
+        """Test that cached facets are served until a property changes"""
+        self.client.get(self.facets_url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.facets_url)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(response.data['total'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_property('studio', 1, '50.00')
+        response = self.client.get(self.facets_url)
+        self.assertEqual(response.data['total'], 4)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_not_cached_without_shared_cache(self):
+        """Test that facets aren't cached in a per-process cache other workers can't invalidate"""
+        self.client.get(self.facets_url)
+        Property.objects.filter(property_type='house').update(property_type='duplex')
+
+        response = self.client.get(self.facets_url)
+        self.assertEqual(response.data['property_type'], [
+            {'value': 'apartment', 'count': 2}, {'value': 'duplex', 'count': 1}
+        ])
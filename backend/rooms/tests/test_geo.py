@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms import geo
+from rooms.models import Property
+
+User = get_user_model()
+
+
+class GeohashTests(SimpleTestCase):
+    def test_encode_decode(self):
+        """Test geohash encoding against a known reference value"""
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        latitude, longitude, lat_err, lng_err = geo.decode('u4pruydqqvj')
+        self.assertAlmostEqual(latitude, 57.64911, delta=lat_err)
+        self.assertAlmostEqual(longitude, 10.40744, delta=lng_err)
+
+    def test_covering_cells_contain_radius(self):
+        """Test that points on the radius edge fall inside a covering cell"""
+        latitude, longitude, radius_km = 6.5244, 3.3792, 5
+        cells = geo.covering_cells(latitude, longitude, radius_km)
+        min_lat, min_lng, max_lat, max_lng = geo.bounding_box(latitude, longitude, radius_km)
+        for point in [(min_lat, longitude), (max_lat, longitude), (latitude, min_lng), (latitude, max_lng)]:
+            self.assertTrue(any(geo.encode(*point).startswith(cell) for cell in cells))
+
+    def test_bounding_box_wraps_antimeridian(self):
+        """Test that boxes crossing the antimeridian wrap into two longitude ranges instead of being clamped"""
+        min_lat, min_lng, max_lat, max_lng = geo.bounding_box(-17.0, 179.95, 20)
+        self.assertGreater(min_lng, 179)
+        self.assertLess(max_lng, -179)
+        self.assertEqual(geo.longitude_ranges(min_lng, max_lng), [(min_lng, 180.0), (-180.0, max_lng)])
+        self.assertAlmostEqual(geo.centre_longitude(min_lng, max_lng), 179.95)
+        self.assertEqual(geo.longitude_ranges(3.0, 4.0), [(3.0, 4.0)])
+
+
+class PropertyGeoSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.list_url = reverse('property-list-create')
+
+        # Lagos Island, Ikeja (~15km north) and Abuja (~520km away)
+        self.island = self.create_property('6.454100', '3.394200')
+        self.ikeja = self.create_property('6.601800', '3.351500')
+        self.abuja = self.create_property('9.076500', '7.398600')
+        self.create_property(None, None)
+
+    def create_property(self, latitude, longitude):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Nigeria',
+            address='1 Test Street',
+            latitude=Decimal(latitude) if latitude else None,
+            longitude=Decimal(longitude) if longitude else None,
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def result_ids(self, params):
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['id'] for row in response.data['results']]
+
+    def test_radius_search_sorted_by_distance(self):
+        """Test that radius search excludes far properties and sorts by distance"""
+        self.assertEqual(self.island.geohash, geo.encode(6.4541, 3.3942))
+        ids = self.result_ids({'near': '6.4550,3.3900', 'radius_km': 30})
+        self.assertEqual(ids, [self.island.id, self.ikeja.id])
+        self.assertEqual(self.result_ids({'near': '6.4550,3.3900', 'radius_km': 2}), [self.island.id])
+
+    def test_bbox_search(self):
+        """Test that bounding-box search only returns properties inside the box"""
+        ids = self.result_ids({'bbox': '3.0,6.0,4.0,7.0'})
+        self.assertCountEqual(ids, [self.island.id, self.ikeja.id])
+
+    def test_searches_across_antimeridian(self):
+        """Test that radius and bounding-box searches find properties on both sides of longitude 180"""
+        west = self.create_property('-16.800000', '179.950000')
+        east = self.create_property('-16.800000', '-179.950000')
+        self.assertEqual(self.result_ids({'near': '-16.8,179.99', 'radius_km': 20}), [west.id, east.id])
+        self.assertCountEqual(self.result_ids({'bbox': '179.5,-17.0,-179.5,-16.5'}), [west.id, east.id])
+
+    def test_invalid_params(self):
+        """Test that malformed coordinates are rejected"""
+        response = self.client.get(self.list_url, {'near': 'lagos'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.list_url, {'near': '6.4,3.3', 'radius_km': 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
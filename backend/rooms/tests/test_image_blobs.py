@@ -0,0 +1,107 @@
+import hashlib
+import os
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from core.tests.mixins import TemporaryMediaMixin
+from rooms.images import variant_names
+from rooms.models import ImageBlob, Property, PropertyImage
+
+from .test_image_variants import jpeg_upload
+
+User = get_user_model()
+
+
+@override_settings(PROPERTY_IMAGE_WORKERS=0)
+class ImageBlobTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.first, self.second = [
+            Property.objects.create(
+                landlord=self.landlord,
+                title=f'Test Property {n}',
+                location='Lagos',
+                address=f'{n} Test Street',
+                price=Decimal('1000.00'),
+                area_sqft=800,
+                description='Test Description',
+            )
+            for n in (1, 2)
+        ]
+        self.client.force_authenticate(user=self.landlord)
+
+    def upload(self, property_obj, *files):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('property-image-upload', args=[property_obj.id]),
+                {'images': list(files)},
+                format='multipart',
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    def test_stored_under_content_hash(self):
+        """Test that an upload is stored once under the SHA-256 of its content"""
+        upload = jpeg_upload(name='Living Room.JPG')
+        digest = hashlib.sha256(upload.read()).hexdigest()
+        upload.seek(0)
+        self.upload(self.first, upload)
+
+        blob = ImageBlob.objects.get()
+        self.assertEqual(blob.digest, digest)
+        self.assertEqual(blob.file.name, f'property_images/{digest[:2]}/{digest}.jpg')
+        self.assertEqual(blob.reference_count, 1)
+        self.assertEqual(PropertyImage.objects.get().image.name, blob.file.name)
+
+    def test_repeated_upload_shares_blob_and_skips_processing(self):
+        """Test that the same photo uploaded again reuses the file and its variants"""
+        self.upload(self.first, jpeg_upload(name='a.jpg'))
+        original = PropertyImage.objects.get(property=self.first)
+
+        with mock.patch('rooms.images.render_variants') as render:
+            response = self.upload(self.second, jpeg_upload(name='b.jpg'))
+        render.assert_not_called()
+
+        copy = PropertyImage.objects.get(property=self.second)
+        self.assertEqual(response.data[0]['processing_status'], PropertyImage.READY)
+        self.assertEqual(copy.image.name, original.image.name)
+        self.assertEqual(copy.variants, original.variants)
+        self.assertEqual((copy.width, copy.height), (original.width, original.height))
+        self.assertEqual(ImageBlob.objects.get().reference_count, 2)
+        self.assertEqual(len(os.listdir(os.path.dirname(original.image.path))), 1)
+
+    def test_different_content_gets_its_own_blob(self):
+        """Test that different photos are stored separately"""
+        self.upload(self.first, jpeg_upload(), jpeg_upload(size=(1200, 900)))
+
+        self.assertEqual(ImageBlob.objects.count(), 2)
+        self.assertEqual(PropertyImage.objects.filter(processing_status=PropertyImage.READY).count(), 2)
+
+    def test_files_deleted_with_last_reference(self):
+        """Test that the shared file outlives all but the last image using it"""
+        self.upload(self.first, jpeg_upload())
+        self.upload(self.second, jpeg_upload())
+        name = ImageBlob.objects.get().file.name
+        stored = [name] + variant_names(name)
+        self.assertTrue(all(default_storage.exists(path) for path in stored))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PropertyImage.objects.get(property=self.first).delete()
+        self.assertEqual(ImageBlob.objects.get().reference_count, 1)
+        self.assertTrue(all(default_storage.exists(path) for path in stored))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+        self.assertFalse(ImageBlob.objects.exists())
+        self.assertFalse(any(default_storage.exists(path) for path in stored))
@@ -0,0 +1,106 @@
+import base64
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from core.tests.mixins import TemporaryMediaMixin
+from rooms.images import PLACEHOLDER_SIZE
+from rooms.models import Property, PropertyImage
+
+from .test_image_variants import jpeg_upload
+
+User = get_user_model()
+
+
+def decode_placeholder(data_uri):
+    prefix = 'data:image/webp;base64,'
+    assert data_uri.startswith(prefix)
+    return Image.open(BytesIO(base64.b64decode(data_uri[len(prefix):])))
+
+
+@override_settings(PROPERTY_IMAGE_WORKERS=0)
+class ImagePlaceholderTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        self.url = reverse('property-image-upload', args=[self.property.id])
+        self.client.force_authenticate(user=self.landlord)
+
+    def test_jpeg_placeholder_at_upload(self):
+        """Test that a JPEG has its placeholder and dimensions before any processing"""
+        # On-commit processing is never run here
+        response = self.client.post(self.url, {'images': [jpeg_upload(size=(1600, 900))]}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image = response.data[0]
+        self.assertEqual(image['processing_status'], PropertyImage.PENDING)
+        self.assertEqual((image['width'], image['height']), (1600, 900))
+        self.assertEqual(decode_placeholder(image['placeholder']).size, (PLACEHOLDER_SIZE, 9))
+
+    def test_other_formats_get_placeholder_with_variants(self):
+        """Test that a PNG gets its placeholder from the background pipeline"""
+        output = BytesIO()
+        Image.new('RGBA', (400, 800), (10, 20, 30, 255)).save(output, 'PNG')
+        upload = SimpleUploadedFile('plan.png', output.getvalue(), content_type='image/png')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, {'images': [upload]}, format='multipart')
+        self.assertEqual(response.data[0]['placeholder'], '')
+        self.assertEqual((response.data[0]['width'], response.data[0]['height']), (400, 800))
+
+        for callback in callbacks:
+            callback()
+        image = PropertyImage.objects.get()
+        self.assertEqual(decode_placeholder(image.placeholder).size, (8, PLACEHOLDER_SIZE))
+
+    def test_listing_returns_preview_inline(self):
+        """Test that listing rows carry the primary image's placeholder and dimensions"""
+        self.client.post(self.url, {'images': [jpeg_upload(size=(1200, 800))]}, format='multipart')
+        self.client.force_authenticate(user=None)
+
+        row = self.client.get(reverse('property-list-create')).data['results'][0]
+        preview = row['primary_image_preview']
+        self.assertEqual((preview['width'], preview['height']), (1200, 800))
+        self.assertEqual(preview['placeholder'], PropertyImage.objects.get().placeholder)
+
+    def test_listing_without_images(self):
+        """Test that a property without images has no preview"""
+        row = self.client.get(reverse('property-list-create')).data['results'][0]
+        self.assertIsNone(row['primary_image_preview'])
+
+    def test_backfill_command(self):
+        """Test that older images get their placeholder, dimensions and listing preview"""
+        image = PropertyImage.objects.create(
+            property=self.property, image=jpeg_upload(size=(900, 1200)), is_primary=True
+        )
+        self.assertEqual(image.placeholder, '')
+
+        call_command('backfill_image_placeholders', stdout=StringIO())
+        image.refresh_from_db()
+        self.property.refresh_from_db()
+
+        self.assertEqual((image.width, image.height), (900, 1200))
+        self.assertEqual(decode_placeholder(image.placeholder).size, (12, PLACEHOLDER_SIZE))
+        self.assertEqual(
+            self.property.primary_image_preview, {'placeholder': image.placeholder, 'width': 900, 'height': 1200}
+        )
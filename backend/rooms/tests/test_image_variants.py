@@ -0,0 +1,143 @@
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.images import VARIANTS, process_image
+from rooms.models import Property, PropertyImage
+from rooms.view_tracking import flush_views
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def jpeg_upload(name='photo.jpg', size=(2400, 1600)):
+    output = BytesIO()
+    Image.new('RGB', size, (40, 120, 60)).save(output, 'JPEG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROPERTY_IMAGE_WORKERS=0)
+class ImageVariantTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.addCleanup(flush_views)
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        self.client.force_authenticate(user=self.landlord)
+
+    def upload(self, *files):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('property-image-upload', args=[self.property.id]),
+                {'images': list(files)},
+                format='multipart',
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    def test_upload_returns_before_processing(self):
+        """Test that the upload response comes back with the images still pending"""
+        response = self.upload(jpeg_upload())
+
+        self.assertEqual(response.data[0]['processing_status'], PropertyImage.PENDING)
+        self.assertEqual(response.data[0]['srcset'], {})
+
+    def test_variants_rendered_after_commit(self):
+        """Test that every variant is written in WebP and JPEG once the upload commits"""
+        self.upload(jpeg_upload())
+        image = PropertyImage.objects.get(property=self.property)
+
+        self.assertEqual(image.processing_status, PropertyImage.READY)
+        self.assertEqual((image.width, image.height), (2400, 1600))
+        self.assertEqual(set(image.variants), set(VARIANTS))
+        for variant, max_width in VARIANTS.items():
+            entry = image.variants[variant]
+            self.assertEqual(entry['width'], max_width)
+            for ext, fmt in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+                with image.image.storage.open(entry[ext]) as stored:
+                    picture = Image.open(stored)
+                    self.assertEqual(picture.format, fmt)
+                    self.assertEqual(picture.size, (entry['width'], entry['height']))
+
+    def test_small_images_are_not_upscaled(self):
+        """Test that variants wider than the original keep the original size"""
+        self.upload(jpeg_upload(size=(500, 400)))
+        image = PropertyImage.objects.get(property=self.property)
+
+        self.assertEqual(image.variants['full']['width'], 500)
+        self.assertEqual(image.variants['card']['width'], 500)
+        self.assertEqual(image.variants['thumb']['width'], 320)
+
+    def test_srcset_in_detail_and_listing(self):
+        """Test that the detail and listing responses offer the variants as srcset candidates"""
+        self.upload(jpeg_upload())
+
+        detail = self.client.get(reverse('property-detail', args=[self.property.id]))
+        srcset = detail.data['images'][0]['srcset']
+        self.assertEqual(set(srcset), {'image/webp', 'image/jpeg'})
+        candidates = srcset['image/webp'].split(', ')
+        self.assertEqual([candidate.split(' ')[1] for candidate in candidates], ['320w', '800w', '1920w'])
+
+        listing = self.client.get(reverse('property-list-create'))
+        result = listing.data['results'][0]
+        self.assertTrue(result['primary_image'].endswith('_card.jpeg'))
+        self.assertEqual(result['primary_image_srcset'], srcset)
+
+    @override_settings(IMAGE_MAX_PIXELS=1_000_000)
+    def test_oversized_upload_rejected(self):
+        """Test that an image over the pixel limit is refused before anything is stored"""
+        response = self.client.post(
+            reverse('property-image-upload', args=[self.property.id]),
+            {'images': [jpeg_upload()]},
+            format='multipart',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('megapixels', response.data['error'])
+        self.assertFalse(PropertyImage.objects.exists())
+
+    def test_unreadable_upload_fails(self):
+        """Test that an image Pillow cannot decode is marked failed instead of raising"""
+        image = PropertyImage.objects.create(
+            property=self.property,
+            image=SimpleUploadedFile('broken.jpg', b'not an image', content_type='image/jpeg'),
+        )
+
+        self.assertFalse(process_image(image.id))
+        image.refresh_from_db()
+        self.assertEqual(image.processing_status, PropertyImage.FAILED)
+        self.assertEqual(image.variants, {})
+
+    def test_command_processes_pending_images(self):
+        """Test that process_property_images picks up images left pending"""
+        image = PropertyImage.objects.create(property=self.property, image=jpeg_upload())
+
+        call_command('process_property_images', workers=1, stdout=StringIO())
+        image.refresh_from_db()
+        self.assertEqual(image.processing_status, PropertyImage.READY)
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from messaging.models import Conversation
+from rooms.analytics import landlord_property_stats, rollup_property_views
+from rooms.models import Favorite, Property, PropertyReview, PropertyView
+from transactions.models import Transaction
+
+User = get_user_model()
+
+
+class LandlordPropertyStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+        self.first = self.create_property('First')
+        self.second = self.create_property('Second')
+
+    def create_property(self, title):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title=title,
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def test_stats_per_property(self):
+        """Test that every figure is counted per property and totalled"""
+        PropertyView.objects.create(property=self.first, ip_address='127.0.0.1')
+        rollup_property_views()
+        PropertyView.objects.create(property=self.first, ip_address='10.0.0.1')
+        Favorite.objects.create(tenant=self.tenant, property=self.first)
+        Conversation.objects.create(landlord=self.landlord, tenant=self.tenant, property=self.second)
+        for reference, transaction_status in (('ref-1', 'successful'), ('ref-2', 'failed')):
+            Transaction.objects.create(
+                user=self.tenant, reference=reference, amount=Decimal('1000.00'),
+                status=transaction_status, property=self.second,
+            )
+        PropertyReview.objects.create(property=self.first, tenant=self.tenant, rating=4, comment='Good')
+
+        stats = landlord_property_stats(self.landlord)
+        by_property = {row['property_id']: row for row in stats['properties']}
+        self.assertEqual(by_property[self.first.id]['views'], 2)
+        self.assertEqual(by_property[self.first.id]['favorites'], 1)
+        self.assertEqual(by_property[self.first.id]['average_rating'], Decimal('4.00'))
+        self.assertEqual(by_property[self.second.id]['conversations'], 1)
+        self.assertEqual(by_property[self.second.id]['successful_transactions'], 1)
+        self.assertEqual(stats['totals']['properties'], 2)
+        self.assertEqual(stats['totals']['average_rating'], Decimal('4.00'))
+
+    def test_query_count_does_not_grow_with_listings(self):
+        """Test that the dashboard is built from a fixed number of grouped queries"""
+        for n in range(20):
+            self.create_property(f'Extra {n}')
+        with CaptureQueriesContext(connection) as ctx:
+            stats = landlord_property_stats(self.landlord)
+        self.assertEqual(len(stats['properties']), 22)
+        self.assertLessEqual(len(ctx.captured_queries), 7)
+
+    def test_endpoint_is_cached_and_landlord_only(self):
+        """Test that the endpoint serves landlords from cache and rejects tenants"""
+        self.client.force_authenticate(user=self.landlord)
+        url = reverse('landlord-property-stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        Favorite.objects.create(tenant=self.tenant, property=self.first)
+        self.assertEqual(self.client.get(url).data['totals']['favorites'], 0)
+
+        self.client.force_authenticate(user=self.tenant)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,89 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Favorite, Property, PropertyImage, Room
+
+User = get_user_model()
+
+
+class PropertyListingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+
+        self.list_url = reverse('property-list-create')
+
+    def create_property(self, **kwargs):
+        data = {
+            'landlord': self.landlord,
+            'title': 'Test Property',
+            'location': 'Lagos',
+            'address': '1 Test Street',
+            'price': Decimal('1000.00'),
+            'area_sqft': 800,
+            'description': 'Test Description',
+        }
+        data.update(kwargs)
+        return Property.objects.create(**data)
+
+    def create_rooms_property(self):
+        property_obj = self.create_property(rental_type='rooms_only')
+        Room.objects.create(property=property_obj, room_number='1', price=Decimal('300.00'), area_sqft=100)
+        Room.objects.create(property=property_obj, room_number='2', price=Decimal('250.00'), area_sqft=100)
+        Room.objects.create(property=property_obj, room_number='3', price=Decimal('100.00'), area_sqft=100,
+                            status='occupied')
+        PropertyImage.objects.create(property=property_obj, image='property_images/a.jpg', is_primary=True)
+        Favorite.objects.create(tenant=self.tenant, property=property_obj)
+        return property_obj
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_listing_annotations(self):
+        """Test that the annotated listing matches the per-row computation"""
+        rooms_property = self.create_rooms_property()
+        self.create_property(status='rented')
+
+        self.client.force_authenticate(user=self.tenant)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = {row['id']: row for row in response.data['results']}
+        row = results[rooms_property.id]
+        self.assertTrue(row['is_favorited'])
+        self.assertEqual(row['available_rooms_count'], 2)
+        self.assertEqual(row['min_room_price'], Decimal('250.00'))
+        # Unprocessed primary image: a card-sized thumbnail instead of the original
+        primary = PropertyImage.objects.get(property=rooms_property, is_primary=True)
+        self.assertTrue(row['primary_image'].endswith(f'/media/thumb/800x800/{primary.id}/'))
+
+        rented = [r for pk, r in results.items() if pk != rooms_property.id][0]
+        self.assertFalse(rented['is_favorited'])
+        self.assertEqual(rented['available_rooms_count'], 0)
+        self.assertEqual(rented['min_room_price'], Decimal('1000.00'))
+        self.assertIsNone(rented['primary_image'])
+
+    def test_query_count_is_constant(self):
+        """Test that the number of queries does not grow with the page size"""
+        self.client.force_authenticate(user=self.tenant)
+        self.create_rooms_property()
+        baseline = self.count_list_queries()
+
+        for _ in range(5):
+            self.create_rooms_property()
+        self.assertEqual(self.count_list_queries(), baseline)
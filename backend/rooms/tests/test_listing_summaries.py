@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Property, PropertyImage, PropertyReview, Room
+
+User = get_user_model()
+
+
+class ListingSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Shared House',
+            rental_type='rooms_only',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def refreshed(self):
+        return Property.objects.get(pk=self.property.pk)
+
+    def test_room_changes_update_summary(self):
+        """Test that room writes keep the availability and price summary current"""
+        room = Room.objects.create(property=self.property, room_number='1', price=Decimal('300.00'), area_sqft=100)
+        Room.objects.create(property=self.property, room_number='2', price=Decimal('250.00'), area_sqft=100)
+
+        summary = self.refreshed()
+        self.assertEqual(summary.available_rooms_count, 2)
+        self.assertEqual(summary.min_room_price, Decimal('250.00'))
+
+        room.status = 'occupied'
+        room.save()
+        Room.objects.get(room_number='2').delete()
+
+        summary = self.refreshed()
+        self.assertEqual(summary.available_rooms_count, 0)
+        self.assertIsNone(summary.min_room_price)
+        self.assertFalse(summary.has_available_rooms())
+
+    def test_image_and_review_changes_update_summary(self):
+        """Test that primary image and review writes update the summary columns"""
+        image = PropertyImage.objects.create(property=self.property, image='property_images/a.jpg', is_primary=True)
+        PropertyReview.objects.create(property=self.property, tenant=self.tenant, rating=4, comment='Good')
+
+        summary = self.refreshed()
+        self.assertEqual(summary.primary_image_name, 'property_images/a.jpg')
+        self.assertEqual(summary.review_count, 1)
+        self.assertEqual(summary.average_rating, Decimal('4.00'))
+
+        image.delete()
+        self.assertEqual(self.refreshed().primary_image_name, '')
+
+    def test_summary_filters(self):
+        """Test that available and min_rating filter on the summary columns"""
+        Room.objects.create(property=self.property, room_number='1', price=Decimal('300.00'), area_sqft=100)
+        PropertyReview.objects.create(property=self.property, tenant=self.tenant, rating=5, comment='Great')
+        Property.objects.create(
+            landlord=self.landlord, title='Rented Flat', location='Abuja', address='2 Test Street',
+            price=Decimal('800.00'), area_sqft=500, description='Test', status='rented',
+        )
+
+        response = self.client.get(reverse('property-list-create'), {'available': 'true', 'min_rating': '4.5'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.property.id])
+        self.assertEqual(response.data['results'][0]['average_rating'], '5.00')
+
+    def test_lowest_price_ordering(self):
+        """Test that listings sort by their cheapest available room, else their base price"""
+        Room.objects.create(property=self.property, room_number='1', price=Decimal('300.00'), area_sqft=100)
+        flat = Property.objects.create(
+            landlord=self.landlord, title='Flat', location='Abuja', address='2 Test Street',
+            price=Decimal('500.00'), area_sqft=500, description='Test',
+        )
+        empty = Property.objects.create(
+            landlord=self.landlord, title='Empty House', rental_type='rooms_only', location='Abuja',
+            address='3 Test Street', price=Decimal('200.00'), area_sqft=500, description='Test',
+        )
+
+        response = self.client.get(reverse('property-list-create'), {'ordering': 'lowest_price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [empty.id, self.property.id, flat.id])
+
+        response = self.client.get(reverse('property-list-create'), {'ordering': '-lowest_price', 'page_size': 1})
+        self.assertEqual(response.data['results'][0]['id'], flat.id)
+        self.assertEqual(self.client.get(response.data['next']).data['results'][0]['id'], self.property.id)
+
+        response = self.client.get(reverse('property-facets'), {'ordering': 'lowest_price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_recompute_command_repairs_drift(self):
+        """Test that recompute_listing_summaries rebuilds stale columns"""
+        Room.objects.create(property=self.property, room_number='1', price=Decimal('300.00'), area_sqft=100)
+        Property.objects.filter(pk=self.property.pk).update(available_rooms_count=0, min_room_price=None)
+
+        call_command('recompute_listing_summaries', batch_size=1, verbosity=0)
+
+        summary = self.refreshed()
+        self.assertEqual(summary.available_rooms_count, 1)
+        self.assertEqual(summary.min_room_price, Decimal('300.00'))
@@ -0,0 +1,121 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.locations import normalize_location
+from rooms.models import Location, Property
+from rooms.views import location_suggestions
+
+User = get_user_model()
+
+
+class LocationAutocompleteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        location_suggestions.cache_clear()
+
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+
+        self.url = reverse('location-autocomplete')
+
+    def create_property(self, location):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location=location,
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def test_normalize_location(self):
+        """Test that case, whitespace and trailing separators are normalized away"""
+        self.assertEqual(normalize_location('  Lekki   Phase 1, '), 'lekki phase 1')
+        self.assertEqual(normalize_location(None), '')
+
+    def test_dictionary_counts_normalized_locations(self):
+        """Test that property writes keep one counted entry per normalized location"""
+        self.create_property('Lekki')
+        self.create_property('lekki ')
+        property_obj = self.create_property('Ikeja')
+
+        self.assertEqual(Location.objects.get(normalized='lekki').listing_count, 2)
+        self.assertEqual(Location.objects.get(normalized='lekki').name, 'Lekki')
+
+        property_obj.location = 'Lekki'
+        property_obj.save()
+        self.assertEqual(Location.objects.get(normalized='lekki').listing_count, 3)
+        self.assertFalse(Location.objects.filter(normalized='ikeja').exists())
+
+        Property.objects.filter(location='Lekki').first().delete()
+        self.assertEqual(Location.objects.get(normalized='lekki').listing_count, 2)
+
+    def test_prefix_matches_ordered_by_listing_count(self):
+        """Test that prefix matches come back busiest first with counts"""
+        self.create_property('Lekki Phase 1')
+        self.create_property('Lekki')
+        self.create_property('Lekki')
+
+        response = self.client.get(self.url, {'q': 'LEK'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['name'], row['listing_count']) for row in response.data['results']],
+            [('Lekki', 2), ('Lekki Phase 1', 1)]
+        )
+
+    def test_fuzzy_matches_fill_short_prefix_results(self):
+        """Test that typos and mid-name words still find a location through trigram similarity"""
+        self.create_property('Lekki Phase 1')
+        self.create_property('Ikeja')
+
+        response = self.client.get(self.url, {'q': 'lekky'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in response.data['results']], ['Lekki Phase 1'])
+
+        response = self.client.get(self.url, {'q': 'phase'})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Lekki Phase 1'])
+
+    def test_new_listing_invalidates_cached_suggestions(self):
+        """Test that the in-process LRU does not serve suggestions from before a write"""
+        self.create_property('Yaba')
+        self.assertEqual(self.client.get(self.url, {'q': 'ya'}).data['results'][0]['listing_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_property('Yaba')
+        self.assertEqual(self.client.get(self.url, {'q': 'ya'}).data['results'][0]['listing_count'], 2)
+
+    @override_settings(SHARED_CACHE=False, LOCATION_SUGGESTIONS_TTL=60)
+    def test_cached_suggestions_expire_without_shared_cache(self):
+        """Test that suggestions cached by one worker expire when another worker's write can't reach it"""
+        self.create_property('Yaba')
+        # This worker never sees the generation bump of the next write
+        with mock.patch('rooms.views.get_generation', return_value=1), mock.patch('rooms.views.time.time') as now:
+            now.return_value = 6000.0
+            self.assertEqual(self.client.get(self.url, {'q': 'ya'}).data['results'][0]['listing_count'], 1)
+            self.create_property('Yaba')
+            self.assertEqual(self.client.get(self.url, {'q': 'ya'}).data['results'][0]['listing_count'], 1)
+
+            now.return_value = 6060.0
+            self.assertEqual(self.client.get(self.url, {'q': 'ya'}).data['results'][0]['listing_count'], 2)
+
+    def test_invalid_limit(self):
+        """Test that a non-integer limit is rejected"""
+        response = self.client.get(self.url, {'q': 'ya', 'limit': 'ten'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        """Test that rebuild_locations restores entries after raw writes"""
+        self.create_property('Surulere')
+        Location.objects.all().delete()
+
+        call_command('rebuild_locations', verbosity=0)
+        self.assertEqual(Location.objects.get(normalized='surulere').listing_count, 1)
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Property
+
+User = get_user_model()
+
+
+class PropertyKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.list_url = reverse('property-list-create')
+
+        self.properties = [
+            Property.objects.create(
+                landlord=self.landlord,
+                title=f'Garden flat {i}',
+                location='Lagos',
+                address='1 Test Street',
+                price=Decimal('500.00') if i % 2 else Decimal('900.00'),
+                area_sqft=800,
+                description='garden ' * (i + 1),
+            )
+            for i in range(7)
+        ]
+        # Rows sharing a timestamp must still page without gaps or repeats
+        Property.objects.update(created_at=timezone.now())
+
+    def collect(self, params):
+        ids, url = [], self.list_url
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            url, params = response.data['next'], None
+        return ids
+
+    def test_pages_cover_every_row_once(self):
+        """Test walking the cursor returns every property exactly once"""
+        ids = self.collect({'page_size': 3})
+        self.assertEqual(sorted(ids), sorted(p.id for p in self.properties))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_ordering_field_and_search_rank(self):
+        """Test that explicit orderings and search ranking page correctly"""
+        by_price = self.collect({'page_size': 2, 'ordering': 'price'})
+        self.assertEqual(len(by_price), len(self.properties))
+        self.assertEqual(len(set(by_price)), len(self.properties))
+
+        by_rank = self.collect({'page_size': 2, 'search': 'garden'})
+        self.assertEqual(len(by_rank), len(set(by_rank)))
+        self.assertEqual(sorted(by_rank), sorted(p.id for p in self.properties))
+
+    def test_count_is_optional(self):
+        """Test that the total is only computed when requested"""
+        response = self.client.get(self.list_url)
+        self.assertNotIn('count', response.data)
+
+        response = self.client.get(self.list_url, {'count': 'exact'})
+        self.assertEqual(response.data['count'], len(self.properties))
+
+        response = self.client.get(self.list_url, {'count': 'estimate'})
+        self.assertIsInstance(response.data['count'], int)
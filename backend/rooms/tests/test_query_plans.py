@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from rooms.management.commands.explain_property_queries import QUERY_MATRIX, find_seq_scans
+from rooms.models import Property, Room
+
+
+class ExplainPropertyQueriesTests(TestCase):
+    def test_find_seq_scans_walks_plan_tree(self):
+        """Test that seq scans are found in nested plan nodes for the given table only"""
+        plan = {
+            'Node Type': 'Limit',
+            'Plans': [
+                {'Node Type': 'Sort', 'Plans': [
+                    {'Node Type': 'Seq Scan', 'Relation Name': 'rooms_property'},
+                ]},
+                {'Node Type': 'Seq Scan', 'Relation Name': 'auth_user'},
+                {'Node Type': 'Index Scan', 'Relation Name': 'rooms_property'},
+            ],
+        }
+        scans = find_seq_scans(plan, 'rooms_property')
+        self.assertEqual(len(scans), 1)
+        self.assertEqual(scans[0]['Relation Name'], 'rooms_property')
+
+    def test_command_reports_every_combination(self):
+        """Test that the command explains each query in the matrix"""
+        out = StringIO()
+        call_command('explain_property_queries', stdout=out)
+        output = out.getvalue()
+        for label, _, _ in QUERY_MATRIX:
+            self.assertIn(label, output)
+        self.assertIn(f'Explained {len(QUERY_MATRIX)} queries', output)
+
+    def test_seeded_rows_are_rolled_back(self):
+        """Test that --seed explains against seeded properties and rooms and leaves none behind"""
+        out = StringIO()
+        call_command('explain_property_queries', seed=200, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Seeded 200 properties', output)
+        self.assertIn('rooms_property: 200 rows', output)
+        self.assertIn(f'Explained {len(QUERY_MATRIX)} queries', output)
+        self.assertFalse(Property.objects.exists())
+        self.assertFalse(Room.objects.exists())
@@ -0,0 +1,118 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import LandlordReview, Property, PropertyReview
+
+User = get_user_model()
+
+
+class RatingAggregateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.tenants = []
+        for n in range(3):
+            tenant = User.objects.create_user(email=f'tenant{n}@example.com', password='testpass123')
+            UserProfile.objects.create(user=tenant, user_type='tenant')
+            self.tenants.append(tenant)
+        self.property = self.create_property()
+
+    def create_property(self):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def review(self, tenant, rating, property_obj=None):
+        return PropertyReview.objects.create(
+            property=property_obj or self.property, tenant=tenant, rating=rating, comment='Review'
+        )
+
+    def aggregates(self, obj):
+        obj.refresh_from_db()
+        return (obj.review_count, obj.rating_sum, obj.average_rating,
+                [getattr(obj, f'ratings_{star}') for star in range(1, 6)])
+
+    def test_property_review_writes_adjust_counters(self):
+        """Test that creating, editing and deleting reviews keeps the counters exact"""
+        first = self.review(self.tenants[0], 4)
+        self.review(self.tenants[1], 4)
+        self.review(self.tenants[2], 5)
+        self.assertEqual(self.aggregates(self.property), (3, 13, Decimal('4.33'), [0, 0, 0, 2, 1]))
+
+        first.rating = 1
+        first.save()
+        self.assertEqual(self.aggregates(self.property), (3, 10, Decimal('3.33'), [1, 0, 0, 1, 1]))
+
+        first.delete()
+        self.assertEqual(self.aggregates(self.property), (2, 9, Decimal('4.50'), [0, 0, 0, 1, 1]))
+
+        PropertyReview.objects.filter(property=self.property).delete()
+        self.assertEqual(self.aggregates(self.property), (0, 0, None, [0, 0, 0, 0, 0]))
+
+    def test_landlord_review_writes_adjust_profile(self):
+        """Test that landlord ratings are read from the profile without aggregating reviews"""
+        LandlordReview.objects.create(landlord=self.landlord, tenant=self.tenants[0], rating=5, comment='Great')
+        LandlordReview.objects.create(landlord=self.landlord, tenant=self.tenants[1], rating=2, comment='Slow')
+
+        profile = UserProfile.objects.get(user=self.landlord)
+        with self.assertNumQueries(0):
+            self.assertEqual(profile.get_average_rating(), 3.5)
+        self.assertEqual(self.aggregates(profile)[3], [0, 1, 0, 0, 1])
+
+    def test_stale_save_keeps_counters(self):
+        """Test that saving an instance loaded before a review doesn't overwrite its rating counters"""
+        stale_property = Property.objects.get(pk=self.property.pk)
+        stale_profile = UserProfile.objects.get(user=self.landlord)
+        self.review(self.tenants[0], 4)
+        LandlordReview.objects.create(landlord=self.landlord, tenant=self.tenants[0], rating=5, comment='Great')
+
+        stale_property.title = 'Renamed'
+        stale_property.save()
+        stale_profile.bio = 'Updated'
+        stale_profile.save()
+
+        self.assertEqual(self.aggregates(self.property), (1, 4, Decimal('4.00'), [0, 0, 0, 1, 0]))
+        self.assertEqual(self.property.title, 'Renamed')
+        self.assertEqual(self.aggregates(stale_profile), (1, 5, Decimal('5.00'), [0, 0, 0, 0, 1]))
+        self.assertEqual(stale_profile.bio, 'Updated')
+
+    def test_recompute_ratings_repairs_counters(self):
+        """Test that recompute_ratings rebuilds drifted aggregates from the reviews"""
+        self.review(self.tenants[0], 3)
+        LandlordReview.objects.create(landlord=self.landlord, tenant=self.tenants[0], rating=4, comment='Fine')
+        Property.objects.filter(pk=self.property.pk).update(review_count=7, rating_sum=1, ratings_3=0)
+        UserProfile.objects.filter(user=self.landlord).update(review_count=0, average_rating=None)
+
+        call_command('recompute_ratings', stdout=StringIO())
+
+        self.assertEqual(self.aggregates(self.property), (1, 3, Decimal('3.00'), [0, 0, 1, 0, 0]))
+        self.assertEqual(self.aggregates(UserProfile.objects.get(user=self.landlord))[:3], (1, 4, Decimal('4.00')))
+
+    def test_rating_sort_and_filter(self):
+        """Test that listings sort by rating, unrated last, and filter on min_rating"""
+        unrated = self.create_property()
+        low = self.create_property()
+        self.review(self.tenants[0], 5)
+        self.review(self.tenants[0], 2, property_obj=low)
+
+        response = self.client.get(reverse('property-list-create'), {'ordering': '-rating'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.property.id, low.id, unrated.id])
+
+        response = self.client.get(reverse('property-list-create'), {'min_rating': '3'})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.property.id])
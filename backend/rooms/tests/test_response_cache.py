@@ -0,0 +1,113 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.cache import PROPERTIES, bump_generation, get_generation, property_namespace
+from rooms.models import Favorite, Property, PropertyImage
+from rooms.view_tracking import flush_views
+
+User = get_user_model()
+
+
+@override_settings(SHARED_CACHE=True)
+class PropertyResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(flush_views)
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        self.list_url = reverse('property-list-create')
+        self.detail_url = reverse('property-detail', args=[self.property.id])
+
+    def test_anonymous_list_served_from_cache(self):
+        """Test that repeated anonymous listings skip the database until a write"""
+        self.client.get(self.list_url, {'bedrooms': 1})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, {'bedrooms': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PropertyImage.objects.create(property=self.property, image='property_images/a.jpg', is_primary=True)
+        response = self.client.get(self.list_url, {'bedrooms': 1})
+        self.assertIsNotNone(response.data['results'][0]['primary_image'])
+
+    def test_detail_cached_per_user_favorites(self):
+        """Test that is_favorited is never shared between users or left stale"""
+        self.client.force_authenticate(user=self.tenant)
+        self.assertFalse(self.client.get(self.detail_url).data['is_favorited'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Favorite.objects.create(tenant=self.tenant, property=self.property)
+        self.assertTrue(self.client.get(self.detail_url).data['is_favorited'])
+
+        self.client.force_authenticate(user=None)
+        self.assertFalse(self.client.get(self.detail_url).data['is_favorited'])
+
+    def test_writes_bump_generations_on_commit(self):
+        """Test that writes orphan cached responses once they commit, not before, when a read could re-cache old data"""
+        namespaces = (PROPERTIES, property_namespace(self.property.id))
+        before = [get_generation(namespace) for namespace in namespaces]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.property.title = 'Renamed'
+            self.property.save()
+            self.assertEqual([get_generation(namespace) for namespace in namespaces], before)
+
+        self.assertTrue(all(get_generation(n) != generation for n, generation in zip(namespaces, before)))
+
+    def test_stats(self):
+        """Test that hits and misses are counted and exposed to admins"""
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+
+        admin = User.objects.create_superuser(email='admin@example.com', password='testpass123')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse('property-cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['hits'], response.data['misses']), (1, 1))
+
+    def test_bump_through_another_cache_client_invalidates(self):
+        """Test that a write handled by another worker, bumping through its own cache client, invalidates cached responses"""
+        self.client.get(self.detail_url)
+        # Changed without signals, as if by another process
+        Property.objects.filter(pk=self.property.pk).update(title='Renamed')
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'Test Property')
+
+        # A separate client of the same store, like another worker's Redis connection
+        other_worker = LocMemCache('', {})
+        with mock.patch('rooms.cache.cache', other_worker):
+            bump_generation(PROPERTIES)
+
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'Renamed')
+
+    @override_settings(SHARED_CACHE=False)
+    def test_not_cached_without_shared_cache(self):
+        """Test that responses aren't cached in a per-process cache other workers can't invalidate"""
+        self.client.get(self.detail_url)
+        self.client.get(self.list_url)
+        Property.objects.filter(pk=self.property.pk).update(title='Renamed')
+
+        self.assertEqual(self.client.get(self.detail_url).data['title'], 'Renamed')
+        self.assertEqual(self.client.get(self.list_url).data['results'][0]['title'], 'Renamed')
@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import LandlordReview, Property, PropertyReview
+
+User = get_user_model()
+
+
+class ReviewListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        self.url = reverse('property-reviews', args=[self.property.id])
+
+    def add_reviews(self, count, rating=4):
+        for n in range(count):
+            tenant = User.objects.create_user(
+                email=f'tenant{n}-{rating}@example.com', password='testpass123', first_name='Ada', last_name=str(n)
+            )
+            PropertyReview.objects.create(property=self.property, tenant=tenant, rating=rating, comment='Review')
+            LandlordReview.objects.create(landlord=self.landlord, tenant=tenant, rating=rating, comment='Review')
+
+    def page_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(ctx.captured_queries)
+
+    def test_page_cost_does_not_grow_with_reviews(self):
+        """Test that tenants are selected with the reviews instead of per row"""
+        self.add_reviews(2)
+        _, few = self.page_queries(self.url)
+        self.add_reviews(8, rating=5)
+        response, many = self.page_queries(self.url)
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertTrue(response.data['results'][0]['tenant_name'].startswith('Ada'))
+
+    def test_summary_histogram(self):
+        """Test that every page carries the average, count and per-star histogram"""
+        self.add_reviews(3, rating=4)
+        self.add_reviews(1, rating=2)
+
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        summary = response.data['summary']
+        self.assertEqual(summary['review_count'], 4)
+        self.assertEqual(summary['average_rating'], Decimal('3.50'))
+        self.assertEqual(summary['histogram'], {'1': 0, '2': 1, '3': 0, '4': 3, '5': 0})
+
+        response = self.client.get(reverse('landlord-reviews', args=[self.landlord.id]))
+        self.assertEqual(response.data['summary']['histogram']['4'], 3)
+
+    def test_unknown_property_is_404(self):
+        """Test that reviews of a missing property are a 404 rather than an empty page"""
+        response = self.client.get(reverse('property-reviews', args=[self.property.id + 1000]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_non_landlord_reviews_are_404(self):
+        """Test that landlord reviews are only listed for users with a landlord profile"""
+        tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=tenant, user_type='tenant')
+        response = self.client.get(reverse('landlord-reviews', args=[tenant.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
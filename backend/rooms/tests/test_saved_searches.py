@@ -0,0 +1,182 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Property, SavedSearch, SavedSearchMatch
+from rooms.saved_searches import SavedSearchIndex, normalize_search_params
+
+User = get_user_model()
+
+
+@patch('rooms.saved_searches.send_notification')
+class SavedSearchMatchingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        self.other_tenant = User.objects.create_user(email='other@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+        UserProfile.objects.create(user=self.other_tenant, user_type='tenant')
+
+    def save_search(self, tenant, **params):
+        return SavedSearch.objects.create(tenant=tenant, params=normalize_search_params(params))
+
+    def create_property(self, **kwargs):
+        data = {
+            'landlord': self.landlord,
+            'title': 'Test Property',
+            'property_type': 'apartment',
+            'location': 'Lekki Phase 1',
+            'address': '1 Test Street',
+            'price': Decimal('1000.00'),
+            'area_sqft': 800,
+            'description': 'Test Description',
+        }
+        data.update(kwargs)
+        with self.captureOnCommitCallbacks(execute=True):
+            return Property.objects.create(**data)
+
+    def test_new_listing_matches_and_notifies(self, send_notification):
+        """Test that a new listing is matched only to the searches it satisfies"""
+        matching = self.save_search(self.tenant, property_type='apartment', location='lekki', max_price='1500')
+        self.save_search(self.tenant, property_type='house')
+        self.save_search(self.other_tenant, min_price='2000')
+
+        property_obj = self.create_property()
+
+        self.assertEqual(
+            list(SavedSearchMatch.objects.values_list('saved_search_id', 'property_id')),
+            [(matching.id, property_obj.id)]
+        )
+        send_notification.assert_called_once()
+        self.assertEqual(send_notification.call_args.args[0], self.tenant.id)
+        self.assertEqual(send_notification.call_args.kwargs['data']['matches'][0]['property_id'], property_obj.id)
+
+    def test_listing_becoming_available_is_matched_once(self, send_notification):
+        """Test that availability changes trigger matching without repeat notifications"""
+        self.save_search(self.tenant, bedrooms='1')
+        property_obj = self.create_property(status='rented')
+        send_notification.assert_not_called()
+
+        property_obj.status = 'available'
+        with self.captureOnCommitCallbacks(execute=True):
+            property_obj.save()
+        self.assertEqual(SavedSearchMatch.objects.count(), 1)
+
+        for new_status in ('rented', 'available'):
+            property_obj.status = new_status
+            with self.captureOnCommitCallbacks(execute=True):
+                property_obj.save()
+        self.assertEqual(SavedSearchMatch.objects.count(), 1)
+        send_notification.assert_called_once()
+
+    def test_listings_saved_together_are_matched_in_one_batch(self, send_notification):
+        """Test that one transaction yields one notification per tenant"""
+        self.save_search(self.tenant, location='lekki')
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for number in range(3):
+                    Property.objects.create(
+                        landlord=self.landlord, title=f'Flat {number}', location='Lekki',
+                        address=f'{number} Test Street', price=Decimal('900.00'),
+                        area_sqft=500, description='Test',
+                    )
+
+        self.assertEqual(SavedSearchMatch.objects.count(), 3)
+        send_notification.assert_called_once()
+        self.assertEqual(len(send_notification.call_args.kwargs['data']['matches']), 3)
+
+    def test_rolled_back_listings_are_not_matched(self, send_notification):
+        """Test that listings saved in a rolled back savepoint never reach a later batch"""
+        with patch('rooms.saved_searches.match_listings') as match_listings:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    kept = Property.objects.create(
+                        landlord=self.landlord, title='Kept', location='Lekki', address='1 Test Street',
+                        price=Decimal('900.00'), area_sqft=500, description='Test',
+                    )
+                    with transaction.atomic():
+                        Property.objects.create(
+                            landlord=self.landlord, title='Rolled back', location='Lekki', address='2 Test Street',
+                            price=Decimal('900.00'), area_sqft=500, description='Test',
+                        )
+                        transaction.set_rollback(True)
+            later = self.create_property()
+
+        self.assertEqual([set(call.args[0]) for call in match_listings.call_args_list], [{kept.id}, {later.id}])
+
+    def test_inactive_searches_are_skipped(self, send_notification):
+        """Test that paused searches are not matched"""
+        search = self.save_search(self.tenant, property_type='apartment')
+        search.is_active = False
+        search.save()
+
+        self.create_property()
+        self.assertFalse(SavedSearchMatch.objects.exists())
+
+    def test_index_narrows_candidates(self, send_notification):
+        """Test that the inverted index only returns searches sharing the listing's keys"""
+        searches = [
+            self.save_search(self.tenant, property_type='apartment', min_price='500', max_price='1500'),
+            self.save_search(self.tenant, property_type='house'),
+            self.save_search(self.tenant, min_price='5000'),
+            self.save_search(self.tenant, location='ikeja'),
+            self.save_search(self.tenant, location='phase'),
+        ]
+        listing = Property(property_type='apartment', price=Decimal('1000.00'),
+                           location='Lekki Phase 1', address='1 Test Street')
+
+        candidates = SavedSearchIndex(searches).candidates(listing)
+        self.assertEqual({search.id for search in candidates}, {searches[0].id, searches[4].id})
+
+    def test_saved_search_api_normalizes_params(self, send_notification):
+        """Test that tenants save normalized filters and bad ones are rejected"""
+        self.client.force_authenticate(user=self.tenant)
+        url = reverse('saved-searches')
+
+        response = self.client.post(url, {
+            'name': 'Lekki flats',
+            'params': {'location': '  Lekki ', 'max_price': '1500', 'furnished': 'true', 'property_type': ''},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['params'], {'location': 'lekki', 'max_price': '1500.00', 'furnished': True})
+        self.assertEqual(SavedSearch.objects.get().max_price, Decimal('1500.00'))
+
+        response = self.client.post(url, {'params': {'ordering': 'price'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class SavedSearchTransactionTests(TransactionTestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+
+    def create_property(self, title):
+        return Property.objects.create(
+            landlord=self.landlord, title=title, location='Lekki', address='1 Test Street',
+            price=Decimal('900.00'), area_sqft=500, description='Test',
+        )
+
+    def test_listing_after_rolled_back_transaction_is_matched(self):
+        """Test that a rolled back transaction does not swallow listings of the next one"""
+        with patch('rooms.saved_searches.match_listings') as match_listings:
+            with transaction.atomic():
+                self.create_property('Rolled back')
+                transaction.set_rollback(True)
+            with transaction.atomic():
+                first = self.create_property('First')
+                second = self.create_property('Second')
+
+        self.assertEqual([set(call.args[0]) for call in match_listings.call_args_list], [{first.id, second.id}])
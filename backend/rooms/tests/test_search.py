@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Property
+
+User = get_user_model()
+
+
+class PropertySearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.list_url = reverse('property-list-create')
+
+    def create_property(self, title, location='Abuja', description='A quiet home'):
+        return Property.objects.create(
+            landlord=self.landlord,
+            title=title,
+            location=location,
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description=description,
+        )
+
+    def test_results_ordered_by_rank(self):
+        """Test that title matches outrank description matches"""
+        in_description = self.create_property('Family home', description='Close to the lagoon')
+        in_title = self.create_property('Lagoon view apartment')
+        self.create_property('Unrelated')
+
+        response = self.client.get(self.list_url, {'search': 'lagoon'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        ids = [row['id'] for row in response.data['results']]
+        self.assertEqual(ids, [in_title.id, in_description.id])
+        self.assertIn('<mark>Lagoon</mark>', response.data['results'][0]['title_headline'])
+        self.assertIn('<mark>lagoon</mark>', response.data['results'][1]['description_headline'])
+
+    def test_vector_follows_bulk_updates(self):
+        """Test that queryset.update() keeps the search vector current"""
+        property_obj = self.create_property('Old title')
+        Property.objects.filter(pk=property_obj.pk).update(title='Penthouse suite')
+
+        response = self.client.get(self.list_url, {'search': 'penthouse'})
+        self.assertEqual([row['id'] for row in response.data['results']], [property_obj.id])
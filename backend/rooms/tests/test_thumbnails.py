@@ -0,0 +1,177 @@
+import os
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from core.tests.mixins import TemporaryMediaMixin
+from rooms import thumbnails
+from rooms.models import Property, PropertyImage
+from rooms.thumbnails import ThumbnailCache, get_thumbnail_cache
+
+from .test_image_variants import jpeg_upload
+
+User = get_user_model()
+
+
+@override_settings(PROPERTY_THUMBNAIL_SIZES=[(320, 320), (800, 800)])
+class ThumbnailTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        thumbnail_dir = override_settings(PROPERTY_THUMBNAIL_CACHE_DIR=os.path.join(self.media_root, 'thumbnails'))
+        thumbnail_dir.enable()
+        self.addCleanup(thumbnail_dir.disable)
+
+        self.client = APIClient()
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        # Created directly, as older uploads were: original only, no variants
+        self.image = PropertyImage.objects.create(
+            property=self.property, image=jpeg_upload(size=(2000, 1000)), is_primary=True
+        )
+
+    def thumbnail(self, size='320x320', image_id=None, **headers):
+        width, height = size.split('x')
+        url = reverse('property-image-thumbnail', args=[width, height, image_id or self.image.id])
+        return self.client.get(url, **headers)
+
+    def test_thumbnail_built_on_demand(self):
+        """Test that the first request resizes the original to fit the box"""
+        response = self.thumbnail()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        picture = Image.open(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(picture.size, (320, 160))
+
+    def test_cached_thumbnail_not_rebuilt(self):
+        """Test that later requests are served from the disk cache"""
+        self.thumbnail()
+        with mock.patch('rooms.thumbnails.resize_image') as resize:
+            response = self.thumbnail()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        resize.assert_not_called()
+
+    def test_etag_revalidation(self):
+        """Test that a matching If-None-Match gets a 304 without building anything"""
+        etag = self.thumbnail()['ETag']
+        with mock.patch('rooms.thumbnails.resize_image') as resize:
+            response = self.thumbnail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        resize.assert_not_called()
+
+    def test_unsupported_size_or_image(self):
+        """Test that only configured sizes of existing images are served"""
+        self.assertEqual(self.thumbnail('321x320').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.thumbnail(image_id=self.image.id + 1000).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_listing_uses_thumbnail_for_unprocessed_images(self):
+        """Test that listing cards get a card-sized thumbnail instead of the original"""
+        response = self.client.get(reverse('property-list-create'))
+        self.assertTrue(
+            response.data['results'][0]['primary_image'].endswith(f'/media/thumb/800x800/{self.image.id}/')
+        )
+
+    def test_concurrent_requests_coalesced(self):
+        """Test that concurrent requests for one thumbnail share a single resize"""
+        cache = get_thumbnail_cache()
+        resize = thumbnails.resize_image
+        calls = []
+
+        def slow_resize(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.2)
+            return resize(*args, **kwargs)
+
+        paths = []
+        with mock.patch('rooms.thumbnails.resize_image', slow_resize):
+            workers = [
+                threading.Thread(target=lambda: paths.append(cache.get(self.image.image, 320, 320)))
+                for _ in range(5)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(paths), 5)
+        self.assertEqual(len(set(paths)), 1)
+
+    def test_least_recently_served_evicted(self):
+        """Test that the cache stays under its limit by dropping the least recently served thumbnails"""
+        images = [self.image] + [
+            PropertyImage.objects.create(property=self.property, image=jpeg_upload(size=(900 + n, 600)))
+            for n in range(2)
+        ]
+        probe = ThumbnailCache(tempfile.mkdtemp(dir=self.image.image.storage.location), 10 ** 9)
+        size = os.path.getsize(probe.get(images[0].image, 320, 320))
+
+        cache = ThumbnailCache(os.path.join(self.image.image.storage.location, 'lru'), int(size * 2.5))
+        first, second = [cache.get(image.image, 320, 320) for image in images[:2]]
+        os.utime(first, (1, 1))
+        os.utime(second, (2, 2))
+        cache.get(images[0].image, 320, 320)  # served again: now the most recent
+
+        third = cache.get(images[2].image, 320, 320)
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+        self.assertTrue(os.path.exists(third))
+
+    def test_thumbnail_evicted_before_opening_is_rebuilt(self):
+        """Test that a thumbnail evicted between its lookup and opening it is built again and served"""
+        cache = get_thumbnail_cache()
+        get = cache.get
+        lookups = []
+
+        def get_then_evict(*args):
+            path = get(*args)
+            if not lookups:
+                os.remove(path)
+            lookups.append(path)
+            return path
+
+        with mock.patch.object(cache, 'get', get_then_evict):
+            response = self.thumbnail()
+
+        self.assertEqual(len(lookups), 2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Image.open(BytesIO(b''.join(response.streaming_content))).size, (320, 160))
+
+    def test_limit_covers_every_process_sharing_the_directory(self):
+        """Test that one process's writes count toward another's eviction of the shared directory"""
+        images = [self.image] + [
+            PropertyImage.objects.create(property=self.property, image=jpeg_upload(size=(900 + n, 600)))
+            for n in range(2)
+        ]
+        probe = ThumbnailCache(tempfile.mkdtemp(dir=self.image.image.storage.location), 10 ** 9)
+        size = os.path.getsize(probe.get(images[0].image, 320, 320))
+
+        directory = os.path.join(self.image.image.storage.location, 'shared')
+        worker, other_worker = (ThumbnailCache(directory, int(size * 2.5)) for _ in range(2))
+        worker.get(images[0].image, 320, 320)
+        other_worker.get(images[1].image, 320, 320)
+        worker.get(images[2].image, 320, 320)
+
+        self.assertLessEqual(sum(entry[1] for entry in worker._entries()), size * 2.5)
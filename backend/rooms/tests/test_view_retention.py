@@ -0,0 +1,84 @@
+import csv
+import gzip
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from rooms.analytics import rollup_property_views
+from rooms.models import Property, PropertyView, PropertyViewDaily
+from rooms.retention import archive_property_views
+
+User = get_user_model()
+
+
+class PropertyViewRetentionTests(TestCase):
+    def setUp(self):
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        self.property = Property.objects.create(
+            landlord=self.landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+
+    def view(self, days_ago, ip='127.0.0.1'):
+        return PropertyView.objects.create(
+            property=self.property, ip_address=ip, viewed_at=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def read_archive(self, path):
+        with gzip.open(path, 'rt', newline='') as archive:
+            return list(csv.DictReader(archive))
+
+    def test_old_views_are_archived_in_batches(self):
+        """Test that rolled up views past retention move to a CSV.gz archive"""
+        old = [self.view(days_ago) for days_ago in (40, 40, 35)]
+        recent = self.view(2)
+        rollup_property_views()
+
+        archived, path = archive_property_views(30, archive_dir=self.archive_dir.name, batch_size=2)
+
+        self.assertEqual(archived, 3)
+        self.assertEqual(list(PropertyView.objects.values_list('id', flat=True)), [recent.id])
+        rows = self.read_archive(path)
+        self.assertEqual([int(row['id']) for row in rows], [view.id for view in old])
+        self.assertEqual(rows[0]['ip_address'], '127.0.0.1')
+        # Rollups of archived days are kept
+        self.assertEqual(PropertyViewDaily.objects.filter(property=self.property).count(), 3)
+
+    def test_views_not_rolled_up_are_kept(self):
+        """Test that days with views the rollup has not seen yet are not archived"""
+        self.view(40)
+        rollup_property_views()
+        pending = self.view(50)
+
+        archived, _ = archive_property_views(30, archive_dir=self.archive_dir.name)
+
+        self.assertEqual(archived, 0)
+        self.assertTrue(PropertyView.objects.filter(pk=pending.pk).exists())
+
+    def test_command_appends_to_archive(self):
+        """Test that repeated runs append to the same archive with one header"""
+        self.view(40)
+        rollup_property_views()
+        call_command('archive_property_views', days=30, archive_dir=self.archive_dir.name, stdout=StringIO())
+
+        self.view(40, ip='10.0.0.1')
+        rollup_property_views()
+        _, path = archive_property_views(30, archive_dir=self.archive_dir.name)
+
+        self.assertEqual([row['ip_address'] for row in self.read_archive(path)], ['127.0.0.1', '10.0.0.1'])
+        self.assertFalse(PropertyView.objects.exists())
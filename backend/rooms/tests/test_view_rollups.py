@@ -0,0 +1,149 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.analytics import landlord_view_stats, rollup_property_views
+from rooms.hyperloglog import HyperLogLog
+from rooms.models import Property, PropertyView, PropertyViewDaily
+
+User = get_user_model()
+
+
+class PropertyViewRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.other_landlord = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.other_landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+
+        self.property = self.create_property(self.landlord)
+        self.now = timezone.now()
+
+    def create_property(self, landlord):
+        return Property.objects.create(
+            landlord=landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def view(self, property_obj, viewer=None, ip='127.0.0.1', days_ago=0):
+        return PropertyView.objects.create(
+            property=property_obj, viewer=viewer, ip_address=ip,
+            viewed_at=self.now - timedelta(days=days_ago),
+        )
+
+    def rollup(self, day_offset=0):
+        return PropertyViewDaily.objects.get(
+            property=self.property, day=timezone.localdate(self.now - timedelta(days=day_offset))
+        )
+
+    def test_rollup_counts_views_and_distinct_viewers(self):
+        """Test that a day's rollup counts views, unique and signed-in viewers"""
+        self.view(self.property, viewer=self.tenant)
+        self.view(self.property, viewer=self.tenant)
+        self.view(self.property, ip='10.0.0.1')
+        self.view(self.property, ip='10.0.0.2')
+        self.view(self.property, ip='10.0.0.2', days_ago=1)
+
+        self.assertEqual(rollup_property_views(), 5)
+
+        today = self.rollup()
+        self.assertEqual((today.views, today.unique_viewers, today.authenticated_viewers), (4, 3, 1))
+        self.assertEqual(self.rollup(1).views, 1)
+
+    def test_rollup_is_incremental(self):
+        """Test that only rows past the watermark are read and touched days are recounted"""
+        self.view(self.property, viewer=self.tenant)
+        rollup_property_views()
+
+        self.view(self.property, viewer=self.tenant)
+        self.view(self.property, ip='10.0.0.9')
+        self.assertEqual(rollup_property_views(), 2)
+        self.assertEqual(rollup_property_views(), 0)
+
+        today = self.rollup()
+        self.assertEqual((today.views, today.unique_viewers, today.authenticated_viewers), (3, 2, 1))
+
+    def test_range_counts_returning_viewers_once(self):
+        """Test that unique viewers over several days merge the daily sketches"""
+        second_property = self.create_property(self.landlord)
+        for days_ago in range(3):
+            self.view(self.property, viewer=self.tenant, days_ago=days_ago)
+            self.view(second_property, viewer=self.tenant, days_ago=days_ago)
+        self.view(self.property, ip='10.0.0.1', days_ago=1)
+        rollup_property_views()
+
+        self.assertTrue(self.rollup().viewer_sketch)
+        end = timezone.localdate(self.now)
+        stats = landlord_view_stats(self.landlord, end - timedelta(days=6), end)
+        self.assertEqual(stats['totals'], {'views': 7, 'unique_viewers': 2, 'authenticated_viewers': 1})
+        self.assertEqual(stats['daily'][-2]['unique_viewers'], 2)
+        by_property = {row['property_id']: row['unique_viewers'] for row in stats['properties']}
+        self.assertEqual(by_property, {self.property.id: 2, second_property.id: 1})
+
+    def test_landlord_analytics_endpoint(self):
+        """Test that landlords get a zero-filled daily series of their own properties"""
+        other_property = self.create_property(self.other_landlord)
+        self.view(self.property, viewer=self.tenant)
+        self.view(self.property, ip='10.0.0.1', days_ago=2)
+        self.view(other_property, viewer=self.tenant)
+        call_command('rollup_property_views', verbosity=0)
+
+        self.client.force_authenticate(user=self.landlord)
+        response = self.client.get(reverse('landlord-view-analytics'), {'days': 7})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['daily']), 7)
+        self.assertEqual(response.data['totals']['views'], 2)
+        self.assertEqual([row['views'] for row in response.data['daily'][-3:]], [1, 0, 1])
+        self.assertEqual([row['property_id'] for row in response.data['properties']], [self.property.id])
+
+        response = self.client.get(reverse('landlord-view-analytics'), {'property': other_property.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_analytics_requires_landlord(self):
+        """Test that tenants cannot read landlord analytics"""
+        self.client.force_authenticate(user=self.tenant)
+        response = self.client.get(reverse('landlord-view-analytics'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_estimate_is_within_error_bounds(self):
+        """Test that estimates stay within a few standard errors of the exact count"""
+        for count in (10, 1000, 50000):
+            estimate = HyperLogLog.from_keys(f'ip:{n}' for n in range(count)).count()
+            self.assertLess(abs(estimate - count) / count, 0.05)
+
+    def test_merge_counts_the_union(self):
+        """Test that merged sketches estimate the union of their keys"""
+        first = HyperLogLog.from_keys(range(0, 3000))
+        second = HyperLogLog.from_keys(range(2000, 5000))
+        merged = HyperLogLog().merge_bytes(first.to_bytes()).merge_bytes(second.to_bytes())
+        self.assertEqual(merged.count(), HyperLogLog.from_keys(range(5000)).count())
+        self.assertEqual(merged.registers, HyperLogLog.from_keys(range(5000)).registers)
+
+    def test_serialization_round_trip(self):
+        """Test that sparse and dense sketches survive serialization"""
+        small = HyperLogLog.from_keys(['user:1', 'user:2'])
+        large = HyperLogLog.from_keys(range(20000))
+        self.assertEqual(len(small.to_bytes()), 8)
+        self.assertEqual(HyperLogLog.from_bytes(small.to_bytes()).registers, small.registers)
+        self.assertEqual(HyperLogLog.from_bytes(large.to_bytes()).registers, large.registers)
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge_bytes(large.to_bytes())
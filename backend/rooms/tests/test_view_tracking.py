@@ -0,0 +1,137 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from rooms.models import Property, PropertyView
+from rooms.view_tracking import RedisViewBuffer, _flush_at_exit, flush_views, get_buffer, record_view
+
+User = get_user_model()
+
+
+@override_settings(PROPERTY_VIEW_FLUSH_INTERVAL=3600, PROPERTY_VIEW_FLUSH_SIZE=1000)
+class PropertyViewTrackingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        flush_views()
+        self.addCleanup(flush_views)
+
+        self.landlord = User.objects.create_user(email='landlord@example.com', password='testpass123')
+        self.other_landlord = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.tenant = User.objects.create_user(email='tenant@example.com', password='testpass123')
+        UserProfile.objects.create(user=self.landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.other_landlord, user_type='landlord')
+        UserProfile.objects.create(user=self.tenant, user_type='tenant')
+
+        self.property = self.create_property(self.landlord)
+
+    def create_property(self, landlord):
+        return Property.objects.create(
+            landlord=landlord,
+            title='Test Property',
+            location='Lagos',
+            address='1 Test Street',
+            price=Decimal('1000.00'),
+            area_sqft=800,
+            description='Test Description',
+        )
+
+    def profile_views(self, user):
+        return UserProfile.objects.get(user=user).total_property_views
+
+    def test_detail_get_does_not_write(self):
+        """Test that viewing a property only buffers the view"""
+        url = reverse('property-detail', args=[self.property.id])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        writes = [q['sql'] for q in ctx.captured_queries if not q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertEqual(writes, [])
+        self.assertEqual(PropertyView.objects.count(), 0)
+        self.assertEqual(len(get_buffer()), 2)
+
+    def test_flush_writes_views_and_landlord_totals(self):
+        """Test that a flush bulk inserts views and increments landlord totals"""
+        second_property = self.create_property(self.landlord)
+        other_property = self.create_property(self.other_landlord)
+        for property_id in (self.property.id, self.property.id, second_property.id, other_property.id):
+            record_view(property_id, self.tenant.id, '127.0.0.1')
+        record_view(other_property.id, None, '10.0.0.1')
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(flush_views(), 5)
+        # Property lookup, bulk INSERT and one UPDATE per distinct increment
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+
+        self.assertEqual(PropertyView.objects.filter(property=self.property).count(), 2)
+        self.assertEqual(PropertyView.objects.filter(viewer__isnull=True).count(), 1)
+        self.assertEqual(self.profile_views(self.landlord), 3)
+        self.assertEqual(self.profile_views(self.other_landlord), 2)
+        self.assertEqual(len(get_buffer()), 0)
+
+    def test_views_of_deleted_properties_are_dropped(self):
+        """Test that buffered views for a deleted property do not break the flush"""
+        doomed = self.create_property(self.landlord)
+        record_view(doomed.id, None, '127.0.0.1')
+        record_view(self.property.id, None, '127.0.0.1')
+        doomed.delete()
+
+        self.assertEqual(flush_views(), 1)
+        self.assertEqual(self.profile_views(self.landlord), 1)
+
+    @override_settings(PROPERTY_VIEW_FLUSH_SIZE=2)
+    def test_full_buffer_flushes_after_response(self):
+        """Test that a full buffer is written once the request has finished"""
+        url = reverse('property-detail', args=[self.property.id])
+        self.client.get(url)
+        self.assertEqual(PropertyView.objects.count(), 0)
+
+        self.client.get(url)
+        self.assertEqual(PropertyView.objects.count(), 2)
+        self.assertEqual(self.profile_views(self.landlord), 2)
+
+    def test_flush_command(self):
+        """Test that flush_property_views drains the buffer"""
+        record_view(self.property.id, self.tenant.id, '127.0.0.1')
+        call_command('flush_property_views', stdout=StringIO())
+        self.assertEqual(PropertyView.objects.count(), 1)
+
+    def test_buffer_flushed_at_exit(self):
+        """Test that views left in a per-process buffer are written when the worker exits"""
+        record_view(self.property.id, self.tenant.id, '127.0.0.1')
+        _flush_at_exit(get_buffer())
+        self.assertEqual(PropertyView.objects.count(), 1)
+
+    def test_exit_flush_skips_switched_database(self):
+        """Test that the exit flush does not write views into another database"""
+        record_view(self.property.id, self.tenant.id, '127.0.0.1')
+        with mock.patch.object(get_buffer(), 'database', 'other'):
+            _flush_at_exit(get_buffer())
+        self.assertEqual(PropertyView.objects.count(), 0)
+        self.assertEqual(len(get_buffer()), 1)
+
+    def test_shared_buffer_checks_length_without_redis(self):
+        """Test that the shared buffer decides flushes from RPUSH replies, not a length query per request"""
+        client = mock.Mock()
+        client.rpush.side_effect = [999, 1000]
+        buffer = RedisViewBuffer(client)
+
+        with mock.patch('rooms.view_tracking.cache') as cache:
+            buffer.push([(self.property.id, None, '127.0.0.1', 0)])
+            self.assertFalse(buffer.flush_due())
+            cache.add.assert_not_called()
+
+            buffer.push([(self.property.id, None, '127.0.0.1', 0)])
+            self.assertTrue(buffer.flush_due())
+        client.llen.assert_not_called()
@@ -0,0 +1,183 @@
+"""
+On-demand thumbnails of property images.
+
+Images uploaded before variants were rendered in the background only have
+their originals. ``/media/thumb/<w>x<h>/<image_id>/`` serves such images
+(or any image) resized to fit within one of PROPERTY_THUMBNAIL_SIZES,
+built on first request with core.image_utils.resize_image.
+
+Built thumbnails are kept in a directory bounded to
+PROPERTY_THUMBNAIL_CACHE_BYTES. Serving a thumbnail refreshes its
+modification time, and once the directory outgrows its limit the least
+recently served files are evicted. Every process sharing the directory
+adds what it writes to the size it last measured, and measures the
+directory again after writing RESCAN_FRACTION of the limit, so the
+directory overshoots its limit by at most that fraction per process
+before someone evicts. Concurrent requests for a thumbnail
+that is still being built wait for that build instead of resizing the
+same image again. Files are moved into place with an atomic rename, so
+other processes never read a partial file.
+"""
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+
+from core.image_utils import output_format, resize_image
+
+logger = logging.getLogger(__name__)
+
+# Thumbnail box used in place of the card variant for unprocessed images;
+# one of PROPERTY_THUMBNAIL_SIZES
+CARD_SIZE = (800, 800)
+# Fraction of the limit that eviction brings the cache back down to, so
+# it doesn't run again on the next write
+EVICTION_TARGET = 0.9
+# Fraction of the limit a process writes before measuring the directory
+# again, to pick up what other processes have written to it
+RESCAN_FRACTION = 0.01
+
+
+class ThumbnailCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Thumbnail path -> Future of the build in progress
+        self._builds = {}
+        # Bytes in the directory when last measured, plus this process's
+        # writes since (_unscanned)
+        self._size = None
+        self._unscanned = 0
+
+    def path(self, image_name, width, height):
+        key = hashlib.sha256(f'{image_name}:{width}x{height}'.encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], f'{key}.{output_format(image_name).lower()}')
+
+    def get(self, image_field, width, height):
+        """
+        Path of the thumbnail of ``image_field`` fitting within ``width`` x
+        ``height``, building it first unless it is cached or being built.
+        """
+        path = self.path(image_field.name, width, height)
+        if self._touch(path):
+            return path
+
+        with self._lock:
+            build = self._builds.get(path)
+            leader = build is None
+            if leader:
+                build = self._builds[path] = Future()
+        if not leader:
+            return build.result()
+
+        try:
+            # Finished by another build since the first check
+            if not self._touch(path):
+                self._build(image_field, width, height, path)
+            build.set_result(path)
+        except Exception as e:
+            build.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._builds[path]
+        return path
+
+    def open(self, image_field, width, height):
+        """
+        The thumbnail (see get) opened for reading. A thumbnail evicted
+        between the lookup and opening it is built again.
+        """
+        try:
+            return open(self.get(image_field, width, height), 'rb')
+        except FileNotFoundError:
+            return open(self.get(image_field, width, height), 'rb')
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _build(self, image_field, width, height, path):
+        with image_field.open('rb'):
+            resized = resize_image(image_field, size=(width, height))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Dot-files are in-progress moves, skipped by size scans
+            partial = os.path.join(os.path.dirname(path), f'.{uuid.uuid4().hex}')
+            file_move_safe(resized.temporary_file_path(), partial)
+            os.replace(partial, path)
+        finally:
+            resized.close()
+        self._added(os.path.getsize(path))
+
+    def _entries(self):
+        """(mtime, size, path) of every cached thumbnail."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _added(self, size):
+        with self._lock:
+            self._unscanned += size
+            rescan = self._size is None or self._unscanned >= self.max_bytes * RESCAN_FRACTION
+            if not rescan:
+                self._size += size
+                over = self._size > self.max_bytes
+        if rescan:
+            total = sum(entry[1] for entry in self._entries())
+            with self._lock:
+                self._size, self._unscanned = total, 0
+            over = total > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """Delete the least recently served thumbnails until the cache is back under its target size."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICTION_TARGET
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._size, self._unscanned = total, 0
+        logger.info(f"Evicted {evicted} thumbnails, {total} bytes left in {self.directory}")
+        return evicted
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    key = (settings.PROPERTY_THUMBNAIL_CACHE_DIR, settings.PROPERTY_THUMBNAIL_CACHE_BYTES)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ThumbnailCache(*key)
+        return _caches[key]
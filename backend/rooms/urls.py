@@ -9,11 +9,19 @@ room_router.register(r'rooms', views.RoomViewSet, basename='room')
 urlpatterns = [
     # Property URLs
     path('properties/', views.PropertyListCreateView.as_view(), name='property-list-create'),
+    path('properties/facets/', views.PropertyFacetsView.as_view(), name='property-facets'),
     path('properties/<int:pk>/', views.PropertyDetailView.as_view(), name='property-detail'),
     path('my-properties/', views.LandlordPropertiesView.as_view(), name='landlord-properties'),
+    path('my-properties/stats/', views.LandlordPropertyStatsView.as_view(), name='landlord-property-stats'),
+    path('my-properties/analytics/', views.LandlordViewAnalyticsView.as_view(), name='landlord-view-analytics'),
+    path('cache-stats/', views.PropertyCacheStatsView.as_view(), name='property-cache-stats'),
+    path('locations/autocomplete/', views.LocationAutocompleteView.as_view(), name='location-autocomplete'),
     
     # Property Images
     path('properties/<int:property_id>/images/', views.PropertyImageUploadView.as_view(), name='property-image-upload'),
+    path('properties/<int:property_id>/images/presign/', views.PropertyImageDirectUploadView.as_view(), name='property-image-presign'),
+    path('properties/<int:property_id>/images/complete/', views.PropertyImageDirectUploadCompleteView.as_view(), name='property-image-complete'),
+    path('media/thumb/<int:width>x<int:height>/<int:image_id>/', views.PropertyImageThumbnailView.as_view(), name='property-image-thumbnail'),
     
     # Property Rooms
     path('properties/<int:property_id>/', include(room_router.urls)),
@@ -26,6 +34,10 @@ urlpatterns = [
     path('favorites/', views.FavoriteListCreateView.as_view(), name='favorites'),
     path('favorites/<int:property_id>/', views.FavoriteDeleteView.as_view(), name='favorite-delete'),
     
+    # Saved searches
+    path('saved-searches/', views.SavedSearchListCreateView.as_view(), name='saved-searches'),
+    path('saved-searches/<int:pk>/', views.SavedSearchDetailView.as_view(), name='saved-search-detail'),
+    
     # Analytics
     path('properties/<int:property_id>/views/', views.PropertyViewListView.as_view(), name='property-views'),
 ]
@@ -0,0 +1,205 @@
+"""
+Write-behind tracking of property detail views.
+
+The detail GET only appends an event to a buffer. Buffered events are
+flushed in bulk: one INSERT of PropertyView rows and one UPDATE per distinct
+increment of the landlords' ``total_property_views`` (``F()`` expressions,
+so concurrent flushes never lose counts).
+
+With the Redis cache backend the buffer is a Redis list shared by every
+worker; otherwise it is a per-process queue. Flushes run after a response
+has been sent (``request_finished``) at most once per
+``PROPERTY_VIEW_FLUSH_INTERVAL`` seconds, or early once
+``PROPERTY_VIEW_FLUSH_SIZE`` events are waiting. ``manage.py
+flush_property_views`` drains a shared buffer on demand.
+
+A shared buffer survives worker restarts. A per-process queue is flushed
+when the interpreter exits; a worker killed outright (SIGKILL, OOM) loses
+the views recorded since its last flush, at most one interval's worth.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import connection, transaction
+from django.db.models import F
+
+from accounts.models import UserProfile
+
+from .models import Property, PropertyView
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'rooms:view-buffer'
+FLUSH_LOCK_KEY = 'rooms:view-buffer:flush-lock'
+
+
+class LocalViewBuffer:
+    """Process-local queue of view events."""
+    shared = False
+
+    def __init__(self):
+        self.events = deque()
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.database = connection.settings_dict['NAME']
+
+    def push(self, events):
+        with self.lock:
+            self.events.extend(events)
+
+    def pop(self, count):
+        with self.lock:
+            return [self.events.popleft() for _ in range(min(count, len(self.events)))]
+
+    def __len__(self):
+        return len(self.events)
+
+    def flush_due(self):
+        interval_elapsed = time.monotonic() - self.last_flush >= settings.PROPERTY_VIEW_FLUSH_INTERVAL
+        if len(self) and (interval_elapsed or len(self) >= settings.PROPERTY_VIEW_FLUSH_SIZE):
+            self.last_flush = time.monotonic()
+            return True
+        return False
+
+
+class RedisViewBuffer:
+    """View events in a Redis list shared by every worker."""
+    shared = True
+
+    def __init__(self, client):
+        self.client = client
+        self.last_check = time.monotonic()
+        self.pushed_size = 0
+
+    def push(self, events):
+        self.pushed_size = self.client.rpush(BUFFER_KEY, *(json.dumps(event) for event in events))
+
+    def pop(self, count):
+        # LRANGE + LTRIM in one MULTI so concurrent pushes are never dropped
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lrange(BUFFER_KEY, 0, count - 1)
+        pipe.ltrim(BUFFER_KEY, count, -1)
+        items, _ = pipe.execute()
+        return [tuple(json.loads(item)) for item in items]
+
+    def __len__(self):
+        return self.client.llen(BUFFER_KEY)
+
+    def flush_due(self):
+        # Decided from the length the last RPUSH returned and this worker's
+        # clock, so requests in between cost no extra round trip. Whoever
+        # takes the lock flushes for every worker this interval; a full
+        # buffer gets its own short lock so it is drained early
+        if self.pushed_size >= settings.PROPERTY_VIEW_FLUSH_SIZE:
+            self.pushed_size = 0
+            return cache.add(f'{FLUSH_LOCK_KEY}:full', 1, timeout=1)
+        if time.monotonic() - self.last_check < settings.PROPERTY_VIEW_FLUSH_INTERVAL:
+            return False
+        self.last_check = time.monotonic()
+        return cache.add(FLUSH_LOCK_KEY, 1, timeout=settings.PROPERTY_VIEW_FLUSH_INTERVAL)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                backend = caches['default']
+                if isinstance(backend, RedisCache):
+                    _buffer = RedisViewBuffer(backend._cache.get_client(write=True))
+                else:
+                    _buffer = LocalViewBuffer()
+                    atexit.register(_flush_at_exit, _buffer)
+    return _buffer
+
+
+def _flush_at_exit(buffer):
+    """Write what is left in a per-process buffer before the worker exits."""
+    if not len(buffer):
+        return
+    # A database switched since (a torn down test database) no longer has
+    # the properties these views belong to
+    if connection.settings_dict['NAME'] != buffer.database:
+        return
+    try:
+        flush_views()
+    except Exception as e:
+        logger.error(f"Lost {len(buffer)} buffered property views at exit: {str(e)}", exc_info=True)
+
+
+def record_view(property_id, viewer_id, ip_address):
+    """Buffer one view event; nothing is written to the database here."""
+    get_buffer().push([(property_id, viewer_id, ip_address, time.time())])
+
+
+def flush_views(batch_size=1000):
+    """
+    Write buffered view events to the database. Returns the number of views
+    written. Events for properties deleted in the meantime are dropped.
+    """
+    buffer = get_buffer()
+    written = 0
+    while True:
+        events = buffer.pop(batch_size)
+        if not events:
+            return written
+        try:
+            written += _write_views(events)
+        except Exception:
+            # Put the batch back so a failed flush does not lose views
+            buffer.push(events)
+            raise
+
+
+def _write_views(events):
+    landlords = dict(
+        Property.objects.filter(pk__in={event[0] for event in events}).values_list('pk', 'landlord_id')
+    )
+    rows = [
+        PropertyView(
+            property_id=property_id,
+            viewer_id=viewer_id,
+            ip_address=ip_address,
+            viewed_at=datetime.fromtimestamp(timestamp, tz=dt_timezone.utc),
+        )
+        for property_id, viewer_id, ip_address, timestamp in events
+        if property_id in landlords
+    ]
+    views_per_landlord = Counter(landlords[row.property_id] for row in rows)
+
+    # Landlords sharing the same increment are updated together
+    landlords_per_increment = defaultdict(list)
+    for landlord_id, views in views_per_landlord.items():
+        landlords_per_increment[views].append(landlord_id)
+
+    with transaction.atomic():
+        PropertyView.objects.bulk_create(rows)
+        for views, landlord_ids in landlords_per_increment.items():
+            UserProfile.objects.filter(user_id__in=landlord_ids).update(
+                total_property_views=F('total_property_views') + views
+            )
+
+    if len(rows) < len(events):
+        logger.info(f"Dropped {len(events) - len(rows)} buffered views for deleted properties")
+    return len(rows)
+
+
+def flush_views_if_due():
+    """Flush when the interval has passed or the buffer is full."""
+    try:
+        if get_buffer().flush_due():
+            flush_views()
+    except Exception as e:
+        logger.error(f"Error flushing buffered property views: {str(e)}", exc_info=True)
@@ -8,19 +8,51 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.db.models import Q, Count, F, Case, When, Value, IntegerField
+from django.db.models.lookups import GreaterThanOrEqual
 from django.db import transaction
-from .models import Property, PropertyImage, PropertyReview, LandlordReview, Favorite, PropertyView, Room
+from django.conf import settings
+from PIL import Image
+import functools
+import logging
+import os
+import time
+from datetime import timedelta
+from django.utils import timezone
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.http import FileResponse
+from .models import ImageBlob, Location, Property, PropertyImage, PropertyReview, LandlordReview, Favorite, PropertyView, Room, SavedSearch, rating_sort_key
 from .serializers import (
     PropertySerializer, PropertyCreateSerializer, PropertyUpdateSerializer,
     PropertyListSerializer, PropertyImageSerializer, RoomSerializer,
     PropertyReviewSerializer, PropertyReviewCreateSerializer, RoomCreateUpdateSerializer,
     LandlordReviewSerializer, LandlordReviewCreateSerializer,
-    FavoriteSerializer, PropertyViewSerializer
+    FavoriteSerializer, PropertyViewSerializer, PropertySearchSerializer, SavedSearchSerializer
 )
+from .filters import PropertyFullTextSearchFilter, PropertyGeoFilter, add_search_headlines
+from .pagination import PropertyKeysetPagination
+from .analytics import landlord_property_stats, landlord_view_stats
+from .ratings import rating_summary
+from .facets import compute_facets
+from .images import blob_name, complete_direct_uploads, create_property_images, inspect_uploads, schedule_processing
+from .thumbnails import get_thumbnail_cache
+from .locations import normalize_location
+from .view_tracking import record_view
+from .cache import (
+    LOCATIONS, PROPERTIES, get_generation, get_stats, make_key, normalize_params, property_namespace,
+    record_lookup, response_cache_key, response_validators
+)
+from core.direct_uploads import DirectUpload, StorageUnavailable, declared_upload, presign
+from core.image_utils import output_format
+from core.pagination import KeysetPagination, ViewedAtKeysetPagination
 from accounts.models import UserProfile
 from django.contrib.auth import get_user_model
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 class IsLandlordPermission(permissions.BasePermission):
     """
     Custom permission to only allow landlords to create properties.
@@ -66,24 +98,24 @@ class IsTenantPermission(permissions.BasePermission):
         except UserProfile.DoesNotExist:
             return False
 
-@method_decorator(csrf_exempt, name='dispatch')
-class PropertyListCreateView(generics.ListCreateAPIView):
+class PropertyFilterMixin:
+    """
+    Filters shared by the property listing and the facet counts endpoint.
+    """
     queryset = Property.objects.all()
-    permission_classes = [IsLandlordOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Search and location filters run last so they can order by rank or
+    # distance over the filtered set
+    filter_backends = [
+        DjangoFilterBackend, filters.OrderingFilter, PropertyFullTextSearchFilter, PropertyGeoFilter
+    ]
     filterset_fields = ['property_type', 'bedrooms', 'bathrooms', 'furnished', 'parking', 'pets_allowed', 'status']
-    search_fields = ['title', 'location', 'address', 'description']
-    ordering_fields = ['price', 'created_at', 'bedrooms', 'area_sqft']
+    ordering_fields = ['price', 'created_at', 'bedrooms', 'area_sqft', 'rating', 'lowest_price']
     ordering = ['-created_at']
     
-    def get_serializer_class(self):
-        if self.request.method == 'POST':
-            return PropertyCreateSerializer
-        return PropertyListSerializer
+    def get_search_terms(self):
+        return PropertyFullTextSearchFilter().get_search_terms(self.request)
     
-    def get_queryset(self):
-        queryset = Property.objects.all()
-        
+    def apply_custom_filters(self, queryset):
         # Custom price filtering
         min_price = self.request.query_params.get('min_price')
         max_price = self.request.query_params.get('max_price')
@@ -92,6 +124,14 @@ class PropertyListCreateView(generics.ListCreateAPIView):
             queryset = queryset.filter(price__gte=min_price)
         if max_price:
             queryset = queryset.filter(price__lte=max_price)
+        
+        # Filters over the denormalized listing summary columns
+        if self.request.query_params.get('available', '').lower() in ('true', '1'):
+            queryset = queryset.filter(available_rooms_count__gt=0)
+        min_rating = self.request.query_params.get('min_rating')
+        if min_rating:
+            # Same expression as the rating sort index
+            queryset = queryset.filter(GreaterThanOrEqual(rating_sort_key(), min_rating))
             
         # Location-based search (case-insensitive)
         location = self.request.query_params.get('location')
@@ -101,12 +141,122 @@ class PropertyListCreateView(generics.ListCreateAPIView):
             )
             
         return queryset
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for GET responses, taken from the cache
+    generation counters. A request whose If-None-Match (or If-Modified-Since)
+    is still current gets a 304 before any query or serializer runs. Only
+    with SHARED_CACHE: counters of a per-process cache miss other workers'
+    writes.
+    """
+    
+    def get_validator_namespace(self):
+        return PROPERTIES
+    
+    def not_modified(self, request):
+        """Return a 304 response if the client's copy is current, else None."""
+        if not settings.SHARED_CACHE:
+            return None
+        self.validators = response_validators(request, self.get_validator_namespace())
+        etag, last_modified = self.validators
+        return get_conditional_response(request, etag=etag, last_modified=last_modified)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = validators
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+            # Clients may keep the body but must revalidate before reusing it
+            patch_cache_control(response, no_cache=True, private=request.user.is_authenticated)
+            patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+
+@method_decorator(csrf_exempt, name='dispatch')
+class PropertyListCreateView(ConditionalGetMixin, PropertyFilterMixin, generics.ListCreateAPIView):
+    permission_classes = [IsLandlordOrReadOnly]
+    pagination_class = PropertyKeysetPagination
+    
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return PropertyCreateSerializer
+        if self.get_search_terms():
+            return PropertySearchSerializer
+        return PropertyListSerializer
+    
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        terms = self.get_search_terms()
+        if page is not None and terms:
+            add_search_headlines(page, terms)
+        return page
+    
+    def get_queryset(self):
+        queryset = Property.objects.all()
+        if self.request.method == 'GET':
+            queryset = queryset.for_listing(self.request.user)
+        return self.apply_custom_filters(queryset)
+    
+    def list(self, request, *args, **kwargs):
+        not_modified = self.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        
+        if not settings.SHARED_CACHE:
+            # A per-process cache would miss other workers' invalidations
+            return super().list(request, *args, **kwargs)
+        
+        cache_key = response_cache_key(request, 'property-list')
+        data = cache.get(cache_key)
+        record_lookup(hit=data is not None)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, settings.PROPERTY_RESPONSE_CACHE_TIMEOUT)
+        return Response(data)
     
     def perform_create(self, serializer):
         serializer.save(landlord=self.request.user)
 
 @method_decorator(csrf_exempt, name='dispatch')
-class PropertyDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PropertyFacetsView(PropertyFilterMixin, generics.GenericAPIView):
+    """
+    Facet counts (property type, bedrooms, amenities, price histogram) for the
+    same filters PropertyListCreateView accepts
+    """
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+    # Parameters that change paging or order but not which rows match
+    ignored_params = ('cursor', 'page_size', 'count', 'ordering')
+    # Counts don't depend on order, and the sort keys are listing annotations
+    filter_backends = [
+        backend for backend in PropertyFilterMixin.filter_backends if backend is not filters.OrderingFilter
+    ]
+    
+    def get(self, request):
+        try:
+            price_buckets = min(max(int(request.query_params.get('price_buckets', 10)), 1), 50)
+        except ValueError:
+            return Response({"error": "price_buckets must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Only cached when every worker sees the invalidations (SHARED_CACHE)
+        facets = None
+        if settings.SHARED_CACHE:
+            cache_key = make_key(
+                PROPERTIES, 'facets',
+                normalize_params(request.query_params, exclude=self.ignored_params)
+            )
+            facets = cache.get(cache_key)
+        if facets is None:
+            queryset = self.filter_queryset(self.apply_custom_filters(self.get_queryset()))
+            facets = compute_facets(queryset, price_buckets=price_buckets)
+            if settings.SHARED_CACHE:
+                cache.set(cache_key, facets, settings.PROPERTY_FACETS_CACHE_TIMEOUT)
+        return Response(facets)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class PropertyDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
     permission_classes = [permissions.AllowAny]  # Anyone can view property details
@@ -130,23 +280,45 @@ class PropertyDetailView(generics.RetrieveUpdateDestroyAPIView):
                 self.permission_denied(self.request, message="You can only modify your own properties.")
         return obj
     
+    def get_validator_namespace(self):
+        return property_namespace(self.kwargs['pk'])
+    
     def retrieve(self, request, *args, **kwargs):
-        property_obj = self.get_object()
-        
-        # Track property view
-        ip_address = self.get_client_ip(request)
-        PropertyView.objects.create(
-            property=property_obj,
-            viewer=request.user if request.user.is_authenticated else None,
-            ip_address=ip_address
-        )
+        not_modified = self.not_modified(request)
+        if not_modified is not None:
+            # Revalidating a detail page still counts as a view
+            record_view(
+                int(self.kwargs['pk']),
+                request.user.id if request.user.is_authenticated else None,
+                self.get_client_ip(request)
+            )
+            return not_modified
+        
+        # Only cached when every worker sees the invalidations (SHARED_CACHE)
+        cached = None
+        if settings.SHARED_CACHE:
+            cache_key = response_cache_key(request, 'property-detail')
+            cached = cache.get(cache_key)
+            record_lookup(hit=cached is not None)
+        if cached is None:
+            property_obj = self.get_object()
+            cached = {
+                'property_id': property_obj.pk,
+                'landlord_id': property_obj.landlord_id,
+                'data': self.get_serializer(property_obj).data,
+            }
+            if settings.SHARED_CACHE:
+                cache.set(cache_key, cached, settings.PROPERTY_RESPONSE_CACHE_TIMEOUT)
         
-        # Update landlord's total views count
-        landlord_profile = UserProfile.objects.get(user=property_obj.landlord)
-        landlord_profile.total_property_views += 1
-        landlord_profile.save()
+        # Track property view; buffered and written in bulk with the
+        # landlord's total_property_views, off the request path
+        record_view(
+            cached['property_id'],
+            request.user.id if request.user.is_authenticated else None,
+            self.get_client_ip(request)
+        )
         
-        return super().retrieve(request, *args, **kwargs)
+        return Response(cached['data'])
     
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -156,13 +328,102 @@ class PropertyDetailView(generics.RetrieveUpdateDestroyAPIView):
             ip = request.META.get('REMOTE_ADDR')
         return ip
 
+class PropertyCacheStatsView(APIView):
+    """
+    Hit/miss counters for the property list/detail response cache
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        return Response(get_stats())
+
+@functools.lru_cache(maxsize=2048)
+def location_suggestions(term, limit, version):
+    """
+    In-process LRU over Location.objects.suggest(). Hot prefixes ("le", "lek")
+    are answered without a query; the version argument (see
+    suggestions_version) retires every entry once the location dictionary
+    changes.
+    """
+    return tuple(Location.objects.suggest(term, limit))
+
+def suggestions_version():
+    """
+    The LOCATIONS generation and, unless it is shared by every worker
+    (SHARED_CACHE), a LOCATION_SUGGESTIONS_TTL time bucket, so entries
+    expire even when a write handled by another worker is never seen here.
+    """
+    generation = get_generation(LOCATIONS)
+    if settings.SHARED_CACHE:
+        return generation
+    return generation, int(time.time() // settings.LOCATION_SUGGESTIONS_TTL)
+
+class LocationAutocompleteView(APIView):
+    """
+    Typeahead for the search box: top locations matching ``q`` with their
+    listing counts
+    """
+    permission_classes = [permissions.AllowAny]
+    default_limit = 8
+    max_limit = 20
+    
+    def get(self, request):
+        term = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = location_suggestions(normalize_location(term), limit, suggestions_version())
+        return Response({'query': term, 'results': list(results)})
+
 @method_decorator(csrf_exempt, name='dispatch')
 class LandlordPropertiesView(generics.ListAPIView):
     serializer_class = PropertyListSerializer
     permission_classes = [IsLandlordPermission]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
-        return Property.objects.filter(landlord=self.request.user)
+        return Property.objects.filter(landlord=self.request.user).for_listing(self.request.user)
+
+class LandlordPropertyStatsView(APIView):
+    """
+    Per-property dashboard figures for the landlord (views, favorites,
+    conversations, successful transactions, rating), cached briefly
+    """
+    permission_classes = [IsLandlordPermission]
+    
+    def get(self, request):
+        cache_key = make_key(PROPERTIES, 'landlord-stats', request.user.pk)
+        stats = cache.get(cache_key)
+        if stats is None:
+            stats = landlord_property_stats(request.user)
+            cache.set(cache_key, stats, settings.LANDLORD_STATS_CACHE_TIMEOUT)
+        return Response(stats)
+
+class LandlordViewAnalyticsView(APIView):
+    """
+    Daily view counts for the landlord's properties, read from the
+    PropertyViewDaily rollups. Accepts ``days`` (default 30, max 366) and an
+    optional ``property`` id.
+    """
+    permission_classes = [IsLandlordPermission]
+    max_days = 366
+    
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), self.max_days)
+            property_id = request.query_params.get('property')
+            property_id = int(property_id) if property_id is not None else None
+        except ValueError:
+            return Response({"error": "days and property must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if property_id is not None:
+            get_object_or_404(Property, id=property_id, landlord=request.user)
+        
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+        return Response(landlord_view_stats(request.user, start, end, property_id=property_id))
 
 @method_decorator(csrf_exempt, name='dispatch')
 class PropertyImageUploadView(APIView):
@@ -175,27 +436,148 @@ class PropertyImageUploadView(APIView):
         if not images:
             return Response({"error": "No images provided"}, status=status.HTTP_400_BAD_REQUEST)
         
-        uploaded_images = []
-        for image in images:
-            property_image = PropertyImage.objects.create(
-                property=property_obj,
-                image=image,
-                caption=request.data.get('caption', ''),
-                is_primary=len(uploaded_images) == 0 and not property_obj.images.filter(is_primary=True).exists()
+        # Reject oversized or non-image files from their headers, before
+        # anything is stored or decoded; all files are checked at once
+        try:
+            inspections = inspect_uploads(images)
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        
+        uploaded_images = create_property_images(
+            property_obj, images, inspections, caption=request.data.get('caption', '')
+        )
+        
+        # Size variants are rendered off the request thread after commit;
+        # content uploaded before comes with them already
+        schedule_processing(
+            image.id for image in uploaded_images if image.processing_status == PropertyImage.PENDING
+        )
+        
+        serializer = PropertyImageSerializer(uploaded_images, many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class PropertyImageDirectUploadView(APIView):
+    """
+    Presigned URLs for uploading property photos straight to storage, one
+    per file declared in ``files``; ``exists`` marks content already stored,
+    whose upload can be skipped
+    """
+    permission_classes = [IsLandlordPermission]
+    
+    def post(self, request, property_id):
+        property_obj = get_object_or_404(Property, id=property_id, landlord=request.user)
+        
+        files = request.data.get('files')
+        if not files or not isinstance(files, list):
+            return Response({"error": "No files provided"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            uploads = [declared_upload(file, f'property:{property_obj.id}', blob_name) for file in files]
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        
+        stored = set(ImageBlob.objects.filter(digest__in={upload.sha256 for upload in uploads}).values_list('digest', flat=True))
+        return Response({
+            "uploads": [
+                {**presign(upload, request), "exists": upload.sha256 in stored}
+                for upload in uploads
+            ]
+        })
+
+class PropertyImageDirectUploadCompleteView(APIView):
+    """
+    Adds the photos of completed direct uploads, given their ``uploads``
+    tokens, to a property
+    """
+    permission_classes = [IsLandlordPermission]
+    
+    def post(self, request, property_id):
+        property_obj = get_object_or_404(Property, id=property_id, landlord=request.user)
+        
+        tokens = request.data.get('uploads')
+        if not tokens or not isinstance(tokens, list):
+            return Response({"error": "No uploads provided"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Only sizes and headers are read back from storage, never whole files
+        try:
+            uploads = [DirectUpload.from_token(token, target=f'property:{property_obj.id}') for token in tokens]
+            uploaded_images = complete_direct_uploads(property_obj, uploads, caption=request.data.get('caption', ''))
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        except StorageUnavailable as e:
+            logger.error(f"Error checking direct uploads: {str(e)}")
+            return Response(
+                {"error": "Storage is unavailable, please try again"}, status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
-            uploaded_images.append(property_image)
+        
+        schedule_processing(
+            image.id for image in uploaded_images if image.processing_status == PropertyImage.PENDING
+        )
         
         serializer = PropertyImageSerializer(uploaded_images, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+class PropertyImageThumbnailView(APIView):
+    """
+    A property image resized to fit within one of the configured boxes,
+    built on first request and then served from the thumbnail disk cache
+    """
+    permission_classes = [permissions.AllowAny]
+    
+    def get(self, request, width, height, image_id):
+        if (width, height) not in settings.PROPERTY_THUMBNAIL_SIZES:
+            return Response({"error": "Unsupported thumbnail size"}, status=status.HTTP_404_NOT_FOUND)
+        image = get_object_or_404(PropertyImage.objects.only('image'), id=image_id)
+        
+        thumbnails = get_thumbnail_cache()
+        path = thumbnails.path(image.image.name, width, height)
+        # The cache key changes with the image file, so it doubles as the ETag
+        etag = quote_etag(os.path.splitext(os.path.basename(path))[0])
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            try:
+                thumbnail = thumbnails.open(image.image, width, height)
+            except (ValidationError, OSError):
+                return Response({"error": "Image could not be resized"}, status=status.HTTP_404_NOT_FOUND)
+            response = FileResponse(thumbnail, content_type=Image.MIME[output_format(path)])
+        
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.PROPERTY_THUMBNAIL_MAX_AGE)
+        return response
+
+class ReviewSummaryMixin:
+    """
+    Adds a ``summary`` block (average, count, per-star histogram) to each
+    page of reviews, read from the rated object's stored rating aggregates.
+    The rated object is the ``rated_model`` row whose ``rated_lookup_field``
+    matches the ``rated_url_kwarg`` URL kwarg, narrowed by ``rated_filters``.
+    """
+    rated_model = None
+    rated_lookup_field = 'id'
+    rated_url_kwarg = None
+    rated_filters = {}
+    
+    def get_rated_object(self):
+        lookup = {self.rated_lookup_field: self.kwargs[self.rated_url_kwarg]}
+        return get_object_or_404(self.rated_model, **lookup, **self.rated_filters)
+    
+    def list(self, request, *args, **kwargs):
+        summary = rating_summary(self.get_rated_object())
+        response = super().list(request, *args, **kwargs)
+        response.data['summary'] = summary
+        return response
+
 @method_decorator(csrf_exempt, name='dispatch')
-class PropertyReviewListCreateView(generics.ListCreateAPIView):
+class PropertyReviewListCreateView(ReviewSummaryMixin, generics.ListCreateAPIView):
     serializer_class = PropertyReviewSerializer
     permission_classes = [permissions.AllowAny]  # Anyone can view reviews
+    pagination_class = KeysetPagination
+    rated_model = Property
+    rated_url_kwarg = 'property_id'
     
     def get_queryset(self):
         property_id = self.kwargs['property_id']
-        return PropertyReview.objects.filter(property_id=property_id)
+        return PropertyReview.objects.filter(property_id=property_id).select_related('tenant')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -213,13 +595,18 @@ class PropertyReviewListCreateView(generics.ListCreateAPIView):
         serializer.save(tenant=self.request.user, property=property_obj)
 
 @method_decorator(csrf_exempt, name='dispatch')
-class LandlordReviewListCreateView(generics.ListCreateAPIView):
+class LandlordReviewListCreateView(ReviewSummaryMixin, generics.ListCreateAPIView):
     serializer_class = LandlordReviewSerializer
     permission_classes = [permissions.AllowAny]  # Anyone can view reviews
+    pagination_class = KeysetPagination
+    rated_model = UserProfile
+    rated_lookup_field = 'user_id'
+    rated_url_kwarg = 'landlord_id'
+    rated_filters = {'user_type': 'landlord'}
     
     def get_queryset(self):
         landlord_id = self.kwargs['landlord_id']
-        return LandlordReview.objects.filter(landlord_id=landlord_id)
+        return LandlordReview.objects.filter(landlord_id=landlord_id).select_related('tenant', 'landlord')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -251,6 +638,7 @@ class FavoriteListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = FavoriteSerializer
     permission_classes = [permissions.IsAuthenticated, IsTenantPermission]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         return Favorite.objects.filter(tenant=self.request.user)
@@ -280,6 +668,33 @@ class FavoriteDeleteView(generics.DestroyAPIView):
         property_id = self.kwargs.get('property_id')
         return get_object_or_404(Favorite, tenant=self.request.user, property_id=property_id)
 
+@method_decorator(csrf_exempt, name='dispatch')
+class SavedSearchListCreateView(generics.ListCreateAPIView):
+    """
+    List tenant's saved searches or save a listing filter to be notified about
+    new matching listings
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated, IsTenantPermission]
+    pagination_class = KeysetPagination
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(tenant=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(tenant=self.request.user)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """
+    Retrieve, update (e.g. pause with is_active=false) or delete a saved search
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated, IsTenantPermission]
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(tenant=self.request.user)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class RoomViewSet(ModelViewSet):
     """
@@ -336,6 +751,7 @@ class PropertyViewListView(generics.ListAPIView):
     """
     serializer_class = PropertyViewSerializer
     permission_classes = [IsLandlordPermission]
+    pagination_class = ViewedAtKeysetPagination
     
     def get_queryset(self):
         property_id = self.kwargs.get('property_id')
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0004_keyset_pagination_indexes"),
+        ("transactions", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="transaction_user_created_idx",
+            ),
+        ),
+    ]
@@ -78,6 +78,7 @@ class Transaction(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['user']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', '-created_at', '-id'], name='transaction_user_created_idx'),
         ]
 
     def __str__(self):
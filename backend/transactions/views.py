@@ -13,6 +13,7 @@ from rest_framework.views import APIView
 
 from .models import Transaction
 from .serializers import TransactionSerializer
+from core.pagination import KeysetPagination
 from accounts.models import User
 from rooms.models import Property, Room
 
@@ -247,6 +248,7 @@ class TransactionListView(generics.ListAPIView):
     """List all transactions for the authenticated user"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TransactionSerializer
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         return Transaction.objects.filter(user=self.request.user).order_by('-created_at')